@@ -9,7 +9,9 @@ from fastapi import (
     BackgroundTasks,
     Depends,
     HTTPException,
+    Query,
     Request,
+    Response,
     status,
 )
 from pydantic import BaseModel
@@ -19,7 +21,7 @@ from app.core.database import get_db
 from app.core.settings import settings
 from app.core.task_registry import task_registry
 from app.domain.entities import AutomationTask, SyncJob, SyncLog
-from app.domain.enums import AutomationTaskStatus
+from app.domain.enums import AutomationTaskStatus, SyncStatus
 from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
 from app.services.credential_crypto import (
     decrypt_credentials_dict,
@@ -123,10 +125,28 @@ async def run_sync_job(
     "/jobs",
     response_model=list[SyncJob],
     summary="List Sync Jobs",
-    description="Returns a list of all historical and current synchronization jobs.",
+    description=(
+        "Returns synchronization jobs, newest first, without their metadata. "
+        "Pages are keyset-paginated: pass the `X-Next-Cursor` response header as "
+        "`cursor` to get the next page."
+    ),
 )
-async def list_jobs(service: SyncService = Depends(get_service)):
-    return await service.list_jobs()
+async def list_jobs(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_filter: Optional[list[SyncStatus]] = Query(None, alias="status"),
+    service: SyncService = Depends(get_service),
+):
+    try:
+        jobs = await service.list_jobs(
+            limit=limit, cursor=cursor, statuses=status_filter, summary=True
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(jobs) == limit:
+        response.headers["X-Next-Cursor"] = SqlAlchemyRepo.job_cursor(jobs[-1])
+    return jobs
 
 
 @router.post(
@@ -157,10 +177,41 @@ async def kill_all_jobs(service: SyncService = Depends(get_service)):
     "/jobs/{job_id}/logs",
     response_model=list[SyncLog],
     summary="Get Job Logs",
-    description="Returns all log entries associated with a specific sync job execution.",
+    description=(
+        "Returns the log entries of a sync job execution. Pass the last received "
+        "`id` as `since_id` to fetch only newer entries, optionally capped by "
+        "`limit` and restricted to some `level` values."
+    ),
+)
+async def get_job_logs(
+    job_id: UUID,
+    since_id: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    level: Optional[list[str]] = Query(None),
+    service: SyncService = Depends(get_service),
+):
+    return await service.get_job_logs(
+        job_id, since_id=since_id, limit=limit, levels=level
+    )
+
+
+@router.get(
+    "/tasks/{task_id}/logs",
+    response_model=list[SyncLog],
+    tags=["Automation Tasks"],
+    summary="Get Task Logs",
+    description="Returns the log entries of a single automation task, with the same incremental filters as the job logs.",
 )
-async def get_job_logs(job_id: UUID, service: SyncService = Depends(get_service)):
-    return await service.get_job_logs(job_id)
+async def get_task_logs(
+    task_id: UUID,
+    since_id: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    level: Optional[list[str]] = Query(None),
+    service: SyncService = Depends(get_service),
+):
+    return await service.repo.get_task_logs(
+        task_id, since_id=since_id, limit=limit, levels=level
+    )
 
 
 @router.get(
@@ -280,7 +331,6 @@ async def execute_batch_tasks(
     ahgora_password = credentials_dict.get("ahgora_password")
     fiorilli_password = credentials_dict.get("fiorilli_password")
 
-
     # Execute batch in background with a new db session
     background_tasks.add_task(
         _run_batch_standalone,
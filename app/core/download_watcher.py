@@ -0,0 +1,136 @@
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # Not on Linux or package not installed: poll instead
+    INotify = None
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_SUFFIX = ".part"
+
+
+class DownloadWatcher:
+    """
+    Waits for a browser download to land in `directory`.
+
+    Create the watcher *before* triggering the download: files already present
+    (and unchanged) are ignored. A file counts as finished when its name contains
+    `pattern`, Firefox's `<name>.part` companion is gone and its size has not
+    changed for `stable_seconds`. The directory is re-checked whenever inotify
+    reports a change, or every `poll_interval` when inotify is not available.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        pattern: str,
+        stable_seconds: float = 0.5,
+        poll_interval: float = 0.2,
+    ):
+        self.directory = directory
+        self.pattern = pattern.lower()
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._existing = self._snapshot()
+
+    def wait(
+        self, timeout: float, check_cancel: Optional[Callable[[], None]] = None
+    ) -> Path:
+        """
+        Returns the resolved path of the finished download.
+        Raises TimeoutError if none shows up within `timeout` seconds.
+        """
+        end_time = time.monotonic() + timeout
+        notifier = self._open_notifier()
+        last_seen: Optional[tuple[Path, int]] = None
+        stable_since = 0.0
+        try:
+            while True:
+                if check_cancel:
+                    check_cancel()
+
+                now = time.monotonic()
+                candidate = self._find_candidate()
+                if candidate is None:
+                    last_seen = None
+                elif candidate != last_seen:
+                    last_seen, stable_since = candidate, now
+                elif now - stable_since >= self.stable_seconds:
+                    return candidate[0].resolve()
+
+                remaining = end_time - now
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No finished download matching '{self.pattern}' in "
+                        f"{self.directory} after {timeout}s"
+                    )
+                delay = min(self.poll_interval, remaining)
+                if last_seen is not None:
+                    # Re-check as soon as the candidate may count as stable
+                    delay = min(delay, self.stable_seconds - (now - stable_since))
+                self._sleep(notifier, max(delay, 0))
+        finally:
+            if notifier:
+                notifier.close()
+
+    def _snapshot(self) -> Dict[str, int]:
+        return {
+            f.name: f.stat().st_mtime_ns
+            for f in self.directory.iterdir()
+            if f.is_file()
+        }
+
+    def _find_candidate(self) -> Optional[tuple[Path, int]]:
+        """Newest matching file that is not (or no longer) being written."""
+        try:
+            files = [f for f in self.directory.iterdir() if f.is_file()]
+        except FileNotFoundError:
+            return None
+        names = {f.name for f in files}
+
+        candidates = []
+        for f in files:
+            name = f.name
+            if name.endswith(PARTIAL_SUFFIX) or f"{name}{PARTIAL_SUFFIX}" in names:
+                continue
+            if self.pattern not in name.lower():
+                continue
+            try:
+                stat = f.stat()
+            except FileNotFoundError:
+                continue
+            if self._existing.get(name) == stat.st_mtime_ns:
+                continue
+            candidates.append((stat.st_mtime_ns, f, stat.st_size))
+
+        if not candidates:
+            return None
+        _, path, size = max(candidates, key=lambda c: c[0])
+        return path, size
+
+    def _open_notifier(self):
+        if INotify is None:
+            return None
+        try:
+            notifier = INotify()
+            notifier.add_watch(
+                str(self.directory),
+                flags.CREATE | flags.MODIFY | flags.MOVED_TO | flags.DELETE,
+            )
+            return notifier
+        except OSError as e:
+            logger.debug(f"inotify unavailable, polling {self.directory}: {e}")
+            return None
+
+    @staticmethod
+    def _sleep(notifier, seconds: float) -> None:
+        if notifier:
+            # Returns early as soon as something changes in the directory
+            notifier.read(timeout=int(seconds * 1000))
+        else:
+            time.sleep(seconds)
@@ -1,6 +1,8 @@
 from pathlib import Path
+from typing import ClassVar, Dict, Optional
 
 import shutil
+import time
 import pandas as pd
 
 from app.core.settings import settings
@@ -20,6 +22,14 @@ class FileManager:
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
 
+    # Substring of the exported file name -> file name expected in DATA_DIR
+    DOWNLOAD_DESTINATIONS: ClassVar[Dict[str, str]] = {
+        "trabalhador": "fiorilli_employees.txt",
+        "funcionarios": "ahgora_employees.csv",
+        "pontoafastamentos": "raw_leaves.txt",
+        "pontoferias": "raw_vacations.txt",
+    }
+
     @classmethod
     def move_downloads_to_data_dir(cls):
         """Move files from downloads folder to their respective data directories."""
@@ -29,16 +39,18 @@ class FileManager:
         for file in settings.DOWNLOADS_DIR.iterdir():
             if not file.is_file():
                 continue
+            cls.store_download(file)
 
-            file_name_lower = file.name.lower()
-            if "trabalhador" in file_name_lower:
-                cls.move_file(file, settings.DATA_DIR / "fiorilli_employees.txt")
-            elif "funcionarios" in file_name_lower:
-                cls.move_file(file, settings.DATA_DIR / "ahgora_employees.csv")
-            elif "pontoafastamentos" in file_name_lower:
-                cls.move_file(file, settings.DATA_DIR / "raw_leaves.txt")
-            elif "pontoferias" in file_name_lower:
-                cls.move_file(file, settings.DATA_DIR / "raw_vacations.txt")
+    @classmethod
+    def store_download(cls, file: Path) -> Optional[Path]:
+        """Move a downloaded export to its data file. Returns the new path, if known."""
+        file_name_lower = file.name.lower()
+        for pattern, name in cls.DOWNLOAD_DESTINATIONS.items():
+            if pattern in file_name_lower:
+                destination = settings.DATA_DIR / name
+                cls.move_file(file, destination)
+                return destination
+        return None
 
     @staticmethod
     def move_file(source: Path, destination: Path):
@@ -65,7 +77,14 @@ class FileManager:
         """Delete old files in the download folder"""
         if not settings.DOWNLOADS_DIR.exists():
             return
+        stale_before = time.time() - settings.MAX_AGE_MINUTES * 60
         for file in settings.DOWNLOADS_DIR.iterdir():
-            if not file.is_file():
+            if file.is_dir():
+                # Browser session folders left behind by failed downloads
+                if (
+                    file.name.startswith("session-")
+                    and file.stat().st_mtime < stale_before
+                ):
+                    shutil.rmtree(file, ignore_errors=True)
                 continue
             file.unlink()
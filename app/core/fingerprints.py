@@ -0,0 +1,21 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_fingerprint(path: Path, chunk_size: int = CHUNK_SIZE) -> Optional[str]:
+    """BLAKE2b digest of the file contents, read in chunks. None if it does not exist."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def files_fingerprints(paths: Dict[str, Path]) -> Dict[str, Optional[str]]:
+    return {name: file_fingerprint(path) for name, path in paths.items()}
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+from pyarrow import ArrowException, feather
+
+from app.core.fingerprints import file_fingerprint
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def config_version(*parts: Any) -> str:
+    """Short hash of whatever shapes the parsed output (columns, constants, parser version)."""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+class FrameCache:
+    """
+    On-disk cache of DataFrames parsed from export files, keyed by the content
+    hash of the source file and a config version.
+
+    Entries are uncompressed Arrow (Feather) files read through a memory map.
+    Hits refresh the entry's mtime
+    and the least recently used entries are removed once the directory grows
+    past `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or settings.DATA_DIR / ".cache"
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.PARSED_CACHE_MAX_MB * 2**20
+
+    def get_or_load(
+        self,
+        path: Path,
+        loader: Callable[[Path], pd.DataFrame],
+        config: str,
+    ) -> pd.DataFrame:
+        if self.max_bytes <= 0:
+            return loader(path)
+
+        digest = file_fingerprint(path)
+        if digest is None:
+            return loader(path)
+        entry = self.directory / f"{path.stem}-{digest}-{config}.arrow"
+
+        if entry.exists():
+            try:
+                df = self._read(entry)
+                os.utime(entry)
+                logger.debug(f"Parsed cache hit for {path.name}")
+                return df
+            except (OSError, ArrowException) as e:
+                logger.warning(f"Discarding unreadable cache entry {entry.name}: {e}")
+                entry.unlink(missing_ok=True)
+
+        df = loader(path)
+        if not df.empty:
+            self._store(entry, df)
+        return df
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def _read(self, entry: Path) -> pd.DataFrame:
+        df = feather.read_table(entry, memory_map=True).to_pandas()
+        # Arrow nulls come back as None in object columns; the parser yields NaN
+        return df.fillna(np.nan)
+
+    def _store(self, entry: Path, df: pd.DataFrame) -> None:
+        tmp = entry.with_name(f".{uuid4().hex}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            feather.write_feather(
+                df.reset_index(drop=True), tmp, compression="uncompressed"
+            )
+            os.replace(tmp, entry)
+        except (OSError, ArrowException) as e:
+            logger.warning(f"Could not cache {entry.name}: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.iterdir() if p.suffix == ".arrow"]
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
+                logger.debug(f"Evicted parsed cache entry {entry.name}")
+
+
+parsed_export_cache = FrameCache()
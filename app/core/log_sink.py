@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import queue
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+from uuid import UUID
+
+from app.core.settings import settings
+from app.domain.entities import SyncLog
+
+logger = logging.getLogger(__name__)
+
+
+class LogSink:
+    """
+    Buffers job/task log lines in memory and persists them in batches.
+    Entries are written with one multi-row INSERT whenever `batch_size` lines are
+    pending or every `flush_interval_ms`, whichever comes first.
+    `emit` is thread-safe, so Selenium threads can log without touching the event
+    loop or the database per line; a single consumer on the loop drains the queue.
+    Call `flush()` when a job ends so its last lines are stored before returning.
+    """
+
+    # Pending entries kept after a failed write, so a DB outage does not grow forever
+    MAX_PENDING = 10_000
+
+    def __init__(
+        self,
+        batch_size: int = settings.LOG_FLUSH_BATCH_SIZE,
+        flush_interval_ms: int = settings.LOG_FLUSH_INTERVAL_MS,
+        writer: Optional[Callable[[List[SyncLog]], Awaitable[None]]] = None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.writer = writer or self._write_to_db
+        self._queue: queue.SimpleQueue[SyncLog] = queue.SimpleQueue()
+        self._retry: List[SyncLog] = []
+        self._write_lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._written = asyncio.Event()
+
+    def emit(
+        self, job_id: UUID, level: str, message: str, task_id: Optional[UUID] = None
+    ) -> None:
+        self._queue.put(
+            SyncLog(
+                id=None,
+                job_id=job_id,
+                task_id=task_id,
+                level=level,
+                message=message,
+                timestamp=datetime.now(),
+            )
+        )
+        loop, wakeup = self._loop, self._wakeup
+        if loop and wakeup and self._queue.qsize() >= self.batch_size:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass  # Loop already closed, stop() flushes the rest
+
+    async def start(self):
+        if self._task:
+            return
+        self._closing = False
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Log sink started (batch: {self.batch_size}, interval: {self.flush_interval}s)"
+        )
+
+    async def stop(self):
+        """Stops the background flusher and writes whatever is still pending."""
+        if self._task:
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._loop = None
+            self._wakeup = None
+        await self.flush()
+        logger.info("Log sink stopped")
+
+    async def flush(self):
+        async with self._write_lock:
+            entries, self._retry = self._retry, []
+            while True:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not entries:
+                return
+            try:
+                await self.writer(entries)
+            except Exception as e:
+                logger.error(f"Failed to persist {len(entries)} log entries: {e}")
+                if len(entries) <= self.MAX_PENDING:
+                    self._retry = entries
+                return
+
+            written, self._written = self._written, asyncio.Event()
+            written.set()
+
+    async def wait_for_write(self, timeout: float) -> bool:
+        """Waits until the next batch is persisted. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._written.wait(), timeout=timeout)
+            return True
+        except TimeoutError:
+            return False
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    @staticmethod
+    async def _write_to_db(entries: List[SyncLog]):
+        from app.core.database import async_session_factory
+        from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+
+        async with async_session_factory() as session:
+            await SqlAlchemyRepo(session).add_logs_batch(entries)
+
+
+log_sink = LogSink()
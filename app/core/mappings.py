@@ -0,0 +1,103 @@
+import ast
+import csv
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MappingRegistry:
+    """
+    Process-wide in-memory store for the static mapping files.
+    Each file is parsed once and only reloaded when its mtime or size changes,
+    so the analysis and the browser threads share the same parsed data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[tuple[int, int], Any]] = {}
+
+    def get(self, path: Path, loader: Callable[[Path], Any], default: Any = None):
+        """Returns the parsed content of `path`, reloading it if the file changed."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(str(path), None)
+            return default
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = str(path)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+            try:
+                value = loader(path)
+            except Exception as e:
+                logger.warning(f"Could not load mapping file {path}: {e}")
+                return cached[1] if cached else default
+
+            self._entries[key] = (signature, value)
+            logger.info(f"Loaded mapping file {path.name}")
+            return value
+
+    def invalidate(self, path: Path | None = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+
+    def get_department_locations(self) -> dict[str, list[str]]:
+        """Department (upper case) -> sorted Ahgora locations."""
+        return self.get(
+            settings.DEPARTMENT_TO_LOCATION_CSV_PATH,
+            self._load_department_locations,
+            default={},
+        )
+
+    def get_locations_for_department(self, department: str) -> list[str]:
+        return self.get_department_locations().get(department.strip().upper(), [])
+
+    def refresh_exceptions(self) -> None:
+        """Reloads exceptions.json into settings when it was edited on disk."""
+        self.get(settings.EXCEPTIONS_JSON_PATH, self._load_exceptions)
+
+    @staticmethod
+    def parse_locations(value: str) -> list[str]:
+        """Parses a "['A', 'B']", "A|B" or "A;B" location cell."""
+        value = value.strip()
+        if value.startswith("[") and value.endswith("]"):
+            try:
+                locations = [x.strip().upper() for x in ast.literal_eval(value)]
+            except Exception:
+                locations = [value.upper()]
+        elif value:
+            locations = [x.strip().upper() for x in value.replace(";", "|").split("|")]
+        else:
+            locations = []
+
+        return sorted(x for x in locations if x)
+
+    @classmethod
+    def _load_department_locations(cls, path: Path) -> dict[str, list[str]]:
+        dept_to_loc = {}
+        with open(path, mode="r", encoding="latin1") as f:
+            for row in csv.reader(f):
+                if len(row) >= 2:
+                    dept_to_loc[row[0].strip().upper()] = cls.parse_locations(row[1])
+        return dept_to_loc
+
+    @staticmethod
+    def _load_exceptions(path: Path) -> bool:
+        settings.reload_exceptions()
+        return True
+
+
+mapping_registry = MappingRegistry()
@@ -4,6 +4,7 @@ import logging
 from app.core.database import async_session_factory
 from app.core.settings import settings
 from app.domain.enums import SyncStatus
+from app.infrastructure.automation.web.browser_pool import ahgora_browser_pool
 from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
 from app.services.credential_crypto import (
     decrypt_password,
@@ -44,6 +45,12 @@ class RetryScheduler:
             except Exception as e:
                 logger.error(f"Error in Retry Scheduler: {e}")
 
+            # Housekeeping: close pooled browsers that sat idle for too long
+            try:
+                await asyncio.to_thread(ahgora_browser_pool.evict_expired)
+            except Exception as e:
+                logger.error(f"Error evicting pooled browsers: {e}")
+
             await asyncio.sleep(self.interval_seconds)
 
     async def _check_and_retry_jobs(self):
@@ -55,13 +55,16 @@ class TaskRegistry:
     def get_all_tasks(self) -> dict[str, asyncio.Task]:
         return self._tasks.copy()
 
-    def register_cancel_event(self, job_id: UUID, event: threading.Event):
+    def register_cancel_event(self, job_id: UUID | str, event: threading.Event):
         job_key = str(job_id)
         self._cancel_events[job_key] = event
         logger.info(f"Registered cancel event for job {job_key}")
 
-    def get_cancel_event(self, job_id: UUID) -> threading.Event | None:
+    def get_cancel_event(self, job_id: UUID | str) -> threading.Event | None:
         return self._cancel_events.get(str(job_id))
 
+    def unregister_cancel_event(self, job_id: UUID | str):
+        self._cancel_events.pop(str(job_id), None)
+
 
 task_registry = TaskRegistry()
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Self
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+import httpx
+
+from app.core.settings import settings
+from app.infrastructure.automation.web.base_browser import BaseBrowser
+from app.infrastructure.automation.web.fiorilli_browser import leave_export_period
+
+logger = logging.getLogger(__name__)
+
+
+class ExportSignatureChanged(Exception):
+    """The replayed requests no longer return the expected export."""
+
+
+@dataclass(frozen=True)
+class ExportRequest:
+    method: str
+    path: str
+    params: Dict[str, str] = field(default_factory=dict)
+    data: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ExportRecipe:
+    """
+    The requests the browser flow ends up sending for one export, replayed in
+    order; the response to the last one is the file. `header` is how a genuine
+    export starts and tells it apart from a login page or an error screen.
+    Values in paths, params and form data may use `{start_date}`/`{end_date}`.
+    """
+
+    name: str
+    system: str
+    filename: str
+    header: str
+    requests: tuple[ExportRequest, ...]
+    encoding: str = "utf-8"
+
+    @classmethod
+    def from_dict(cls, name: str, raw: dict) -> "ExportRecipe":
+        return cls(
+            name=name,
+            system=raw["system"],
+            filename=raw["filename"],
+            header=raw["header"],
+            requests=tuple(ExportRequest(**r) for r in raw["requests"]),
+            encoding=raw.get("encoding", "utf-8"),
+        )
+
+
+def load_recipes(
+    path: Path = settings.EXPORT_RECIPES_JSON_PATH,
+) -> Dict[str, ExportRecipe]:
+    """Recorded export requests by name. Without the file every export uses the browser."""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        return {name: ExportRecipe.from_dict(name, r) for name, r in raw.items()}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.error(f"Ignoring invalid export recipes in {path}: {e}")
+        return {}
+
+
+@dataclass
+class BrowserSession:
+    base_url: str
+    cookies: Dict[str, str]
+    user_agent: Optional[str] = None
+
+
+def lift_session(browser_factory: Callable[[], BaseBrowser]) -> BrowserSession:
+    """Logs in with a throwaway browser and keeps only what HTTP replay needs."""
+    browser = browser_factory()
+    try:
+        browser.ensure_session()
+        url = urlsplit(browser.driver.current_url)
+        return BrowserSession(
+            base_url=f"{url.scheme}://{url.netloc}",
+            cookies=browser.session_cookies(),
+            user_agent=browser.driver.execute_script("return navigator.userAgent"),
+        )
+    finally:
+        browser.close_driver()
+
+
+class ExportClient:
+    """Replays export recipes with the cookies of a logged-in browser session."""
+
+    def __init__(
+        self,
+        session: BrowserSession,
+        timeout: float = settings.EXPORT_HTTP_TIMEOUT_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        headers = {"User-Agent": session.user_agent} if session.user_agent else {}
+        self._client = httpx.AsyncClient(
+            base_url=session.base_url,
+            cookies=session.cookies,
+            headers=headers,
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def export(
+        self,
+        recipe: ExportRecipe,
+        directory: Path,
+        context: Optional[Dict[str, str]] = None,
+    ) -> Path:
+        """Downloads the export into `directory` and returns its path."""
+        context = context or {}
+        response = None
+        for request in recipe.requests:
+            response = await self._client.request(
+                request.method,
+                request.path.format(**context),
+                params={k: v.format(**context) for k, v in request.params.items()},
+                data={k: v.format(**context) for k, v in request.data.items()} or None,
+            )
+            self._check_response(recipe, response)
+
+        self._check_content(recipe, response.content)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / recipe.filename
+        path.write_bytes(response.content)
+        return path
+
+    @staticmethod
+    def _check_response(recipe: ExportRecipe, response: httpx.Response) -> None:
+        # Redirects are not followed: an expired session sends us to the login page
+        if response.status_code != 200:
+            raise ExportSignatureChanged(
+                f"{recipe.name}: {response.request.method} {response.request.url.path}"
+                f" answered {response.status_code}"
+            )
+
+    @staticmethod
+    def _check_content(recipe: ExportRecipe, content: bytes) -> None:
+        start = content[: len(recipe.header.encode(recipe.encoding)) + 3]
+        text = start.decode(recipe.encoding, errors="replace").lstrip("\ufeff")
+        if not text.startswith(recipe.header):
+            raise ExportSignatureChanged(
+                f"{recipe.name}: response does not look like the export ({text!r})"
+            )
+
+
+class HttpExporter:
+    """
+    Fetches exports over HTTP during one sync. Each system is logged into once,
+    on first use, and its client is shared by all of that system's exports.
+    Callers fall back to the browser flow when `fetch` raises.
+    """
+
+    def __init__(
+        self,
+        logins: Dict[str, Callable[[], BrowserSession]],
+        recipes: Optional[Dict[str, ExportRecipe]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.logins = logins
+        self.recipes = load_recipes() if recipes is None else recipes
+        self.transport = transport
+        self.directory = settings.DOWNLOADS_DIR / f"session-{uuid4().hex}"
+        start_date, end_date = leave_export_period()
+        self.context = {"start_date": start_date, "end_date": end_date}
+        self._clients: Dict[str, ExportClient] = {}
+        self._login_errors: Dict[str, Exception] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def covers(self, names: List[str]) -> bool:
+        return bool(names) and all(
+            name in self.recipes and self.recipes[name].system in self.logins
+            for name in names
+        )
+
+    async def fetch(self, names: List[str]) -> List[Path]:
+        recipes = [self.recipes[name] for name in names]
+        clients = [await self._client(recipe.system) for recipe in recipes]
+        return list(
+            await asyncio.gather(
+                *(
+                    client.export(recipe, self.directory, self.context)
+                    for client, recipe in zip(clients, recipes)
+                )
+            )
+        )
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        try:
+            self.directory.rmdir()
+        except OSError:
+            pass
+
+    async def _client(self, system: str) -> ExportClient:
+        async with self._locks.setdefault(system, asyncio.Lock()):
+            if system in self._login_errors:
+                raise self._login_errors[system]
+            if system not in self._clients:
+                try:
+                    session = await asyncio.to_thread(self.logins[system])
+                except Exception as e:
+                    self._login_errors[system] = e
+                    raise
+                self._clients[system] = ExportClient(session, transport=self.transport)
+            return self._clients[system]
@@ -1,14 +1,25 @@
 import logging
+from pathlib import Path
 from typing import Callable, Optional
 
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
 
+from app.core.mappings import mapping_registry
 from app.core.settings import settings
 from app.infrastructure.automation.web.base_browser import BaseBrowser
 
 logger = logging.getLogger(__name__)
 
+# Visible success notification after a save
+SAVE_TOAST_JS = """
+    var toast = document.querySelector(
+        '.toast-success, .alert-success, .swal2-success, .notification-success'
+    );
+    return !!(toast && toast.offsetParent !== null);
+"""
+
 
 class AhgoraBrowser(BaseBrowser):
     def __init__(
@@ -36,13 +47,16 @@ class AhgoraBrowser(BaseBrowser):
         except NoSuchElementException:
             self._login()
 
-    def download_employees(self):
+    def download_employees(self) -> Path:
+        """Exports the employees CSV and returns the path of the downloaded file."""
         self._log("INFO", "Starting employees download from Ahgora")
         try:
             self.driver.get(self.driver.current_url.replace("home", "funcionarios"))
             self._click_plus_button()
-            self._export_to_csv()
+            path = self._export_to_csv()
             self._log("INFO", "Download of employees from Ahgora completed")
+            self.log_step_timings("Employees download")
+            return path
         finally:
             self.close_driver()
 
@@ -63,7 +77,26 @@ class AhgoraBrowser(BaseBrowser):
         self._check_login_error()
         self._select_company(company)
         self._close_banner()
-        self.wait(self.DELAY)
+        self.wait_for_page_ready(self.DELAY)
+        self.home_url = self.driver.current_url
+
+    def ensure_session(self) -> None:
+        """
+        Brings a reused browser back to the home page, which the task flows
+        expect as their starting point, and logs in again if the session expired.
+        """
+        self.check_cancel()
+        self.driver.get(self.home_url)
+        if self._on_login_page():
+            self._log("INFO", "Ahgora session expired, logging in again")
+            self._login()
+
+    def _on_login_page(self) -> bool:
+        self.driver.implicitly_wait(0)
+        try:
+            return bool(self.driver.find_elements(By.NAME, "email"))
+        finally:
+            self.driver.implicitly_wait(self.DELAY)
 
     def _enter_username(self, selector: str, user: str) -> None:
         self.send_keys(selector, user, selector_type=By.NAME)
@@ -112,12 +145,36 @@ class AhgoraBrowser(BaseBrowser):
     def _click_plus_button(self) -> None:
         self.click_element("mais", selector_type=By.ID)
 
-    def _export_to_csv(self) -> None:
+    def _export_to_csv(self) -> Path:
         self.click_element("exportar", selector_type=By.ID)
         self.select_dropdown_option("formatExport", "csv_todos", selector_type=By.ID)
-        self.click_element("sendFormat", selector_type=By.ID)
-        # Give some time for the download to start/finish
-        self.wait(10)
+        watcher = self.watch_downloads("funcionarios")
+        with self.step("export"):
+            self.click_element("sendFormat", selector_type=By.ID)
+        return self.wait_for_download(watcher)
+
+    def _open_page(self, url: str) -> None:
+        with self.step("open page"):
+            self.driver.get(url)
+            self.wait_for_page_ready(self.DELAY * 2)
+
+    def _save_form(self, timeout: float) -> None:
+        """Clicks Salvar and waits for the confirmation toast or the redirect."""
+        url = self.driver.current_url
+        with self.step("save"):
+            self.click_element("(//button[contains(text(), 'Salvar')])[last()]")
+            confirmed = self.wait_until(
+                lambda d: d.current_url != url or d.execute_script(SAVE_TOAST_JS),
+                timeout,
+                "save confirmation",
+            )
+            if not confirmed:
+                self._log(
+                    "WARNING",
+                    f"No save confirmation or redirect within {timeout}s; "
+                    "the changes may not have been saved",
+                )
+            self.wait_for_page_ready(self.DELAY)
 
     def add_employee(self, payload: dict) -> None:
         """
@@ -125,25 +182,38 @@ class AhgoraBrowser(BaseBrowser):
         :param payload: Dictionary containing employee details (from Fiorilli)
         """
         name = payload.get("name", "")
+        employee_id = str(payload.get("id", ""))
         self._log("INFO", f"Adding employee to Ahgora: {name}")
 
         # Ensure we are on the employee page
-        self.driver.get(self.driver.current_url.replace("home", "funcionarios"))
-        self.wait(self.DELAY)
+        self._open_page(self.driver.current_url.replace("home", "funcionarios"))
 
         # Click the 'Novo Funcionário' button
-        self.click_element("//button[contains(text(), 'Novo Funcionário')]")
-        self.wait(self.DELAY * 2)
+        with self.step("open form"):
+            self.click_element("//button[contains(text(), 'Novo Funcionário')]")
+            self.wait_until(
+                lambda d: d.find_elements(By.ID, "dados-nome"),
+                self.DELAY * 2,
+                "employee form",
+            )
+
+        with self.step("fill form"):
+            self._fill_new_employee_form(payload)
 
+        self._save_form(self.DELAY * 8)
+        self._log("INFO", f"Finished adding employee: {name} ({employee_id})")
+        self.log_step_timings("Add employee")
+
+    def _fill_new_employee_form(self, payload: dict) -> None:
         # Fill General Data
-        self.send_keys("dados-nome", name, By.ID)
+        self.send_keys("dados-nome", payload.get("name", ""), By.ID)
 
         pis = str(payload.get("pis_pasep", ""))
         if pis == "0" or not pis:
             pis = "00000000000"
         self.send_keys("dados-pis", pis, By.ID, typing_delay=0.1)
 
-        self.wait(self.DELAY)
+        self.wait_for_page_ready(self.DELAY)
 
         cpf = str(payload.get("cpf", ""))
         if cpf:
@@ -187,13 +257,6 @@ class AhgoraBrowser(BaseBrowser):
                     f"Could not update location multiselect automatically: {e}",
                 )
 
-        # Click Save
-        self.click_element("(//button[contains(text(), 'Salvar')])[last()]")
-
-        # Small wait for the request to process
-        self.wait(self.DELAY * 8)
-        self._log("INFO", f"Finished adding employee: {name} ({employee_id})")
-
     def update_employee(self, payload: dict) -> None:
         """
         Updates an existing employee.
@@ -203,12 +266,11 @@ class AhgoraBrowser(BaseBrowser):
         self._log("INFO", f"Updating employee in Ahgora: {name}")
 
         # Navigate to employee page
-        self.driver.get(
+        self._open_page(
             self.driver.current_url.replace(
                 "home", f"funcionarios/edita/?matric={employee_id}"
             )
         )
-        self.wait(self.DELAY)
 
         try:
             # Note: payload columns are suffixed with _fiorilli and _ahgora
@@ -286,9 +348,7 @@ class AhgoraBrowser(BaseBrowser):
                     )
 
             if has_changes:
-                # Click Save
-                self.click_element("(//button[contains(text(), 'Salvar')])[last()]")
-                self.wait(self.DELAY * 8)
+                self._save_form(self.DELAY * 8)
                 for change in change_logs:
                     self._log("INFO", change)
                 self._log("INFO", f"Finished updating employee: {name} ({employee_id})")
@@ -297,6 +357,7 @@ class AhgoraBrowser(BaseBrowser):
                     "INFO",
                     f"No specific fields were changed for {name} ({employee_id}), skipping save.",
                 )
+            self.log_step_timings("Update employee")
         except Exception as e:
             self._log(
                 "ERROR", f"Failed to find or edit employee {name} ({employee_id}): {e}"
@@ -317,30 +378,35 @@ class AhgoraBrowser(BaseBrowser):
             "INFO", f"Removing employee in Ahgora: {name} - {position} - {department}"
         )
 
-        self.driver.get(self.driver.current_url.replace("home", "funcionarios"))
-        self.wait(self.DELAY)
+        self._open_page(self.driver.current_url.replace("home", "funcionarios"))
 
         # Search for the employee
-        self.send_keys("filtro_funcionarios", employee_id, By.ID)
-        self.wait(self.DELAY)
-        self.send_enter_key("filtro_funcionarios", By.ID)
-        self.wait(self.DELAY)
+        with self.step("search"):
+            self.send_keys("filtro_funcionarios", employee_id, By.ID)
+            self.send_enter_key("filtro_funcionarios", By.ID)
+            self.wait_for_page_ready(self.DELAY)
 
         try:
             # Click to Delete/Dismiss
             self.click_element(
                 f"//a[contains(@title, 'Demitir funcionario {name.upper()}') or contains(@class, 'icone_remover')]"
             )
-            self.wait(self.DELAY)
 
             # Form field for dismissal date
             try:
-                self.send_keys("dt_demissao", dismissal_date, By.ID, clear_first=True)
-                self.wait(self.DELAY)
-                self.click_element(
-                    "//*[@id='funcionarios']/tbody/tr[1]/td/div/div[2]/div/button[2]"
-                )
-                self.wait(self.DELAY * 2)
+                with self.step("dismiss"):
+                    self.send_keys(
+                        "dt_demissao", dismissal_date, By.ID, clear_first=True
+                    )
+                    self.click_element(
+                        "//*[@id='funcionarios']/tbody/tr[1]/td/div/div[2]/div/button[2]"
+                    )
+                    self.wait_until(
+                        lambda d: not d.find_elements(By.ID, "dt_demissao"),
+                        self.DELAY * 2,
+                        "dismissal form to close",
+                    )
+                    self.wait_for_page_ready(self.DELAY)
             except Exception as e:
                 self._log(
                     "INFO",
@@ -352,6 +418,7 @@ class AhgoraBrowser(BaseBrowser):
                 "INFO",
                 f"Finished removing employee: {name} ({employee_id}) - {dismissal_date}",
             )
+            self.log_step_timings("Remove employee")
         except Exception as e:
             self._log("ERROR", f"Failed to remove employee {name} ({employee_id}): {e}")
             raise e
@@ -367,14 +434,13 @@ class AhgoraBrowser(BaseBrowser):
         if import_path == settings.AHGORA_URL:  # Defense if URL structure was weird
             import_path = "https://app.ahgora.com.br/afastamentos/importa"
 
-        self.driver.get(import_path)
-        self.wait(self.DELAY * 2)
+        self._open_page(import_path)
 
         try:
             # Find the file input element and send the file path
             file_input = self.driver.find_element(By.XPATH, "//input[@type='file']")
             file_input.send_keys(file_path)
-            self.wait(self.DELAY)
+            self.wait_for_page_ready(self.DELAY)
 
             # Ensure the specific layout is selected (pw_afimport_01)
             try:
@@ -384,10 +450,20 @@ class AhgoraBrowser(BaseBrowser):
 
             # Click the upload/process button
             # Button labeled 'Obter Registros'
-            self.click_element("//*/form/div[6]/button[2]")
-
-            self.wait(self.DELAY * 5)  # Let the upload process
+            with self.step("upload"):
+                upload_button = self.click_element("//*/form/div[6]/button[2]")
+                # The form posts and reloads, or the validation log shows up in place
+                self.wait_until(
+                    lambda d: (
+                        EC.staleness_of(upload_button)(d)
+                        or d.find_elements(By.ID, "obterErro")
+                    ),
+                    self.DELAY * 5,
+                    "upload to be processed",
+                )
+                self.wait_for_page_ready(self.DELAY)
             self._log("INFO", f"Finished uploading leaves file from {file_path}")
+            self.log_step_timings("Leaves upload")
         except Exception as e:
             self._log("ERROR", f"Failed to upload leaves file: {e}")
             raise e
@@ -434,9 +510,21 @@ class AhgoraBrowser(BaseBrowser):
         Clicks the save/confirm button to finalize the import of valid records.
         """
         try:
-            self.click_element(selector="sendLeave", selector_type=By.ID)
-            self.wait(self.DELAY * 20)
+            with self.step("confirm import"):
+                send_button = self.click_element(
+                    selector="sendLeave", selector_type=By.ID
+                )
+                self.wait_until(
+                    lambda d: (
+                        EC.staleness_of(send_button)(d)
+                        or d.execute_script(SAVE_TOAST_JS)
+                    ),
+                    self.DELAY * 20,
+                    "import confirmation",
+                )
+                self.wait_for_page_ready(self.DELAY)
             self._log("INFO", "Successfully confirmed and saved leaves import.")
+            self.log_step_timings("Leaves import")
         except Exception as e:
             self._log("ERROR", f"Failed to confirm leaves import: {e}")
             raise e
@@ -482,7 +570,7 @@ class AhgoraBrowser(BaseBrowser):
                 }}
             """
             self.driver.execute_script(script)
-            self.wait(1)
+            self.wait_for_page_ready(1)
         except Exception as e:
             self._log(
                 "WARNING", f"Failed to set autocomplete select '{element_id}': {e}"
@@ -496,40 +584,9 @@ class AhgoraBrowser(BaseBrowser):
         Uses the department_to_location.csv mapping if it exists.
         Returns True if any checkbox was changed, False otherwise.
         """
-        import csv
-
-        from app.core.settings import settings
-
-        csv_path = settings.DATA_DIR / "mappings" / "department_to_location.csv"
-
-        target_locations = []
-        if csv_path.exists():
-            try:
-                with open(csv_path, mode="r", encoding="latin1") as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if (
-                            len(row) >= 2
-                            and row[0].strip().upper()
-                            == department_name.strip().upper()
-                        ):
-                            val = row[1].strip()
-                            if val.startswith("[") and val.endswith("]"):
-                                import ast
-
-                                try:
-                                    target_locations = [
-                                        x.strip().upper() for x in ast.literal_eval(val)
-                                    ]
-                                except Exception:
-                                    target_locations = [val.upper()]
-                            else:
-                                target_locations = [
-                                    x.strip().upper() for x in val.split(";")
-                                ]
-                            break
-            except Exception as e:
-                self._log("WARNING", f"Could not read department_to_location.csv: {e}")
+        target_locations = mapping_registry.get_locations_for_department(
+            department_name
+        )
 
         if not target_locations:
             self._log(
@@ -556,7 +613,14 @@ class AhgoraBrowser(BaseBrowser):
                 self._log("WARNING", f"Could not find multiselect button: {e}")
                 return False
 
-        self.wait(1)
+        self.wait_until(
+            lambda d: d.execute_script(
+                "var c = document.querySelector('ul.multiselect-container');"
+                " return !!(c && c.offsetParent !== null);"
+            ),
+            1,
+            "location dropdown",
+        )
 
         script = """
             var targetLocs = arguments[0];
@@ -1,8 +1,13 @@
 import logging
+import random
 import time
 import threading
 from abc import ABC
-from typing import Any, Callable, List, Union, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Union, Optional
+from uuid import uuid4
 
 from selenium import webdriver
 from selenium.common.exceptions import (
@@ -18,6 +23,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from app.core.download_watcher import DownloadWatcher
 from app.core.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -27,9 +33,40 @@ class BrowserCancelledException(Exception):
     pass
 
 
+# Document loaded and no jQuery request in flight
+PAGE_READY_JS = (
+    "return document.readyState === 'complete'"
+    " && (typeof jQuery === 'undefined' || jQuery.active === 0);"
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Pause between failed attempts of `retry_func`: `first_delay` after the first
+    failure, multiplied by `multiplier` after each further one up to `max_delay`,
+    plus up to `jitter` (a fraction of the delay) of random noise.
+    The first attempt always runs immediately.
+    """
+
+    first_delay: float = 0.1
+    multiplier: float = 2.0
+    max_delay: float = 2.0
+    jitter: float = 0.1
+
+    def delay(self, failures: int) -> float:
+        delay = min(
+            self.max_delay, self.first_delay * self.multiplier ** (failures - 1)
+        )
+        return delay + random.uniform(0, delay * self.jitter)
+
+
 class BaseBrowser(ABC):
     MAX_TRIES = 30
     DELAY = 1
+    POLL_INTERVAL = 0.2
+    # Subclasses override this to retry more patiently or more eagerly
+    RETRY_POLICY = RetryPolicy()
     IGNORED_EXCEPTIONS = (
         ElementClickInterceptedException,
         ElementNotInteractableException,
@@ -70,6 +107,9 @@ class BaseBrowser(ABC):
         self.log_callback = log_callback
         self.headless = headless if headless is not None else settings.HEADLESS_MODE
         self.cancel_event = cancel_event
+        self.step_timings: List[tuple[str, float]] = []
+        # Private download folder, so concurrent browsers never pick up each other's files
+        self.download_dir: Path = settings.DOWNLOADS_DIR / f"session-{uuid4().hex}"
         self.driver = self._get_web_driver()
         if url:
             self.driver.get(url)
@@ -105,12 +145,17 @@ class BaseBrowser(ABC):
         options.set_preference("security.sandbox.content.level", 0)
 
         # Ensure download directory exists
-        settings.DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
 
         options.set_preference("browser.download.folderList", 2)
-        options.set_preference("browser.download.dir", str(settings.DOWNLOADS_DIR))
+        options.set_preference("browser.download.dir", str(self.download_dir))
 
-        driver = webdriver.Firefox(options=options)
+        try:
+            driver = webdriver.Firefox(options=options)
+        except Exception:
+            # close_driver is never reached when the constructor fails
+            self.download_dir.rmdir()
+            raise
         driver.implicitly_wait(self.DELAY)
         return driver
 
@@ -119,6 +164,15 @@ class BaseBrowser(ABC):
             self.driver.quit()
         except Exception:
             pass
+        try:
+            # Only once empty: downloaded files are moved out by the caller
+            self.download_dir.rmdir()
+        except OSError:
+            pass
+
+    def session_cookies(self) -> Dict[str, str]:
+        """Cookies of the current session, to replay its requests outside the browser."""
+        return {c["name"]: c["value"] for c in self.driver.get_cookies()}
 
     def check_cancel(self):
         if self.cancel_event and self.cancel_event.is_set():
@@ -132,24 +186,95 @@ class BaseBrowser(ABC):
             self.check_cancel()
             time.sleep(min(0.5, end_time - time.time()))
 
+    def wait_until(
+        self,
+        condition: Callable[[Any], Any],
+        timeout: float,
+        description: str = "condition",
+    ) -> bool:
+        """
+        Polls `condition(driver)` until it is truthy, checking for cancellation.
+        `timeout` is an upper bound: returns False when it expires.
+        """
+        end_time = time.monotonic() + timeout
+        while True:
+            self.check_cancel()
+            try:
+                if condition(self.driver):
+                    return True
+            except self.IGNORED_EXCEPTIONS:
+                pass
+
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                self._log(
+                    "DEBUG", f"Timed out after {timeout}s waiting for {description}"
+                )
+                return False
+            time.sleep(min(self.POLL_INTERVAL, remaining))
+
+    def watch_downloads(self, pattern: str) -> DownloadWatcher:
+        """Starts watching for a download. Call it before triggering the export."""
+        return DownloadWatcher(self.download_dir, pattern)
+
+    def wait_for_download(
+        self,
+        watcher: DownloadWatcher,
+        timeout: float = settings.DOWNLOAD_TIMEOUT_SECONDS,
+    ) -> Path:
+        """Blocks until the watched download is complete and returns its path."""
+        with self.step("download"):
+            path = watcher.wait(timeout, check_cancel=self.check_cancel)
+        self._log("INFO", f"Download finished: {path.name}")
+        return path
+
+    def wait_for_page_ready(self, timeout: float) -> bool:
+        return self.wait_until(
+            lambda d: d.execute_script(PAGE_READY_JS), timeout, "page to be ready"
+        )
+
+    @contextmanager
+    def step(self, name: str):
+        """Records the elapsed time of a named step in `step_timings`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.step_timings.append((name, time.perf_counter() - start))
+
+    def log_step_timings(self, label: str) -> None:
+        if not self.step_timings:
+            return
+        timings = ", ".join(
+            f"{name} {elapsed:.1f}s" for name, elapsed in self.step_timings
+        )
+        self._log("INFO", f"{label} step timings: {timings}")
+        self.step_timings.clear()
+
     def retry_func(self, func: Callable[[], Any], max_tries: int = MAX_TRIES) -> Any:
-        error = None
-        for i in range(max_tries):
+        """
+        Runs `func` right away and retries it on failure, pausing between attempts
+        as dictated by RETRY_POLICY.
+        """
+        for attempt in range(1, max_tries + 1):
             self.check_cancel()
             try:
-                self.wait(self.DELAY)
-                self.check_cancel()
                 return func()
             except BrowserCancelledException as e:
                 raise e
             except Exception as e:
-                error = e
-                if i >= max_tries - 1:
+                if attempt >= max_tries:
                     logger.error(f"Failed after {max_tries} attempts: {e}")
                     raise e
-                self.wait(self.DELAY)
-        if error:
-            raise error
+                self.wait(self.RETRY_POLICY.delay(attempt))
+
+    def _driver_wait(self, delay: float, ignored_exceptions) -> WebDriverWait:
+        return WebDriverWait(
+            self.driver,
+            delay,
+            poll_frequency=self.POLL_INTERVAL,
+            ignored_exceptions=ignored_exceptions,
+        )
 
     def click_element(
         self,
@@ -159,7 +284,8 @@ class BaseBrowser(ABC):
         ignored_exceptions=IGNORED_EXCEPTIONS,
         max_tries=MAX_TRIES,
     ):
-        self.retry_func(
+        """Clicks the element and returns it."""
+        return self.retry_func(
             lambda: self._click_element_helper(
                 selector, selector_type, delay, ignored_exceptions
             ),
@@ -173,9 +299,11 @@ class BaseBrowser(ABC):
         delay,
         ignored_exceptions,
     ):
-        WebDriverWait(self.driver, delay, ignored_exceptions=ignored_exceptions).until(
+        element = self._driver_wait(delay, ignored_exceptions).until(
             EC.presence_of_element_located((selector_type, selector))
-        ).click()
+        )
+        element.click()
+        return element
 
     def send_keys(
         self,
@@ -211,9 +339,9 @@ class BaseBrowser(ABC):
         clear_first=False,
         typing_delay=0,
     ):
-        element = WebDriverWait(
-            self.driver, delay, ignored_exceptions=ignored_exceptions
-        ).until(EC.presence_of_element_located((selector_type, selector)))
+        element = self._driver_wait(delay, ignored_exceptions).until(
+            EC.presence_of_element_located((selector_type, selector))
+        )
         if clear_first:
             element.clear()
         for char in keys:
@@ -243,9 +371,9 @@ class BaseBrowser(ABC):
         ignored_exceptions,
     ):
         ActionChains(self.driver).context_click(
-            WebDriverWait(
-                self.driver, delay, ignored_exceptions=ignored_exceptions
-            ).until(EC.presence_of_element_located((selector_type, selector)))
+            self._driver_wait(delay, ignored_exceptions).until(
+                EC.presence_of_element_located((selector_type, selector))
+            )
         ).perform()
 
     def select_and_send_keys(
@@ -290,9 +418,9 @@ class BaseBrowser(ABC):
         delay,
         ignored_exceptions,
     ):
-        element = WebDriverWait(
-            self.driver, delay, ignored_exceptions=ignored_exceptions
-        ).until(EC.presence_of_element_located((selector_type, selector)))
+        element = self._driver_wait(delay, ignored_exceptions).until(
+            EC.presence_of_element_located((selector_type, selector))
+        )
 
         ActionChains(self.driver).click(element).key_down(Keys.CONTROL).send_keys(
             "a"
@@ -319,9 +447,9 @@ class BaseBrowser(ABC):
     ):
         from selenium.webdriver.support.ui import Select
 
-        element = WebDriverWait(
-            self.driver, delay, ignored_exceptions=ignored_exceptions
-        ).until(EC.presence_of_element_located((selector_type, selector)))
+        element = self._driver_wait(delay, ignored_exceptions).until(
+            EC.presence_of_element_located((selector_type, selector))
+        )
         Select(element).select_by_value(value)
 
     def wait_desappear(
@@ -332,6 +460,8 @@ class BaseBrowser(ABC):
         ignored_exceptions=IGNORED_EXCEPTIONS,
         max_tries=50,
     ):
+        # The loading overlay usually appears a moment after the triggering action
+        self.wait(self.DELAY)
         return self.retry_func(
             lambda: self._wait_desappear_helper(
                 selector, selector_type, (delay * 1.1), ignored_exceptions
@@ -346,7 +476,7 @@ class BaseBrowser(ABC):
         delay,
         ignored_exceptions,
     ):
-        WebDriverWait(self.driver, delay, ignored_exceptions=ignored_exceptions).until(
+        self._driver_wait(delay, ignored_exceptions).until(
             EC.invisibility_of_element_located((selector_type, selector))
         )
 
@@ -373,9 +503,9 @@ class BaseBrowser(ABC):
         ignored_exceptions,
     ):
         ActionChains(self.driver).move_to_element(
-            WebDriverWait(
-                self.driver, delay, ignored_exceptions=ignored_exceptions
-            ).until(EC.presence_of_element_located((selector_type, selector)))
+            self._driver_wait(delay, ignored_exceptions).until(
+                EC.presence_of_element_located((selector_type, selector))
+            )
         ).perform()
 
     def send_enter_key(
@@ -400,7 +530,7 @@ class BaseBrowser(ABC):
         delay,
         ignored_exceptions,
     ):
-        element = WebDriverWait(
-            self.driver, delay, ignored_exceptions=ignored_exceptions
-        ).until(EC.presence_of_element_located((selector_type, selector)))
+        element = self._driver_wait(delay, ignored_exceptions).until(
+            EC.presence_of_element_located((selector_type, selector))
+        )
         element.send_keys(Keys.ENTER)
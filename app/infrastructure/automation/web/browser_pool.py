@@ -0,0 +1,220 @@
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from app.core.settings import settings
+from app.infrastructure.automation.web.ahgora_browser import AhgoraBrowser
+from app.infrastructure.automation.web.base_browser import BrowserCancelledException
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, str, str, bool]
+
+
+@dataclass
+class _PooledBrowser:
+    browser: AhgoraBrowser
+    key: PoolKey
+    password_digest: str
+    created_at: float
+    last_used: float
+
+
+class AhgoraBrowserPool:
+    """
+    Keeps logged-in AhgoraBrowser instances alive between tasks, keyed by
+    (url, user, company, headless), so a batch pays for Firefox startup and
+    login once.
+
+    A browser is checked out exclusively through `session()` or `run()`. On
+    checkout it is sent back to the home page and logged in again if the session
+    expired; a browser that fails this health check is closed and replaced. It
+    only returns to the pool when the task finished cleanly (without raising
+    and, for `run()`, without returning False) and was not cancelled. Idle
+    browsers are closed after `idle_timeout_seconds` and any browser after
+    `max_age_seconds`.
+    """
+
+    def __init__(
+        self,
+        max_idle_per_key: int = settings.BROWSER_POOL_MAX_IDLE,
+        max_age_seconds: float = settings.BROWSER_POOL_MAX_AGE_SECONDS,
+        idle_timeout_seconds: float = settings.BROWSER_POOL_IDLE_SECONDS,
+        factory: Callable[..., AhgoraBrowser] = AhgoraBrowser,
+    ):
+        self.max_idle_per_key = max_idle_per_key
+        self.max_age_seconds = max_age_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._idle: dict[PoolKey, list[_PooledBrowser]] = {}
+
+    @contextmanager
+    def session(
+        self,
+        ahgora_user: Optional[str] = None,
+        ahgora_password: Optional[str] = None,
+        ahgora_company: Optional[str] = None,
+        ahgora_url: Optional[str] = None,
+        log_callback: Optional[Callable[[str, str], None]] = None,
+        headless: Optional[bool] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[AhgoraBrowser]:
+        """Checks out a logged-in browser for the duration of the block."""
+        entry = self._checkout(
+            ahgora_user=ahgora_user,
+            ahgora_password=ahgora_password,
+            ahgora_company=ahgora_company,
+            ahgora_url=ahgora_url,
+            log_callback=log_callback,
+            headless=headless,
+            cancel_event=cancel_event,
+        )
+        healthy = False
+        try:
+            yield entry.browser
+            healthy = True
+        finally:
+            self._checkin(entry, healthy)
+
+    def run(self, task: Callable[[AhgoraBrowser], Any], **session_kwargs) -> Any:
+        """
+        Runs `task` with a checked-out browser and returns its result. A task
+        returning False may have left the page on an error or a modal, so the
+        browser is closed instead of going back to the pool.
+        """
+        entry = self._checkout(**session_kwargs)
+        healthy = False
+        try:
+            result = task(entry.browser)
+            healthy = result is not False
+            return result
+        finally:
+            self._checkin(entry, healthy)
+
+    def evict_expired(self) -> int:
+        """Closes idle browsers past their idle timeout or max age."""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, entries in list(self._idle.items()):
+                keep = []
+                for entry in entries:
+                    if self._is_expired(entry, now):
+                        expired.append(entry)
+                    else:
+                        keep.append(entry)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+
+        for entry in expired:
+            self._discard(entry, "expired")
+        return len(expired)
+
+    def close_all(self) -> None:
+        with self._lock:
+            entries = [e for entries in self._idle.values() for e in entries]
+            self._idle.clear()
+        for entry in entries:
+            self._discard(entry, "pool closed")
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._idle.values())
+
+    def _checkout(
+        self,
+        ahgora_user: Optional[str] = None,
+        ahgora_password: Optional[str] = None,
+        ahgora_company: Optional[str] = None,
+        ahgora_url: Optional[str] = None,
+        log_callback: Optional[Callable[[str, str], None]] = None,
+        headless: Optional[bool] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> _PooledBrowser:
+        key = (
+            ahgora_url or settings.AHGORA_URL,
+            ahgora_user if ahgora_user is not None else settings.AHGORA_USER,
+            ahgora_company if ahgora_company is not None else settings.AHGORA_COMPANY,
+            headless if headless is not None else settings.HEADLESS_MODE,
+        )
+        password_digest = hashlib.sha256((ahgora_password or "").encode()).hexdigest()
+        self.evict_expired()
+
+        while True:
+            with self._lock:
+                entries = self._idle.get(key)
+                entry = entries.pop() if entries else None
+            if entry is None:
+                break
+
+            if entry.password_digest != password_digest:
+                self._discard(entry, "credentials changed")
+                continue
+
+            entry.browser.log_callback = log_callback
+            entry.browser.cancel_event = cancel_event
+            try:
+                entry.browser.ensure_session()
+            except BrowserCancelledException:
+                self._discard(entry, "cancelled during checkout")
+                raise
+            except Exception as e:
+                self._discard(entry, f"health check failed: {e}")
+                continue
+
+            logger.info(f"Reusing pooled Ahgora browser for {key[1]}@{key[2]}")
+            return entry
+
+        browser = self.factory(
+            ahgora_password=ahgora_password,
+            ahgora_user=ahgora_user,
+            ahgora_company=ahgora_company,
+            ahgora_url=ahgora_url,
+            log_callback=log_callback,
+            headless=headless,
+            cancel_event=cancel_event,
+        )
+        now = time.monotonic()
+        return _PooledBrowser(browser, key, password_digest, now, now)
+
+    def _checkin(self, entry: _PooledBrowser, healthy: bool) -> None:
+        browser = entry.browser
+        cancelled = bool(browser.cancel_event and browser.cancel_event.is_set())
+        browser.log_callback = None
+        browser.cancel_event = None
+        entry.last_used = time.monotonic()
+
+        if not healthy or cancelled:
+            self._discard(entry, "cancelled" if cancelled else "task failed")
+            return
+        if self._is_expired(entry, entry.last_used):
+            self._discard(entry, "expired")
+            return
+
+        with self._lock:
+            entries = self._idle.setdefault(entry.key, [])
+            if len(entries) < self.max_idle_per_key:
+                entries.append(entry)
+                return
+        self._discard(entry, "pool full")
+
+    def _is_expired(self, entry: _PooledBrowser, now: float) -> bool:
+        return (
+            now - entry.created_at >= self.max_age_seconds
+            or now - entry.last_used >= self.idle_timeout_seconds
+        )
+
+    @staticmethod
+    def _discard(entry: _PooledBrowser, reason: str) -> None:
+        logger.info(f"Closing pooled Ahgora browser ({reason})")
+        entry.browser.close_driver()
+
+
+ahgora_browser_pool = AhgoraBrowserPool()
@@ -1,6 +1,7 @@
 import logging
 from datetime import date, datetime
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 from time import sleep
 
 from dateutil.relativedelta import relativedelta
@@ -12,6 +13,14 @@ from app.infrastructure.automation.web.base_browser import BaseBrowser
 logger = logging.getLogger(__name__)
 
 
+def leave_export_period() -> tuple[str, str]:
+    """Start and end dates (dd/mm/yyyy) of the leaves and vacations exports."""
+    today = datetime.today()
+    start_date = today - relativedelta(months=settings.LEAVES_MONTHS_AGO)
+    year_end = date(today.year, 12, 31)
+    return start_date.strftime("%d/%m/%Y"), year_end.strftime("%d/%m/%Y")
+
+
 class FiorilliBrowser(BaseBrowser):
     def __init__(
         self,
@@ -32,7 +41,8 @@ class FiorilliBrowser(BaseBrowser):
             cancel_event=cancel_event,
         )
 
-    def download_employees(self):
+    def download_employees(self) -> Path:
+        """Exports the workers TXT and returns the path of the downloaded file."""
         logger.info("Starting employees download from Fiorilli")
         try:
             self._login()
@@ -48,13 +58,16 @@ class FiorilliBrowser(BaseBrowser):
             self._move_to_grid_option()
             self._click_grid_option()
             self._click_export_option()
+            watcher = self.watch_downloads("trabalhador")
             self._click_export_txt_option()
-            self._wait_for_export_to_complete()
+            path = self.wait_for_download(watcher)
             logger.info("Download of employees from Fiorilli completed")
+            return path
         finally:
             self.close_driver()
 
-    def download_leaves(self):
+    def download_leaves(self) -> List[Path]:
+        """Exports vacations and leaves and returns the paths of both files."""
         logger.info("Starting leaves download from Fiorilli")
         try:
             self._login()
@@ -62,13 +75,22 @@ class FiorilliBrowser(BaseBrowser):
             self._navigate_to_import_export_section()
             self._navigate_to_export_section()
             self._navigate_to_export_file_section()
-            self._insert_date_for_input(name="PontoFerias2")
-            self._insert_date_for_input(name="PontoAfastamentos2")
+            paths = [
+                self._export_file(name="PontoFerias2", pattern="pontoferias"),
+                self._export_file(
+                    name="PontoAfastamentos2", pattern="pontoafastamentos"
+                ),
+            ]
             self._close_tab()
             logger.info("Download of leaves from Fiorilli completed")
+            return paths
         finally:
             self.close_driver()
 
+    def ensure_session(self) -> None:
+        """Logs in. Fiorilli browsers are not reused, so there is nothing to refresh."""
+        self._login()
+
     def _login(self) -> None:
         user = self.fiorilli_user
         psw = self.fiorilli_password
@@ -169,27 +191,37 @@ class FiorilliBrowser(BaseBrowser):
     def _click_export_txt_option(self) -> None:
         self.click_element("//span[contains(text(), 'Exportar em TXT')]")
 
-    def _wait_for_export_to_complete(self) -> None:
-        self.wait_desappear("//*[contains(text(), 'Exportando')]")
-
     def _navigate_to_utilities_section(self) -> None:
         self.click_element("//span[contains(text(), '7 - Utilitários')]")
 
     def _navigate_to_import_export_section(self) -> None:
-        for i in range(2):
-            self.click_element(
-                "//span[contains(text(), '7.14 - Importar/Exportar')]",
-            )
+        self._expand_tree_node("7.14 - Importar/Exportar", child="7.14.2 - Exportar")
 
     def _navigate_to_export_section(self) -> None:
-        for i in range(2):
-            self.click_element(
-                "//span[contains(text(), '7.14.2 - Exportar')]",
-            )
+        self._expand_tree_node("7.14.2 - Exportar", child="7.14.2.2 - Exportar Arquivo")
+
+    def _expand_tree_node(self, node: str, child: str) -> None:
+        """Double-clicks a menu tree node, letting it expand between the clicks."""
+        node_xpath = f"//span[contains(text(), '{node}')]"
+        child_xpath = f"//span[contains(text(), '{child}')]"
+        self.click_element(node_xpath)
+        self.wait_until(
+            lambda d: any(
+                e.is_displayed() for e in d.find_elements(By.XPATH, child_xpath)
+            ),
+            self.DELAY,
+            f"'{child}' to be visible",
+        )
+        self.click_element(node_xpath)
 
     def _navigate_to_export_file_section(self) -> None:
         self.click_element("//span[contains(text(), '7.14.2.2 - Exportar Arquivo')]")
 
+    def _export_file(self, name: str, pattern: str) -> Path:
+        watcher = self.watch_downloads(pattern)
+        self._insert_date_for_input(name=name)
+        return self.wait_for_download(watcher)
+
     def _insert_date_for_input(self, name: str) -> None:
         self._insert_date_fiorilli_input(name=name)
 
@@ -203,12 +235,8 @@ class FiorilliBrowser(BaseBrowser):
         self.click_element(f"//div[contains(text(), '{name}')]")
 
     def _fill_input_field(self) -> None:
-        today = datetime.today()
-        today_str = today.strftime("%d/%m/%Y")
-        start_date = (
-            today - relativedelta(months=settings.LEAVES_MONTHS_AGO)
-        ).strftime("%d/%m/%Y")
-        year_end = date(today.year, 12, 31).strftime("%d/%m/%Y")
+        today_str = datetime.today().strftime("%d/%m/%Y")
+        start_date, year_end = leave_export_period()
         self.select_and_send_keys(
             f"//input[@value='{today_str}']",
             [
@@ -0,0 +1,46 @@
+"""add unique constraint to ahgora_leaves
+
+Revision ID: 4d1c7a9e2b60
+Revises: b85f41ed1fb8
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d1c7a9e2b60"
+down_revision: Union[str, Sequence[str], None] = "b85f41ed1fb8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drop duplicates left by previous re-imports, keeping the oldest row
+    op.execute(
+        """
+        DELETE FROM ahgora_leaves a
+        USING ahgora_leaves b
+        WHERE a.id > b.id
+          AND a.employee_id = b.employee_id
+          AND a.cod = b.cod
+          AND a.start_date = b.start_date
+          AND a.end_date IS NOT DISTINCT FROM b.end_date
+        """
+    )
+    op.create_unique_constraint(
+        "uq_ahgora_leaves_employee_cod_dates",
+        "ahgora_leaves",
+        ["employee_id", "cod", "start_date", "end_date"],
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_ahgora_leaves_employee_cod_dates", "ahgora_leaves", type_="unique"
+    )
@@ -0,0 +1,32 @@
+"""add automation_tasks job_id/status index
+
+Revision ID: 5b8d2e6f4a91
+Revises: e7a2c4b9f013
+Create Date: 2026-10-16 12:05:33.902145
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8d2e6f4a91"
+down_revision: Union[str, Sequence[str], None] = "e7a2c4b9f013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_automation_tasks_job_id_status",
+        "automation_tasks",
+        ["job_id", "status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_automation_tasks_job_id_status", table_name="automation_tasks")
@@ -0,0 +1,33 @@
+"""add log cursor indexes
+
+Revision ID: 9c3e5f1a7d24
+Revises: 4d1c7a9e2b60
+Create Date: 2026-10-16 11:02:17.540913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3e5f1a7d24"
+down_revision: Union[str, Sequence[str], None] = "4d1c7a9e2b60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_sync_logs_job_id_id", "sync_logs", ["job_id", "id"], unique=False
+    )
+    op.create_index(
+        "ix_sync_logs_task_id_id", "sync_logs", ["task_id", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sync_logs_task_id_id", table_name="sync_logs")
+    op.drop_index("ix_sync_logs_job_id_id", table_name="sync_logs")
@@ -0,0 +1,34 @@
+"""add automation_tasks job_id/type/status index
+
+Revision ID: c3f8a1d6e592
+Revises: 5b8d2e6f4a91
+Create Date: 2026-10-16 13:21:47.518306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d6e592"
+down_revision: Union[str, Sequence[str], None] = "5b8d2e6f4a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_automation_tasks_job_id_type_status",
+        "automation_tasks",
+        ["job_id", "type", "status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_automation_tasks_job_id_type_status", table_name="automation_tasks"
+    )
@@ -0,0 +1,35 @@
+"""add sync_jobs list indexes
+
+Revision ID: e7a2c4b9f013
+Revises: 9c3e5f1a7d24
+Create Date: 2026-10-16 11:40:52.117306
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a2c4b9f013"
+down_revision: Union[str, Sequence[str], None] = "9c3e5f1a7d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_sync_jobs_created_at_id",
+        "sync_jobs",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index("ix_sync_jobs_status", "sync_jobs", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sync_jobs_status", table_name="sync_jobs")
+    op.drop_index("ix_sync_jobs_created_at_id", table_name="sync_jobs")
@@ -2,7 +2,16 @@ from typing import Optional
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, Text, Boolean
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    Boolean,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +38,11 @@ class SyncJobModel(Base):
     retry_count: Mapped[int] = mapped_column(default=0)
     next_retry_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index("ix_sync_jobs_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_sync_jobs_status", "status"),
+    )
+
     logs: Mapped[list["SyncLogModel"]] = relationship(
         back_populates="job", cascade="all, delete-orphan"
     )
@@ -40,6 +54,10 @@ class SyncJobModel(Base):
 
 class SyncLogModel(Base):
     __tablename__ = "sync_logs"
+    __table_args__ = (
+        Index("ix_sync_logs_job_id_id", "job_id", "id"),
+        Index("ix_sync_logs_task_id_id", "task_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     job_id: Mapped[UUID] = mapped_column(ForeignKey("sync_jobs.id"))
@@ -72,6 +90,11 @@ class AutomationTaskModel(Base):
     error_message: Mapped[str] = mapped_column(Text, nullable=True)
     retry_count: Mapped[int] = mapped_column(default=0)
 
+    __table_args__ = (
+        Index("ix_automation_tasks_job_id_status", "job_id", "status"),
+        Index("ix_automation_tasks_job_id_type_status", "job_id", "type", "status"),
+    )
+
     job: Mapped["SyncJobModel"] = relationship(back_populates="automation_tasks")
     logs: Mapped[list["SyncLogModel"]] = relationship(
         back_populates="task", cascade="all, delete-orphan"
@@ -109,6 +132,16 @@ class AhgoraLeaveModel(Base):
     """Stores the latest synced state of employee leaves in the Ahgora system."""
 
     __tablename__ = "ahgora_leaves"
+    __table_args__ = (
+        UniqueConstraint(
+            "employee_id",
+            "cod",
+            "start_date",
+            "end_date",
+            name="uq_ahgora_leaves_employee_cod_dates",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     employee_id: Mapped[str] = mapped_column(String, index=True)
@@ -1,11 +1,14 @@
+import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 import pandas as pd
-from sqlalchemy import select
+from sqlalchemy import func, insert, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.settings import settings
 from app.domain.entities import (
     AutomationTask,
     AutomationTaskStatus,
@@ -25,6 +28,38 @@ from app.infrastructure.db.models import (
     UserModel,
 )
 
+logger = logging.getLogger(__name__)
+
+# Columns of the job list, without the (potentially large) metadata JSON
+JOB_SUMMARY_COLUMNS = (
+    SyncJobModel.id,
+    SyncJobModel.status,
+    SyncJobModel.triggered_by,
+    SyncJobModel.user_id,
+    SyncJobModel.created_at,
+    SyncJobModel.started_at,
+    SyncJobModel.finished_at,
+    SyncJobModel.error_message,
+    SyncJobModel.retry_count,
+    SyncJobModel.next_retry_at,
+)
+
+# asyncpg sends at most this many bind parameters with one statement
+MAX_BIND_PARAMS = 32767
+
+AHGORA_LEAVES_UNIQUE_CONSTRAINT = "uq_ahgora_leaves_employee_cod_dates"
+AHGORA_LEAVES_COPY_COLUMNS = [
+    "employee_id",
+    "cod",
+    "cod_name",
+    "start_date",
+    "end_date",
+    "start_time",
+    "end_time",
+    "duration",
+    "last_synced_at",
+]
+
 
 class SqlAlchemyRepo:
     def __init__(self, session: AsyncSession):
@@ -104,12 +139,73 @@ class SqlAlchemyRepo:
 
         return job.status if job else None
 
-    async def list_jobs(self) -> List[SyncJob]:
-        result = await self.session.execute(
-            select(SyncJobModel).order_by(SyncJobModel.created_at.desc())
-        )
-        db_jobs = result.scalars().all()
+    async def list_jobs(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[SyncStatus]] = None,
+        summary: bool = False,
+        until: Optional[str] = None,
+    ) -> List[SyncJob]:
+        """
+        Lists jobs newest first, paginated by the (created_at, id) keyset.
+        `cursor` is the value returned by `job_cursor` for the last job of the
+        previous page; `until` instead keeps the jobs from the newest down to
+        that job, inclusive. With `summary`, the metadata JSON is not loaded;
+        only its `tasks_generated` counter is extracted in SQL.
+        """
+        if summary:
+            query = select(
+                *JOB_SUMMARY_COLUMNS,
+                SyncJobModel.metadata_info["tasks_generated"]
+                .as_integer()
+                .label("tasks_generated"),
+            )
+        else:
+            query = select(SyncJobModel)
+
+        if statuses:
+            query = query.where(SyncJobModel.status.in_(statuses))
+        if cursor:
+            created_at, job_id = self.parse_job_cursor(cursor)
+            query = query.where(
+                tuple_(SyncJobModel.created_at, SyncJobModel.id)
+                < tuple_(created_at, job_id)
+            )
+        if until:
+            created_at, job_id = self.parse_job_cursor(until)
+            query = query.where(
+                tuple_(SyncJobModel.created_at, SyncJobModel.id)
+                >= tuple_(created_at, job_id)
+            )
+        query = query.order_by(SyncJobModel.created_at.desc(), SyncJobModel.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await self.session.execute(query)
+        if summary:
+            return [
+                SyncJob(
+                    id=row.id,
+                    status=SyncStatus(row.status),
+                    triggered_by=row.triggered_by,
+                    user_id=row.user_id,
+                    created_at=row.created_at,
+                    started_at=row.started_at,
+                    finished_at=row.finished_at,
+                    error_message=row.error_message,
+                    metadata_info=(
+                        {"tasks_generated": row.tasks_generated}
+                        if row.tasks_generated is not None
+                        else {}
+                    ),
+                    retry_count=row.retry_count,
+                    next_retry_at=row.next_retry_at,
+                )
+                for row in result
+            ]
 
+        db_jobs = result.scalars().all()
         return [
             SyncJob(
                 id=db.id,
@@ -126,6 +222,15 @@ class SqlAlchemyRepo:
             for db in db_jobs
         ]
 
+    @staticmethod
+    def job_cursor(job: SyncJob) -> str:
+        return f"{job.created_at.isoformat()}_{job.id}"
+
+    @staticmethod
+    def parse_job_cursor(cursor: str) -> tuple[datetime, UUID]:
+        created_at, _, job_id = cursor.rpartition("_")
+        return datetime.fromisoformat(created_at), UUID(job_id)
+
     async def update_job_status(
         self, job_id: UUID, status: SyncStatus, message: Optional[str] = None
     ):
@@ -194,12 +299,57 @@ class SqlAlchemyRepo:
         self.session.add(db_log)
         await self.session.commit()
 
-    async def get_job_logs(self, job_id: UUID) -> List[SyncLog]:
-        result = await self.session.execute(
-            select(SyncLogModel)
-            .filter_by(job_id=job_id)
-            .order_by(SyncLogModel.timestamp.asc())
+    async def add_logs_batch(self, logs: List[SyncLog]) -> None:
+        """Persists several log entries with chunked multi-row INSERTs."""
+        if not logs:
+            return
+        rows = [
+            {
+                "job_id": log.job_id,
+                "task_id": log.task_id,
+                "level": log.level,
+                "message": log.message,
+                "timestamp": log.timestamp,
+            }
+            for log in logs
+        ]
+        chunk_size = min(settings.DB_BULK_CHUNK_SIZE, MAX_BIND_PARAMS // len(rows[0]))
+        for start in range(0, len(rows), chunk_size):
+            await self.session.execute(
+                insert(SyncLogModel).values(rows[start : start + chunk_size])
+            )
+        await self.session.commit()
+
+    @staticmethod
+    def _log_query(query, since_id=None, limit=None, levels=None):
+        """
+        Applies the incremental filters of the log readers.
+        Cursor reads (since_id/limit) are ordered by id, so consecutive pages
+        never skip or repeat rows.
+        """
+        if levels:
+            query = query.where(SyncLogModel.level.in_([lv.upper() for lv in levels]))
+        if since_id is None and limit is None:
+            return query.order_by(SyncLogModel.timestamp.asc(), SyncLogModel.id.asc())
+
+        if since_id is not None:
+            query = query.where(SyncLogModel.id > since_id)
+        query = query.order_by(SyncLogModel.id.asc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    async def get_job_logs(
+        self,
+        job_id: UUID,
+        since_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        levels: Optional[List[str]] = None,
+    ) -> List[SyncLog]:
+        query = self._log_query(
+            select(SyncLogModel).filter_by(job_id=job_id), since_id, limit, levels
         )
+        result = await self.session.execute(query)
         db_logs = result.scalars().all()
         return [
             SyncLog(
@@ -213,12 +363,17 @@ class SqlAlchemyRepo:
             for db in db_logs
         ]
 
-    async def get_task_logs(self, task_id: UUID) -> List[SyncLog]:
-        result = await self.session.execute(
-            select(SyncLogModel)
-            .filter_by(task_id=task_id)
-            .order_by(SyncLogModel.timestamp.asc())
+    async def get_task_logs(
+        self,
+        task_id: UUID,
+        since_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        levels: Optional[List[str]] = None,
+    ) -> List[SyncLog]:
+        query = self._log_query(
+            select(SyncLogModel).filter_by(task_id=task_id), since_id, limit, levels
         )
+        result = await self.session.execute(query)
         db_logs = result.scalars().all()
         return [
             SyncLog(
@@ -315,67 +470,43 @@ class SqlAlchemyRepo:
         - Else If there are MORE CANCELLED tasks than SUCCESS -> Job is CANCELLED
         - Else (All SUCCESS) -> Job is SUCCESS
         """
-        db_job = await self.session.get(SyncJobModel, job_id)
-        if not db_job:
-            return
-
         result = await self.session.execute(
-            select(AutomationTaskModel).filter_by(job_id=job_id)
+            select(AutomationTaskModel.status, func.count())
+            .where(AutomationTaskModel.job_id == job_id)
+            .group_by(AutomationTaskModel.status)
         )
-        tasks = result.scalars().all()
-
-        if not tasks:
-            new_status = SyncStatus.SUCCESS
-            if new_status != db_job.status or message:
-                db_job.status = new_status
-                db_job.finished_at = datetime.now()
-                if message:
-                    db_job.error_message = message
-                await self.session.commit()
-            return
-
-        is_running = 0
-        is_pending = 0
-        is_failed = 0
-        is_cancelled = 0
-        completed = 0
-
-        for t in tasks:
-            if t.status == AutomationTaskStatus.RUNNING:
-                is_running += 1
-            elif t.status == AutomationTaskStatus.PENDING:
-                is_pending += 1
-            elif t.status == AutomationTaskStatus.FAILED:
-                is_failed += 1
-            elif t.status == AutomationTaskStatus.CANCELLED:
-                is_cancelled += 1
-            elif t.status == AutomationTaskStatus.SUCCESS:
-                completed += 1
-
-        if is_running:
-            new_status = SyncStatus.RUNNING
-        elif is_pending:
-            new_status = SyncStatus.PENDING
-        elif is_failed:
-            new_status = SyncStatus.FAILED
-        elif is_cancelled > completed:
-            new_status = SyncStatus.CANCELLED
-        else:
-            new_status = SyncStatus.SUCCESS
-
-        if new_status != db_job.status or message:
-            db_job.status = new_status
-            if new_status in [
-                SyncStatus.SUCCESS,
-                SyncStatus.FAILED,
-                SyncStatus.CANCELLED,
-            ]:
-                db_job.finished_at = datetime.now()
-
-            if message:
-                db_job.error_message = message
+        new_status = self._job_status_from_task_counts(dict(result.all()))
+
+        values = {"status": new_status}
+        if new_status in [
+            SyncStatus.SUCCESS,
+            SyncStatus.FAILED,
+            SyncStatus.CANCELLED,
+        ]:
+            values["finished_at"] = datetime.now()
+        if message:
+            values["error_message"] = message
+
+        # Only touch the row when the status actually changes (or a message is set)
+        stmt = update(SyncJobModel).where(SyncJobModel.id == job_id)
+        if not message:
+            stmt = stmt.where(SyncJobModel.status != new_status)
+        await self.session.execute(stmt.values(**values))
+        await self.session.commit()
 
-            await self.session.commit()
+    @staticmethod
+    def _job_status_from_task_counts(counts: Dict[str, int]) -> SyncStatus:
+        if counts.get(AutomationTaskStatus.RUNNING):
+            return SyncStatus.RUNNING
+        if counts.get(AutomationTaskStatus.PENDING):
+            return SyncStatus.PENDING
+        if counts.get(AutomationTaskStatus.FAILED):
+            return SyncStatus.FAILED
+        if counts.get(AutomationTaskStatus.CANCELLED, 0) > counts.get(
+            AutomationTaskStatus.SUCCESS, 0
+        ):
+            return SyncStatus.CANCELLED
+        return SyncStatus.SUCCESS
 
     async def save_automation_tasks_batch(self, tasks: List[AutomationTask]) -> None:
         db_tasks = [
@@ -419,6 +550,43 @@ class SqlAlchemyRepo:
             for db in db_tasks
         ]
 
+    async def count_unfinished_tasks(self, job_id: UUID) -> int:
+        """Tasks of a job that did not succeed (pending, running, failed, cancelled)."""
+        result = await self.session.execute(
+            select(func.count())
+            .select_from(AutomationTaskModel)
+            .where(
+                AutomationTaskModel.job_id == job_id,
+                AutomationTaskModel.status != AutomationTaskStatus.SUCCESS,
+            )
+        )
+        return result.scalar_one()
+
+    async def get_task_group_counts(self, job_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Per task type counters of a job ({"type", "total", <status>: count}),
+        aggregated in SQL so payloads are never loaded.
+        """
+        result = await self.session.execute(
+            select(AutomationTaskModel.type, AutomationTaskModel.status, func.count())
+            .where(AutomationTaskModel.job_id == job_id)
+            .group_by(AutomationTaskModel.type, AutomationTaskModel.status)
+        )
+
+        groups: Dict[str, Dict[str, Any]] = {}
+        for task_type, task_status, count in result.all():
+            group = groups.setdefault(
+                task_type,
+                {"type": AutomationTaskType(task_type), "total": 0}
+                | {s.value: 0 for s in AutomationTaskStatus},
+            )
+            group["total"] += count
+            if task_status in group:
+                group[task_status] += count
+
+        order = list(AutomationTaskType)
+        return sorted(groups.values(), key=lambda g: order.index(g["type"]))
+
     async def get_all_automation_tasks(
         self, status: Optional[AutomationTaskStatus] = None
     ) -> List[AutomationTask]:
@@ -515,43 +683,82 @@ class SqlAlchemyRepo:
 
         await self.session.commit()
 
+    async def count_active_ahgora_employees(self) -> int:
+        result = await self.session.execute(
+            select(func.count())
+            .select_from(AhgoraEmployeeModel)
+            .where(AhgoraEmployeeModel.dismissal_date.is_(None))
+        )
+        return result.scalar_one()
+
+    async def count_ahgora_leaves(self) -> int:
+        result = await self.session.execute(
+            select(func.count()).select_from(AhgoraLeaveModel)
+        )
+        return result.scalar_one()
+
+    async def get_ahgora_state_version(self) -> str:
+        """
+        Cheap token that changes whenever the cached Ahgora employees or leaves
+        are written: row counts plus the latest sync time / leave id.
+        """
+        employees = select(
+            func.count(), func.max(AhgoraEmployeeModel.last_synced_at)
+        ).select_from(AhgoraEmployeeModel)
+        leaves = select(func.count(), func.max(AhgoraLeaveModel.id)).select_from(
+            AhgoraLeaveModel
+        )
+        emp_count, emp_synced = (await self.session.execute(employees)).one()
+        leave_count, leave_max_id = (await self.session.execute(leaves)).one()
+        synced = emp_synced.isoformat() if emp_synced else ""
+        return (
+            f"employees:{emp_count}:{synced}|leaves:{leave_count}:{leave_max_id or 0}"
+        )
+
     async def get_ahgora_employees_df(self) -> pd.DataFrame:
         """Returns the cached Ahgora employees as a DataFrame"""
-        result = await self.session.execute(select(AhgoraEmployeeModel))
-        employees = result.scalars().all()
-        data = [
-            {
-                "id": emp.id,
-                "name": emp.name,
-                "position": emp.position,
-                "scale": emp.scale,
-                "department": emp.department,
-                "location": emp.location,
-                "admission_date": emp.admission_date,
-                "dismissal_date": emp.dismissal_date,
-            }
-            for emp in employees
-        ]
-        return pd.DataFrame(data)
+        return await self._select_to_df(
+            select(
+                AhgoraEmployeeModel.id,
+                AhgoraEmployeeModel.name,
+                AhgoraEmployeeModel.position,
+                AhgoraEmployeeModel.scale,
+                AhgoraEmployeeModel.department,
+                AhgoraEmployeeModel.location,
+                AhgoraEmployeeModel.admission_date,
+                AhgoraEmployeeModel.dismissal_date,
+            )
+        )
 
     async def get_ahgora_leaves_df(self) -> pd.DataFrame:
         """Returns the cached Ahgora leaves as a DataFrame"""
-        result = await self.session.execute(select(AhgoraLeaveModel))
-        leaves = result.scalars().all()
-        data = [
-            {
-                "id": leave.employee_id,
-                "cod": leave.cod,
-                "cod_name": leave.cod_name,
-                "start_date": leave.start_date,
-                "end_date": leave.end_date,
-                "start_time": leave.start_time,
-                "end_time": leave.end_time,
-                "duration": leave.duration,
-            }
-            for leave in leaves
-        ]
-        return pd.DataFrame(data)
+        return await self._select_to_df(
+            select(
+                AhgoraLeaveModel.employee_id.label("id"),
+                AhgoraLeaveModel.cod,
+                AhgoraLeaveModel.cod_name,
+                AhgoraLeaveModel.start_date,
+                AhgoraLeaveModel.end_date,
+                AhgoraLeaveModel.start_time,
+                AhgoraLeaveModel.end_time,
+                AhgoraLeaveModel.duration,
+            )
+        )
+
+    async def _select_to_df(self, stmt, chunk_size: int = 10_000) -> pd.DataFrame:
+        """
+        Streams a Core select straight into per-column lists, skipping ORM
+        hydration and intermediate row dicts.
+        """
+        result = await self.session.stream(
+            stmt.execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        columns = list(result.keys())
+        data = {col: [] for col in columns}
+        async for partition in result.partitions(chunk_size):
+            for col, values in zip(columns, zip(*partition)):
+                data[col].extend(values)
+        return pd.DataFrame(data, columns=columns)
 
     @staticmethod
     def _parse_date(value) -> datetime | None:
@@ -568,30 +775,61 @@ class SqlAlchemyRepo:
                     continue
         return None
 
-    async def save_ahgora_employees_batch(self, employees: List[dict]) -> None:
-        """Performs a merge (upsert) for a batch of Ahgora employees"""
+    async def save_ahgora_employees_batch(
+        self, employees: List[dict], chunk_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Upserts a batch of Ahgora employees with chunked
+        INSERT ... ON CONFLICT (id) DO UPDATE statements.
+        Returns how many rows were inserted and how many were updated.
+        """
+        chunk_size = chunk_size or settings.DB_BULK_CHUNK_SIZE
+        now = datetime.now()
+
+        # Last occurrence wins, like consecutive merges of the same id did
+        rows = {}
         for emp_dict in employees:
-            db_emp = AhgoraEmployeeModel(
-                id=emp_dict.get("id"),
-                name=emp_dict.get("name"),
-                position=emp_dict.get("position"),
-                scale=emp_dict.get("scale"),
-                department=emp_dict.get("department"),
-                location=emp_dict.get("location"),
-                admission_date=self._parse_date(emp_dict.get("admission_date")),
-                dismissal_date=self._parse_date(emp_dict.get("dismissal_date")),
-                last_synced_at=datetime.now(),
+            rows[emp_dict.get("id")] = {
+                "id": emp_dict.get("id"),
+                "name": emp_dict.get("name"),
+                "position": emp_dict.get("position"),
+                "scale": emp_dict.get("scale"),
+                "department": emp_dict.get("department"),
+                "location": emp_dict.get("location"),
+                "admission_date": self._parse_date(emp_dict.get("admission_date")),
+                "dismissal_date": self._parse_date(emp_dict.get("dismissal_date")),
+                "last_synced_at": now,
+            }
+        values = list(rows.values())
+        if values:
+            chunk_size = min(chunk_size, MAX_BIND_PARAMS // len(values[0]))
+
+        counts = {"inserted": 0, "updated": 0}
+        for start in range(0, len(values), chunk_size):
+            stmt = pg_insert(AhgoraEmployeeModel).values(
+                values[start : start + chunk_size]
             )
-            await self.session.merge(db_emp)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AhgoraEmployeeModel.id],
+                set_={col: stmt.excluded[col] for col in values[0] if col != "id"},
+            ).returning(literal_column("xmax = 0").label("inserted"))
+
+            result = await self.session.execute(stmt)
+            for inserted in result.scalars():
+                counts["inserted" if inserted else "updated"] += 1
+
         await self.session.commit()
+        logger.info(
+            f"Upserted {len(values)} Ahgora employees "
+            f"({counts['inserted']} inserted, {counts['updated']} updated)"
+        )
+        return counts
 
     async def cleanup_stuck_executions(self) -> None:
         """
         Marks any RUNNING jobs or tasks as FAILED since the server is starting up.
         This handles cases where the system crashed or process was killed abruptly.
         """
-        from sqlalchemy import update
-
         # 1. Update jobs
         await self.session.execute(
             update(SyncJobModel)
@@ -615,21 +853,67 @@ class SqlAlchemyRepo:
         )
         await self.session.commit()
 
-    async def save_ahgora_leaves_batch(self, leaves: List[dict]) -> None:
-        """Saves a batch of Ahgora leaves to the DB cache"""
-        for leave_dict in leaves:
-            db_leave = AhgoraLeaveModel(
-                employee_id=leave_dict.get(
-                    "id"
-                ),  # DataFrame uses 'id' for the employee id
-                cod=leave_dict.get("cod"),
-                cod_name=leave_dict.get("cod_name"),
-                start_date=self._parse_date(leave_dict.get("start_date")),
-                end_date=self._parse_date(leave_dict.get("end_date")),
-                start_time=leave_dict.get("start_time"),
-                end_time=leave_dict.get("end_time"),
-                duration=leave_dict.get("duration"),
-                last_synced_at=datetime.now(),
+    async def save_ahgora_leaves_batch(self, leaves: List[dict]) -> int:
+        """
+        Saves a batch of Ahgora leaves to the DB cache, skipping leaves that are
+        already stored (same employee, code and dates).
+        On asyncpg the rows are streamed with COPY into a staging table; other
+        drivers fall back to an executemany INSERT. Returns the number of new rows.
+        """
+        now = datetime.now()
+        records = [
+            (
+                leave_dict.get("id"),  # DataFrame uses 'id' for the employee id
+                leave_dict.get("cod"),
+                leave_dict.get("cod_name"),
+                self._parse_date(leave_dict.get("start_date")),
+                self._parse_date(leave_dict.get("end_date")),
+                leave_dict.get("start_time"),
+                leave_dict.get("end_time"),
+                leave_dict.get("duration"),
+                now,
+            )
+            for leave_dict in leaves
+        ]
+        if not records:
+            return 0
+
+        conn = await self.session.connection()
+        if conn.dialect.driver == "asyncpg":
+            inserted = await self._copy_ahgora_leaves(conn, records)
+        else:
+            stmt = insert(AhgoraLeaveModel)
+            if conn.dialect.name == "postgresql":
+                stmt = pg_insert(AhgoraLeaveModel).on_conflict_do_nothing(
+                    constraint=AHGORA_LEAVES_UNIQUE_CONSTRAINT
+                )
+            result = await self.session.execute(
+                stmt, [dict(zip(AHGORA_LEAVES_COPY_COLUMNS, r)) for r in records]
             )
-            self.session.add(db_leave)
+            inserted = result.rowcount
+
         await self.session.commit()
+        logger.info(f"Saved {inserted} of {len(records)} Ahgora leaves")
+        return inserted
+
+    @staticmethod
+    async def _copy_ahgora_leaves(conn, records: List[tuple]) -> int:
+        raw_conn = (await conn.get_raw_connection()).driver_connection
+        columns = ", ".join(AHGORA_LEAVES_COPY_COLUMNS)
+
+        await raw_conn.execute(
+            f"CREATE TEMP TABLE ahgora_leaves_stage ON COMMIT DROP AS "
+            f"SELECT {columns} FROM ahgora_leaves WITH NO DATA"
+        )
+        await raw_conn.copy_records_to_table(
+            "ahgora_leaves_stage",
+            records=records,
+            columns=AHGORA_LEAVES_COPY_COLUMNS,
+        )
+        status = await raw_conn.execute(
+            f"INSERT INTO ahgora_leaves ({columns}) "
+            f"SELECT {columns} FROM ahgora_leaves_stage "
+            f"ON CONFLICT ON CONSTRAINT {AHGORA_LEAVES_UNIQUE_CONSTRAINT} DO NOTHING"
+        )
+        # Status is "INSERT 0 <rows>"
+        return int(status.split()[-1])
@@ -1,14 +1,18 @@
+import asyncio
+import hashlib
+import json
 from datetime import timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Optional
 from uuid import UUID
 
 import dotenv
-from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import async_session_factory, get_db
+from app.core.log_sink import log_sink
 from app.core.security import (
     create_access_token,
     decode_access_token,
@@ -16,14 +20,29 @@ from app.core.security import (
     verify_password,
 )
 from app.core.settings import settings
-from app.domain.enums import SyncStatus
+from app.domain.enums import AutomationTaskStatus, SyncStatus
 from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
 from app.services.credential_crypto import decrypt_password, encrypt_password
+from app.services.dashboard_stats_service import DashboardStatsService
 from app.services.sync_service import SyncService
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/infrastructure/web/templates")
 
+# Fallback check interval for log lines written by other processes
+LOG_STREAM_POLL_SECONDS = 5
+# Statuses after which a job or task writes no more log lines. Pending and
+# retrying jobs/tasks keep their stream open.
+FINISHED_STATUSES = {
+    SyncStatus.SUCCESS,
+    SyncStatus.FAILED,
+    SyncStatus.CANCELLED,
+    AutomationTaskStatus.SUCCESS,
+    AutomationTaskStatus.FAILED,
+    AutomationTaskStatus.CANCELLED,
+}
+JOBS_PAGE_SIZE = 20
+
 
 def require_auth(request: Request):
     token = request.cookies.get("access_token")
@@ -185,28 +204,7 @@ async def change_password_post(
 
 @router.get("/", dependencies=[Depends(require_auth)])
 async def dashboard(request: Request, service: SyncService = Depends(get_service)):
-    jobs = await service.list_jobs()
-    jobs[0] if jobs else None
-
-    employees_df = await service.repo.get_ahgora_employees_df()
-    leaves_df = await service.repo.get_ahgora_leaves_df()
-
-    active_employees = 0
-    if not employees_df.empty:
-        active_employees = int(employees_df["dismissal_date"].isna().sum())
-
-    total_leaves = len(leaves_df)
-
-    last_success = next((j for j in jobs if j.status == SyncStatus.SUCCESS), None)
-    last_sync_date = "Nenhuma"
-    if last_success and last_success.finished_at:
-        last_sync_date = last_success.finished_at.strftime("%d/%m/%Y %H:%M")
-
-    stats = {
-        "active_employees": active_employees,
-        "total_leaves": total_leaves,
-        "last_sync_date": last_sync_date,
-    }
+    stats = await DashboardStatsService(service.repo).get_stats()
 
     return templates.TemplateResponse(
         "dashboard.html",
@@ -358,11 +356,36 @@ async def toggle_location_updates(request: Request):
 
 @router.get("/partials/jobs", dependencies=[Depends(require_auth)])
 async def get_jobs_partial(
-    request: Request, service: SyncService = Depends(get_service)
+    request: Request,
+    cursor: Optional[str] = None,
+    until: Optional[str] = None,
+    service: SyncService = Depends(get_service),
 ):
-    jobs = await service.list_jobs()
+    """
+    Renders a page of the jobs table. The dashboard polls the first page into
+    #jobs-list and appends older pages (`cursor`) to #jobs-older. Once older
+    pages are shown, the poll sends `until` (the cursor they start after) and
+    gets every job down to it, without a "load more" row of its own.
+    """
+    if until:
+        jobs = await service.list_jobs(until=until, summary=True)
+        next_cursor = None
+    else:
+        jobs = await service.list_jobs(
+            limit=JOBS_PAGE_SIZE, cursor=cursor, summary=True
+        )
+        next_cursor = (
+            SqlAlchemyRepo.job_cursor(jobs[-1]) if len(jobs) == JOBS_PAGE_SIZE else None
+        )
     return templates.TemplateResponse(
-        "jobs_partial.html", {"request": request, "jobs": jobs}
+        "jobs_partial.html",
+        {
+            "request": request,
+            "jobs": jobs,
+            "cursor": cursor,
+            "until": until,
+            "next_cursor": next_cursor,
+        },
     )
 
 
@@ -370,46 +393,13 @@ async def get_jobs_partial(
 async def get_task_groups_page(
     request: Request, job_id: UUID, service: SyncService = Depends(get_service)
 ):
-    from collections import defaultdict
-
-    from app.domain.enums import AutomationTaskStatus
-
-    tasks = await service.get_automation_tasks(job_id)
-
-    def _default_group() -> Dict[str, Any]:
-        return {
-            "type": "",
-            "total": 0,
-            "pending": 0,
-            "running": 0,
-            "success": 0,
-            "failed": 0,
-            "cancelled": 0,
-        }
-
-    groups: Dict[Any, Dict[str, Any]] = defaultdict(_default_group)
-
-    for t in tasks:
-        group = groups[t.type]
-        group["type"] = t.type
-        group["total"] += 1
-
-        if t.status == AutomationTaskStatus.PENDING:
-            group["pending"] += 1
-        elif t.status == AutomationTaskStatus.RUNNING:
-            group["running"] += 1
-        elif t.status == AutomationTaskStatus.SUCCESS:
-            group["success"] += 1
-        elif t.status == AutomationTaskStatus.FAILED:
-            group["failed"] += 1
-        elif t.status == AutomationTaskStatus.CANCELLED:
-            group["cancelled"] += 1
+    task_groups = await service.get_task_group_counts(job_id)
 
     return templates.TemplateResponse(
         "task_groups_page.html",
         {
             "request": request,
-            "task_groups": list(groups.values()),
+            "task_groups": task_groups,
             "job_id": str(job_id),
             "headless_mode_tasks": settings.HEADLESS_MODE_TASKS,
             "is_docker": settings.IS_DOCKER,
@@ -419,49 +409,24 @@ async def get_task_groups_page(
 
 @router.get("/jobs/{job_id}/tasks/summary", dependencies=[Depends(require_auth)])
 async def get_task_groups_summary(
-    job_id: UUID, service: SyncService = Depends(get_service)
+    request: Request, job_id: UUID, service: SyncService = Depends(get_service)
 ):
-    from collections import defaultdict
-
-    from app.domain.enums import AutomationTaskStatus
+    groups = [
+        group | {"type": group["type"].name}
+        for group in await service.get_task_group_counts(job_id)
+    ]
 
-    tasks = await service.get_automation_tasks(job_id)
+    # Polls that see the same counters get an empty 304 instead of the JSON
+    etag = 'W/"{}"'.format(
+        hashlib.sha1(
+            json.dumps(groups, sort_keys=True).encode(), usedforsecurity=False
+        ).hexdigest()
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    def _default_group() -> Dict[str, Any]:
-        return {
-            "type": "",
-            "total": 0,
-            "pending": 0,
-            "running": 0,
-            "success": 0,
-            "failed": 0,
-            "cancelled": 0,
-        }
-
-    groups: Dict[Any, Dict[str, Any]] = defaultdict(_default_group)
-
-    for t in tasks:
-        group = groups[t.type]
-        group["type"] = str(t.type) if t.type else ""  # ensures JSON serialization
-        if hasattr(t.type, "name"):
-            group["type"] = t.type.name
-        elif hasattr(t.type, "value"):
-            group["type"] = t.type.value
-
-        group["total"] += 1
-
-        if t.status == AutomationTaskStatus.PENDING:
-            group["pending"] += 1
-        elif t.status == AutomationTaskStatus.RUNNING:
-            group["running"] += 1
-        elif t.status == AutomationTaskStatus.SUCCESS:
-            group["success"] += 1
-        elif t.status == AutomationTaskStatus.FAILED:
-            group["failed"] += 1
-        elif t.status == AutomationTaskStatus.CANCELLED:
-            group["cancelled"] += 1
-
-    return {"groups": list(groups.values())}
+    return JSONResponse({"groups": groups}, headers=headers)
 
 
 @router.get("/partials/task-details-inline", dependencies=[Depends(require_auth)])
@@ -511,6 +476,20 @@ async def get_task_details_partial(
             )
 
 
+def filter_logs_by_task_type(logs, tasks, task_type: str):
+    valid_task_ids = {
+        str(t.id)
+        for t in tasks
+        if str(t.type).upper() == task_type.upper()
+        or getattr(t.type, "name", str(t.type)).upper() == task_type.upper()
+    }
+    return [
+        log
+        for log in logs
+        if (log.task_id and str(log.task_id) in valid_task_ids) or not log.task_id
+    ]
+
+
 def group_logs_chronologically(logs):
     grouped: list[dict[str, Any]] = []
     current_group: dict[str, Any] | None = None
@@ -546,6 +525,7 @@ async def get_task_log_partial(
             "task": task,
             "logs": logs,
             "grouped_logs": group_logs_chronologically(logs),
+            "last_log_id": max((log.id for log in logs), default=0),
             "task_id": str(task_id),
             "job_status": task.status if task else None,
         },
@@ -560,19 +540,10 @@ async def get_logs_partial(
     service: SyncService = Depends(get_service),
 ):
     logs = await service.get_job_logs(job_id)
+    last_log_id = max((log.id for log in logs), default=0)
     if task_type:
         tasks = await service.get_automation_tasks(job_id)
-        valid_task_ids = {
-            str(t.id)
-            for t in tasks
-            if str(t.type).upper() == task_type.upper()
-            or getattr(t.type, "name", str(t.type)).upper() == task_type.upper()
-        }
-        logs = [
-            log
-            for log in logs
-            if (log.task_id and str(log.task_id) in valid_task_ids) or not log.task_id
-        ]
+        logs = filter_logs_by_task_type(logs, tasks, task_type)
 
     job_status = await service.get_job_status(job_id)
     return templates.TemplateResponse(
@@ -581,6 +552,7 @@ async def get_logs_partial(
             "request": request,
             "logs": logs,
             "grouped_logs": group_logs_chronologically(logs),
+            "last_log_id": last_log_id,
             "job_id": str(job_id),
             "job_status": job_status,
             "task_type": task_type,
@@ -594,41 +566,46 @@ async def get_log_entries_partial(
     job_id: Optional[UUID] = None,
     task_id: Optional[UUID] = None,
     task_type: Optional[str] = None,
+    since_id: Optional[int] = None,
     service: SyncService = Depends(get_service),
 ):
+    """
+    Renders the log viewer. With `since_id`, only the groups of newer lines are
+    rendered so the page can append them; the new cursor is sent in X-Last-Log-Id
+    and the job/task status in X-Log-Status.
+    """
     if task_id:
-        logs = await service.repo.get_task_logs(task_id)
+        logs = await service.repo.get_task_logs(task_id, since_id=since_id)
+        if since_id is not None:
+            task = await service.repo.get_task(task_id)
+            status = task.status if task else None
+            return _log_delta_response(request, logs, logs, since_id, status)
         return templates.TemplateResponse(
             "log_entries_partial.html",
             {
                 "request": request,
                 "grouped_logs": group_logs_chronologically(logs),
+                "last_log_id": max((log.id for log in logs), default=0),
                 "task_id": str(task_id),
             },
         )
     if job_id:
-        logs = await service.get_job_logs(job_id)
-        job_status = await service.get_job_status(job_id)
-        if task_type:
+        all_logs = await service.get_job_logs(job_id, since_id=since_id)
+        logs = all_logs
+        if task_type and logs:
             tasks = await service.get_automation_tasks(job_id)
-            valid_task_ids = {
-                str(t.id)
-                for t in tasks
-                if str(t.type).upper() == task_type.upper()
-                or getattr(t.type, "name", str(t.type)).upper() == task_type.upper()
-            }
-            logs = [
-                log
-                for log in logs
-                if (log.task_id and str(log.task_id) in valid_task_ids)
-                or not log.task_id
-            ]
+            logs = filter_logs_by_task_type(logs, tasks, task_type)
+        job_status = await service.get_job_status(job_id)
+        if since_id is not None:
+            return _log_delta_response(request, all_logs, logs, since_id, job_status)
 
+        last_log_id = max((log.id for log in all_logs), default=0)
         return templates.TemplateResponse(
             "log_entries_partial.html",
             {
                 "request": request,
                 "grouped_logs": group_logs_chronologically(logs),
+                "last_log_id": last_log_id,
                 "job_id": str(job_id),
                 "task_type": task_type,
                 "job_status": job_status,
@@ -640,6 +617,94 @@ async def get_log_entries_partial(
     )
 
 
+def _log_delta_response(
+    request: Request, fetched_logs, logs, since_id: int, status=None
+):
+    last_log_id = max((log.id for log in fetched_logs), default=since_id)
+    return templates.TemplateResponse(
+        "partials/log_groups.html",
+        {"request": request, "grouped_logs": group_logs_chronologically(logs)},
+        headers={
+            "X-Last-Log-Id": str(last_log_id),
+            "X-Log-Status": str(status or ""),
+        },
+    )
+
+
+@router.get("/partials/log-stream", dependencies=[Depends(require_auth)])
+async def stream_log_entries(
+    request: Request,
+    job_id: Optional[UUID] = None,
+    task_id: Optional[UUID] = None,
+    task_type: Optional[str] = None,
+    last_id: int = 0,
+):
+    """
+    Server-Sent Events stream of the log lines written after `last_id`.
+    Each `logs` event carries the rendered groups for the new rows; a `done`
+    event is sent once the job/task is no longer running.
+    """
+    if not job_id and not task_id:
+        raise HTTPException(status_code=400, detail="job_id or task_id is required")
+
+    # EventSource resends the last received id when it reconnects
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        last_id = max(last_id, int(last_event_id))
+
+    return StreamingResponse(
+        _log_event_stream(request, job_id, task_id, task_type, last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _log_event_stream(
+    request: Request,
+    job_id: Optional[UUID],
+    task_id: Optional[UUID],
+    task_type: Optional[str],
+    last_id: int,
+):
+    finished = False
+    while not await request.is_disconnected():
+        # Sessions are opened per check so an idle stream does not hold a connection
+        async with async_session_factory() as session:
+            repo = SqlAlchemyRepo(session)
+            if task_id:
+                task = await repo.get_task(task_id)
+                status = task.status if task else None
+                logs = await repo.get_task_logs(task_id, since_id=last_id)
+            else:
+                status = await repo.get_job_status(job_id)
+                logs = await repo.get_job_logs(job_id, since_id=last_id)
+
+            if logs:
+                last_id = max(log.id for log in logs)
+                if task_type and job_id:
+                    tasks = await repo.get_automation_tasks_by_job(job_id)
+                    logs = filter_logs_by_task_type(logs, tasks, task_type)
+
+        if logs:
+            html = templates.get_template("partials/log_groups.html").render(
+                grouped_logs=group_logs_chronologically(logs)
+            )
+            data = "\n".join(f"data: {line}" for line in html.splitlines())
+            yield f"id: {last_id}\nevent: logs\n{data}\n\n"
+
+        if finished:
+            yield "event: done\ndata: \n\n"
+            return
+
+        if status is None or status in FINISHED_STATUSES:
+            # Lines logged right before the status change may still be buffered
+            finished = True
+            await asyncio.sleep(settings.LOG_FLUSH_INTERVAL_MS / 1000)
+            await log_sink.flush()
+        else:
+            await log_sink.wait_for_write(timeout=LOG_STREAM_POLL_SECONDS)
+
+
 @router.get("/api/user/credentials", dependencies=[Depends(require_auth)])
 async def get_user_credentials(request: Request, db: AsyncSession = Depends(get_db)):
     """Get the credentials for the current user."""
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import traceback
 from contextlib import asynccontextmanager
@@ -7,9 +8,12 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.endpoints import router as api_router
+from app.core.log_sink import log_sink
 from app.core.scheduler import scheduler
 from app.core.settings import settings
+from app.infrastructure.automation.web.browser_pool import ahgora_browser_pool
 from app.infrastructure.web.routes import router as web_router
+from app.services.analysis_worker import analysis_pool
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +32,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error cleaning up stuck executions on startup: {e}")
 
-    # Startup: Start the retry scheduler
+    # Startup: Start the batched log writer and the retry scheduler
+    await log_sink.start()
     await scheduler.start()
     yield
-    # Shutdown: Stop the retry scheduler
+    # Shutdown: Stop the retry scheduler, close pooled browsers and analysis workers,
+    # and write any pending log lines
     await scheduler.stop()
+    await asyncio.to_thread(ahgora_browser_pool.close_all)
+    await asyncio.to_thread(analysis_pool.shutdown)
+    await log_sink.stop()
 
 
 app = FastAPI(
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.core.settings import settings
+from app.services.diff_snapshot import DiffSnapshot, diff_snapshot_store
+
+logger = logging.getLogger(__name__)
+
+# Settings the comparisons read. Workers build their own settings at startup,
+# so the parent's current values (toggled from the dashboard, edited
+# exceptions) are sent with every job.
+DIFF_SETTINGS = (
+    "UPDATE_LOCATIONS",
+    "DIFF_MODE",
+    "COLUMNS_TO_VERIFY_CHANGE",
+    "EXCEPTIONS_AND_TYPOS",
+    "IGNORE_LOCATION_CHANGE_IDS",
+)
+
+
+class AnalysisPool:
+    """
+    Runs the CPU-bound comparison jobs of the sync analysis in worker processes
+    so the event loop keeps serving the API while pandas works.
+
+    The executor is created on first use and kept for later syncs. Workers are
+    spawned rather than forked: the parent has the event loop, the DB engine and
+    browser threads running. With ANALYSIS_WORKERS=0 the jobs run in a thread of
+    the current process instead.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        if self._max_workers is not None:
+            return self._max_workers
+        return settings.ANALYSIS_WORKERS
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting analysis pool with {self.max_workers} workers")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs a module-level function (and picklable args) off the event loop."""
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(func, *args)
+
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, func, *args
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            logger.error("Analysis worker died, the pool will be recreated")
+            self._discard(executor)
+            raise
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def diff_context() -> Dict[str, Any]:
+    """What a job needs from the parent process besides the frames."""
+    return {
+        "settings": {name: getattr(settings, name) for name in DIFF_SETTINGS},
+        "snapshot_path": diff_snapshot_store.path,
+    }
+
+
+def _apply_context(context: Dict[str, Any]) -> None:
+    from app.services import sync_service
+
+    if multiprocessing.parent_process() is None:
+        return  # inline run: this process already holds the values
+    for name, value in context["settings"].items():
+        setattr(settings, name, value)
+    sync_service.COLUMNS_TO_VERIFY_CHANGE = settings.COLUMNS_TO_VERIFY_CHANGE
+    diff_snapshot_store._path = context["snapshot_path"]
+
+
+def diff_employees(
+    context: Dict[str, Any],
+    fiorilli_employees: pd.DataFrame,
+    ahgora_employees: pd.DataFrame,
+    ahgora_csv_employees: pd.DataFrame,
+) -> Tuple[
+    pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, Optional[DiffSnapshot]
+]:
+    """
+    Worker job: new, seed, dismissed and changed employees, plus the diff
+    snapshot for the parent to save once the tasks are persisted.
+    """
+    from app.services.sync_service import SyncService
+
+    _apply_context(context)
+    service = SyncService(repo=None)
+    result = service._diff_employees(
+        fiorilli_employees, ahgora_employees, ahgora_csv_employees
+    )
+    return (*result, service._diff_snapshot)
+
+
+def diff_leaves(
+    context: Dict[str, Any], last_leaves: pd.DataFrame, all_leaves: pd.DataFrame
+) -> pd.DataFrame:
+    """Worker job: leaves in the latest export that were not synced yet."""
+    from app.services.sync_service import SyncService
+
+    _apply_context(context)
+    return SyncService(repo=None)._get_new_leaves_df(last_leaves, all_leaves)
+
+
+analysis_pool = AnalysisPool()
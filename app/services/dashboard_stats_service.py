@@ -0,0 +1,53 @@
+import time
+from typing import Any, Dict, Optional
+
+from app.core.settings import settings
+from app.domain.enums import SyncStatus
+from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+
+
+class DashboardStatsService:
+    """
+    Counters shown on the dashboard, computed with COUNT/LIMIT 1 queries.
+    The result is shared by all requests for `DASHBOARD_STATS_TTL_SECONDS` and
+    dropped earlier via `invalidate()` when a sync or a task finishes.
+    """
+
+    _cache: Optional[tuple[float, Dict[str, Any]]] = None
+
+    def __init__(self, repo: SqlAlchemyRepo):
+        self.repo = repo
+
+    async def get_stats(self) -> Dict[str, Any]:
+        cached = DashboardStatsService._cache
+        if (
+            cached
+            and time.monotonic() - cached[0] < settings.DASHBOARD_STATS_TTL_SECONDS
+        ):
+            return cached[1]
+
+        stats = await self._compute_stats()
+        DashboardStatsService._cache = (time.monotonic(), stats)
+        return stats
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._cache = None
+
+    async def _compute_stats(self) -> Dict[str, Any]:
+        active_employees = await self.repo.count_active_ahgora_employees()
+        total_leaves = await self.repo.count_ahgora_leaves()
+
+        success_jobs = await self.repo.list_jobs(
+            limit=1, statuses=[SyncStatus.SUCCESS], summary=True
+        )
+        last_success = success_jobs[0] if success_jobs else None
+        last_sync_date = "Nenhuma"
+        if last_success and last_success.finished_at:
+            last_sync_date = last_success.finished_at.strftime("%d/%m/%Y %H:%M")
+
+        return {
+            "active_employees": active_employees,
+            "total_leaves": total_leaves,
+            "last_sync_date": last_sync_date,
+        }
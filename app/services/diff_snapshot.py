@@ -0,0 +1,68 @@
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DiffSnapshot:
+    """
+    Row hashes of the employees the last completed analysis found unchanged.
+    Only valid for the comparison config (`config`) it was computed with.
+    """
+
+    config: str
+    unchanged: np.ndarray
+
+
+class DiffSnapshotStore:
+    """Keeps the latest DiffSnapshot in a pickle under DATA_DIR/.cache."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        return self._path or settings.DATA_DIR / ".cache" / "employee_diff.pkl"
+
+    def load(self, config: str) -> Optional[DiffSnapshot]:
+        if not self.path.exists():
+            return None
+        try:
+            snapshot = pd.read_pickle(self.path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable diff snapshot {self.path}: {e}")
+            return None
+        if snapshot.config != config:
+            logger.info(
+                "Diff config changed since the last snapshot, comparing all rows"
+            )
+            return None
+        return snapshot
+
+    def save(self, snapshot: DiffSnapshot) -> None:
+        tmp = self.path.with_name(f".{uuid4().hex}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            pd.to_pickle(snapshot, tmp)
+            os.replace(tmp, self.path)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(f"Could not save diff snapshot: {e}")
+            tmp.unlink(missing_ok=True)
+
+    @staticmethod
+    def row_hashes(df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+        return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+diff_snapshot_store = DiffSnapshotStore()
@@ -8,11 +8,13 @@ from uuid import UUID
 
 import pandas as pd
 
+from app.core.log_sink import log_sink
 from app.core.settings import settings
 from app.core.task_registry import task_registry
 from app.domain.enums import AutomationTaskStatus
 from app.infrastructure.automation.web.ahgora_browser import AhgoraBrowser
 from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+from app.services.dashboard_stats_service import DashboardStatsService
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +68,7 @@ class LeaveSyncService:
             return
 
         await self.repo.update_task_status(batch_task.id, AutomationTaskStatus.RUNNING)
-        await self.repo.add_log(
+        log_sink.emit(
             job_id,
             "INFO",
             f"Starting integration of {len(batch_payloads)} leaves.",
@@ -79,15 +81,11 @@ class LeaveSyncService:
             task_registry.register_cancel_event(job_id, cancel_event)
 
         # 2. Run browser automation in thread
-        loop = asyncio.get_running_loop()
-        log_lock = asyncio.Lock()
         try:
             results = await asyncio.to_thread(
                 self._run_browser_batch_import,
                 batch_payloads,
                 job_id,
-                loop,
-                log_lock,
                 cancel_event,
                 ahgora_user=ahgora_user,
                 ahgora_password=ahgora_password,
@@ -117,7 +115,7 @@ class LeaveSyncService:
                     else:
                         imported_count += 1
                         successful_payloads.append(result["payload"])
-                        await self.repo.add_log(
+                        log_sink.emit(
                             job_id,
                             "INFO",
                             f"Leave imported: {name} - {cod_name} - {start} / {end}.",
@@ -126,7 +124,7 @@ class LeaveSyncService:
                 else:
                     error_count += 1
                     err_msg = result["message"]
-                    await self.repo.add_log(
+                    log_sink.emit(
                         job_id,
                         "ERROR",
                         f"Failed to import {name}: {err_msg}.",
@@ -134,14 +132,14 @@ class LeaveSyncService:
                     )
 
             final_msg = f"Batch completed: {imported_count} imported, {ignored_count} existing ignored, {error_count} errors."
-            await self.repo.add_log(job_id, "INFO", final_msg, task_id=batch_task.id)
+            log_sink.emit(job_id, "INFO", final_msg, task_id=batch_task.id)
 
             batch_task.payload["leaves"] = successful_payloads
 
             # Save successfully imported leaves to DB state
             if successful_payloads:
                 await self.repo.save_ahgora_leaves_batch(successful_payloads)
-                await self.repo.add_log(
+                log_sink.emit(
                     job_id,
                     "INFO",
                     f"Saved {len(successful_payloads)} leaves to DB state.",
@@ -168,21 +166,21 @@ class LeaveSyncService:
             await self.repo.update_task_status(
                 batch_task.id, AutomationTaskStatus.FAILED, message=str(e)
             )
-            await self.repo.add_log(
+            log_sink.emit(
                 job_id,
                 "ERROR",
                 f"Critical batch failure: {str(e)}.",
                 task_id=batch_task.id,
             )
 
+        await log_sink.flush()
         await self.repo.evaluate_and_update_job_status(job_id)
+        DashboardStatsService.invalidate()
 
     def _run_browser_batch_import(
         self,
         batch_payloads: list[dict],
         job_id: UUID,
-        loop: asyncio.AbstractEventLoop,
-        log_lock: asyncio.Lock,
         cancel_event: Optional[threading.Event] = None,
         ahgora_user: Optional[str] = None,
         ahgora_password: Optional[str] = None,
@@ -193,12 +191,8 @@ class LeaveSyncService:
         Sync execution of the browser automation for leaves batch.
         """
 
-        async def safe_log(level: str, msg: str):
-            async with log_lock:
-                await self.repo.add_log(job_id, level, msg)
-
         def log_cb(level: str, msg: str):
-            asyncio.run_coroutine_threadsafe(safe_log(level, msg), loop)
+            log_sink.emit(job_id, level, msg)
 
         df = pd.DataFrame(batch_payloads)
         results = []
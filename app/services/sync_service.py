@@ -1,6 +1,9 @@
+import ast
 import asyncio
+import functools
 import logging
 import re
+import time
 import unicodedata
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -11,6 +14,10 @@ import numpy as np
 import pandas as pd
 
 from app.core.file_manager import FileManager
+from app.core.fingerprints import files_fingerprints
+from app.core.frame_cache import config_version, parsed_export_cache
+from app.core.log_sink import log_sink
+from app.core.mappings import mapping_registry
 from app.core.settings import settings
 from app.core.task_registry import task_registry
 from app.domain.entities import (
@@ -22,9 +29,21 @@ from app.domain.entities import (
     SyncResult,
 )
 from app.domain.enums import SyncStatus
+from app.infrastructure.automation.http.export_client import (
+    HttpExporter,
+    lift_session,
+)
 from app.infrastructure.automation.web.ahgora_browser import AhgoraBrowser
 from app.infrastructure.automation.web.fiorilli_browser import FiorilliBrowser
 from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+from app.services.analysis_worker import (
+    analysis_pool,
+    diff_context,
+    diff_employees,
+    diff_leaves,
+)
+from app.services.dashboard_stats_service import DashboardStatsService
+from app.services.diff_snapshot import DiffSnapshot, diff_snapshot_store
 
 FIORILLI_EMPLOYEES_COLUMNS = settings.FIORILLI_EMPLOYEES_COLUMNS
 AHGORA_EMPLOYEES_COLUMNS = settings.AHGORA_EMPLOYEES_COLUMNS
@@ -37,15 +56,45 @@ SYNC_TIMEOUT_MAX = settings.SYNC_TIMEOUT_MAX
 
 DATA_DIR = settings.DATA_DIR
 
+# Exports whose prepared DataFrames are cached on disk by content hash.
+# Bump PARSER_VERSION whenever _parse_csv/_prepare_dataframe change their output.
+CACHED_EXPORTS = {
+    "fiorilli_employees.txt",
+    "ahgora_employees.csv",
+    "leaves.csv",
+    "raw_vacations.txt",
+    "raw_leaves.txt",
+}
+PARSER_VERSION = 1
+# Bump whenever _get_changed_rows changes which rows it flags
+DIFF_VERSION = 1
+PARSED_EXPORTS_VERSION = config_version(
+    PARSER_VERSION,
+    FIORILLI_EMPLOYEES_COLUMNS,
+    AHGORA_EMPLOYEES_COLUMNS,
+    LEAVES_COLUMNS,
+    UPLOAD_LEAVES_COLUMNS,
+    PT_MONTHS,
+)
+
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=65536)
+def _fold_text(text: str) -> str:
+    """Collapses whitespace and strips accents. Cached across sync runs."""
+    text = " ".join(re.split(r"\s+", text, flags=re.UNICODE))
+    return unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII")
+
+
 class SyncService:
     MAX_JOB_RETRIES = 3
 
     def __init__(self, repo: SqlAlchemyRepo):
         self.repo = repo
         self._db_lock = asyncio.Lock()
+        # Set by the incremental diff, persisted once the analysis completes
+        self._diff_snapshot: Optional[DiffSnapshot] = None
 
     @staticmethod
     async def run_sync_task_standalone(
@@ -90,15 +139,39 @@ class SyncService:
     async def get_job_status(self, job_id: UUID) -> Optional[SyncStatus]:
         return await self.repo.get_job_status(job_id)
 
-    async def list_jobs(self) -> list[SyncJob]:
-        return await self.repo.list_jobs()
+    async def list_jobs(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        statuses: Optional[list[SyncStatus]] = None,
+        summary: bool = False,
+        until: Optional[str] = None,
+    ) -> list[SyncJob]:
+        return await self.repo.list_jobs(
+            limit=limit,
+            cursor=cursor,
+            statuses=statuses,
+            summary=summary,
+            until=until,
+        )
 
-    async def get_job_logs(self, job_id: UUID) -> list[SyncLog]:
-        return await self.repo.get_job_logs(job_id)
+    async def get_job_logs(
+        self,
+        job_id: UUID,
+        since_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        levels: Optional[list[str]] = None,
+    ) -> list[SyncLog]:
+        return await self.repo.get_job_logs(
+            job_id, since_id=since_id, limit=limit, levels=levels
+        )
 
     async def get_automation_tasks(self, job_id: UUID) -> list[AutomationTask]:
         return await self.repo.get_automation_tasks_by_job(job_id)
 
+    async def get_task_group_counts(self, job_id: UUID) -> list[dict]:
+        return await self.repo.get_task_group_counts(job_id)
+
     async def list_automation_tasks(
         self, status: Optional[AutomationTaskStatus] = None
     ) -> list[AutomationTask]:
@@ -196,6 +269,8 @@ class SyncService:
                 logger.error(f"Failed to handle retry for job {job_id}: {inner_e}")
         finally:
             task_registry.unregister(job_id)
+            await log_sink.flush()
+            DashboardStatsService.invalidate()
 
     async def _handle_job_retry(self, job: SyncJob, error_msg: Optional[str] = None):
         """Calculates next retry and updates job if retries are available."""
@@ -286,12 +361,12 @@ class SyncService:
                 count += 1
 
         # 2. Cleanup any other jobs marked as RUNNING in the database
-        jobs = await self.repo.list_jobs()
+        jobs = await self.repo.list_jobs(
+            statuses=[SyncStatus.RUNNING, SyncStatus.RETRYING, SyncStatus.PENDING],
+            summary=True,
+        )
         for job in jobs:
-            if (
-                job.status
-                in (SyncStatus.RUNNING, SyncStatus.RETRYING, SyncStatus.PENDING)
-            ) and job.id not in registry_job_ids:
+            if job.id not in registry_job_ids:
                 logger.info(
                     f"Cleaning up untracked RUNNING/RETRYING job {job.id} from database"
                 )
@@ -305,9 +380,8 @@ class SyncService:
         log_func = getattr(logger, level.lower(), logger.info)
         log_func(f"Job {job_id}: {message}")
 
-        # Persist to DB
-        async with self._db_lock:
-            await self.repo.add_log(job_id, level, message)
+        # Persist to DB (batched by the log sink)
+        log_sink.emit(job_id, level, message)
 
     def _is_download_cached(
         self, patterns: list[str], MAX_AGE_MINUTES: int = MAX_AGE_MINUTES
@@ -374,6 +448,7 @@ class SyncService:
             password,
             company=None,
             patterns=None,
+            exports=None,
             max_retries=3,
         ):
             if patterns and self._is_download_cached(patterns):
@@ -384,6 +459,19 @@ class SyncService:
                 )
                 return True
 
+            if exports and http_exporter.covers(exports):
+                try:
+                    for path in await http_exporter.fetch(exports):
+                        await asyncio.to_thread(FileManager.store_download, path)
+                    await self._log(job_id, "INFO", f"Fetched {description} over HTTP")
+                    return True
+                except Exception as e:
+                    await self._log(
+                        job_id,
+                        "WARNING",
+                        f"HTTP export for {description} failed, falling back to the browser: {e}",
+                    )
+
             last_error = None
             for attempt in range(1, max_retries + 1):
                 await self._log(
@@ -411,7 +499,11 @@ class SyncService:
                         browser = browser_class()
 
                     try:
-                        getattr(browser, method_name)()
+                        downloaded = getattr(browser, method_name)()
+                        if not isinstance(downloaded, list):
+                            downloaded = [downloaded]
+                        for path in downloaded:
+                            FileManager.store_download(path)
                     finally:
                         browser.close_driver()
 
@@ -438,6 +530,32 @@ class SyncService:
             )
             raise last_error
 
+        # Exports with recorded requests are fetched over HTTP after a single login
+        http_exporter = HttpExporter(
+            logins={
+                "fiorilli": functools.partial(
+                    lift_session,
+                    functools.partial(
+                        FiorilliBrowser,
+                        fiorilli_url=fiorilli_url,
+                        fiorilli_user=fiorilli_user,
+                        fiorilli_password=fiorilli_password,
+                    ),
+                ),
+                "ahgora": functools.partial(
+                    lift_session,
+                    functools.partial(
+                        AhgoraBrowser,
+                        ahgora_url=ahgora_url,
+                        ahgora_user=ahgora_user,
+                        ahgora_company=ahgora_company,
+                        ahgora_password=ahgora_password,
+                    ),
+                ),
+            },
+            recipes=None if settings.USE_HTTP_EXPORTS else {},
+        )
+
         try:
             if settings.HEADLESS_MODE:
                 await self._log(
@@ -452,6 +570,7 @@ class SyncService:
                         fiorilli_user,
                         fiorilli_password,
                         patterns=["trabalhador|fiorilli_employees"],
+                        exports=["fiorilli_employees"],
                     ),
                     run_download_task_with_retries(
                         FiorilliBrowser,
@@ -464,6 +583,7 @@ class SyncService:
                             "pontoafastamentos|raw_leaves",
                             "pontoferias|raw_vacations",
                         ],
+                        exports=["fiorilli_vacations", "fiorilli_leaves"],
                     ),
                     run_download_task_with_retries(
                         AhgoraBrowser,
@@ -474,6 +594,7 @@ class SyncService:
                         ahgora_password,
                         ahgora_company,
                         patterns=["funcionarios|ahgora_employees"],
+                        exports=["ahgora_employees"],
                     ),
                 )
             else:
@@ -486,6 +607,7 @@ class SyncService:
                     fiorilli_user,
                     fiorilli_password,
                     patterns=["trabalhador|fiorilli_employees"],
+                    exports=["fiorilli_employees"],
                 )
                 await run_download_task_with_retries(
                     FiorilliBrowser,
@@ -498,6 +620,7 @@ class SyncService:
                         "pontoafastamentos|raw_leaves",
                         "pontoferias|raw_vacations",
                     ],
+                    exports=["fiorilli_vacations", "fiorilli_leaves"],
                 )
                 await run_download_task_with_retries(
                     AhgoraBrowser,
@@ -508,13 +631,16 @@ class SyncService:
                     ahgora_password,
                     ahgora_company,
                     patterns=["funcionarios|ahgora_employees"],
+                    exports=["ahgora_employees"],
                 )
 
-            # 5. Run analysis and create tasks
+            # 5. Run analysis and create tasks (None when the inputs are unchanged)
             ahgora_csv_employees = await self._run_analysis_and_create_tasks(job_id)
+            unchanged = ahgora_csv_employees is None
 
             # 6. Validate Data
-            await self._validate_ahgora_state(job_id, ahgora_csv_employees)
+            if not unchanged:
+                await self._validate_ahgora_state(job_id, ahgora_csv_employees)
 
             # 7. Remove downloads from download dir
             await asyncio.to_thread(FileManager.cleanup)
@@ -522,7 +648,9 @@ class SyncService:
             return SyncResult(
                 success=True,
                 status=SyncStatus.SUCCESS,
-                message="Sync completed",
+                message="Sync completed (no changes)"
+                if unchanged
+                else "Sync completed",
             )
         except Exception as e:
             logger.error(f"Sync failed after retries: {e}")
@@ -531,16 +659,34 @@ class SyncService:
                 status=SyncStatus.FAILED,
                 message=f"Sync failed: {str(e)}",
             )
+        finally:
+            await http_exporter.aclose()
 
     async def _run_analysis_and_create_tasks(self, job_id: UUID):
         try:
             await self._log(job_id, "INFO", "Starting data analysis and task creation")
 
-            # 1. Process downloads (move files to expected locations)
+            # 1. Process downloads (move files to expected locations).
+            # Fresh downloads were already stored; this picks up files left in the folder.
             await self._log(
                 job_id, "INFO", "Moving downloaded files to data directory..."
             )
             await asyncio.to_thread(FileManager.move_downloads_to_data_dir)
+            mapping_registry.refresh_exceptions()
+
+            self._diff_snapshot = None
+            started = time.perf_counter()
+            inputs = await asyncio.to_thread(self._analysis_fingerprint)
+            if await self._inputs_unchanged(inputs):
+                await self._save_fingerprint(job_id, inputs, tasks_generated=0)
+                await self._log(
+                    job_id,
+                    "INFO",
+                    "No changes: exports, mappings and Ahgora state match the last "
+                    f"successful sync ({(time.perf_counter() - started) * 1000:.0f} ms). "
+                    "Analysis skipped.",
+                )
+                return None
 
             # 2. Get data
             await self._log(job_id, "INFO", "Loading employee data from files...")
@@ -564,13 +710,15 @@ class SyncService:
             await self._log(job_id, "INFO", "Loading leave data from files...")
             last_leaves, all_leaves = await self._get_leaves_data(job_id)
 
-            leave_codes_path = settings.DATA_DIR / "mappings" / "leave_codes.csv"
-            if leave_codes_path.exists():
+            leave_codes = await asyncio.to_thread(
+                mapping_registry.get,
+                settings.LEAVE_CODES_CSV_PATH,
+                functools.partial(self._read_csv, columns=["cod", "desc"]),
+            )
+            if leave_codes is not None:
                 await self._log(job_id, "INFO", "Enriching leave data with codes...")
-                leave_codes = await asyncio.to_thread(
-                    self._read_csv, leave_codes_path, columns=["cod", "desc"]
-                )
-                all_leaves = await self._get_view_leaves(
+                all_leaves = await asyncio.to_thread(
+                    self._get_view_leaves,
                     leaves_df=all_leaves,
                     fiorilli_employees=fiorilli_employees,
                     leave_codes=leave_codes,
@@ -607,6 +755,9 @@ class SyncService:
                 new_leaves_df,
             )
 
+            await self._save_fingerprint(job_id, inputs)
+            if self._diff_snapshot is not None:
+                await asyncio.to_thread(diff_snapshot_store.save, self._diff_snapshot)
             await self._log(
                 job_id, "INFO", "Data analysis and task creation completed successfully"
             )
@@ -619,6 +770,72 @@ class SyncService:
             await self._log(job_id, "ERROR", error_msg)
             raise
 
+    @staticmethod
+    def _analysis_inputs() -> Dict[str, Path]:
+        """Files the analysis reads, fingerprinted to detect unchanged runs."""
+        return {
+            "fiorilli_employees": settings.DATA_DIR / "fiorilli_employees.txt",
+            "ahgora_employees": settings.DATA_DIR / "ahgora_employees.csv",
+            "raw_leaves": settings.DATA_DIR / "raw_leaves.txt",
+            "raw_vacations": settings.DATA_DIR / "raw_vacations.txt",
+            "constants": settings.CONSTANTS_JSON_PATH,
+            "exceptions": settings.EXCEPTIONS_JSON_PATH,
+            "department_to_location": settings.DEPARTMENT_TO_LOCATION_CSV_PATH,
+            "leave_codes": settings.LEAVE_CODES_CSV_PATH,
+        }
+
+    @classmethod
+    def _analysis_fingerprint(cls) -> Dict[str, Optional[str]]:
+        """
+        Input file hashes plus the comparison config, which covers settings
+        that change what gets flagged (e.g. the location update toggle).
+        """
+        return {
+            **files_fingerprints(cls._analysis_inputs()),
+            "diff_config": cls._diff_config_version(),
+        }
+
+    async def _inputs_unchanged(self, inputs: Dict[str, Optional[str]]) -> bool:
+        if not settings.SKIP_UNCHANGED_ANALYSIS:
+            return False
+        async with self._db_lock:
+            last_success = await self.repo.list_jobs(
+                limit=1, statuses=[SyncStatus.SUCCESS]
+            )
+            if not last_success:
+                return False
+            previous = last_success[0].metadata_info.get("fingerprint")
+            if not previous or previous.get("inputs") != inputs:
+                return False
+            if previous.get("db_state") != await self.repo.get_ahgora_state_version():
+                return False
+            # Tasks belong to a job: skipping would drop the ones still to be done
+            return await self.repo.count_unfinished_tasks(last_success[0].id) == 0
+
+    async def _save_fingerprint(
+        self,
+        job_id: UUID,
+        inputs: Dict[str, Optional[str]],
+        tasks_generated: Optional[int] = None,
+    ) -> None:
+        """Stores the inputs and the post-analysis DB state on the job."""
+        async with self._db_lock:
+            job = await self.repo.get_job(job_id)
+            if not job:
+                return
+            # A new dict, so the JSON column is flagged as changed
+            metadata = {
+                **job.metadata_info,
+                "fingerprint": {
+                    "inputs": inputs,
+                    "db_state": await self.repo.get_ahgora_state_version(),
+                },
+            }
+            if tasks_generated is not None:
+                metadata["tasks_generated"] = tasks_generated
+            job.metadata_info = metadata
+            await self.repo.save_job(job)
+
     async def _get_employees_data(
         self, job_id: UUID
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -722,6 +939,20 @@ class SyncService:
         encoding: str = "utf-8",
         header: Any = "infer",
         columns: list[str] = [],
+    ) -> pd.DataFrame:
+        if path.name in CACHED_EXPORTS:
+            return parsed_export_cache.get_or_load(
+                path, self._parse_csv, PARSED_EXPORTS_VERSION
+            )
+        return self._parse_csv(path, sep, encoding, header, columns)
+
+    def _parse_csv(
+        self,
+        path: Path,
+        sep: str = ",",
+        encoding: str = "utf-8",
+        header: Any = "infer",
+        columns: list[str] = [],
     ) -> pd.DataFrame:
         df = pd.DataFrame()
         try:
@@ -779,7 +1010,7 @@ class SyncService:
 
             for col in df.columns:
                 if "date" in col:
-                    df[col] = df[col].apply(self._convert_date)
+                    df[col] = self._convert_date_series(df[col])
                     df[col] = pd.to_datetime(
                         df[col],
                         dayfirst=True,
@@ -825,19 +1056,61 @@ class SyncService:
 
         return pd.to_datetime(date_str, format="ISO8601", errors="coerce")
 
+    def _convert_date_series(self, series: pd.Series) -> pd.Series:
+        """
+        Columnar equivalent of `_convert_date`.
+        Only the distinct non-empty strings are parsed, each format is tried in
+        bulk on whatever the previous format could not parse, and the result is
+        mapped back onto the original index.
+        """
+        result = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+
+        is_str = series.map(lambda v: isinstance(v, str)).astype(bool)
+        if not is_str.any():
+            return result
+
+        values = series[is_str]
+        values = values[values.str.strip() != ""]
+        if values.empty:
+            return result
+
+        uniques = pd.Series(values.unique())
+
+        # Drop the weekday prefix ("Seg, 19/Fev/2024" -> "19/Fev/2024")
+        cleaned = uniques.str.split(", ").str.get(1).fillna(uniques)
+
+        for pt, en in PT_MONTHS.items():
+            cleaned = cleaned.str.replace(f"{pt}/", f"{en}/", regex=False)
+
+        parsed = pd.to_datetime(cleaned, format="%d/%b/%Y", errors="coerce")
+        for fmt in ("%d/%m/%Y", "ISO8601"):
+            pending = parsed.isna()
+            if not pending.any():
+                break
+            parsed[pending] = pd.to_datetime(
+                cleaned[pending], format=fmt, errors="coerce"
+            )
+
+        lookup = pd.Series(parsed.to_numpy(), index=uniques.to_numpy())
+        result[values.index] = values.map(lookup).to_numpy()
+        return result
+
     def _normalize_text(self, text):
         if pd.isna(text):
             return np.nan
-        text = str(text)  # Ensure it's a string for regex
-        text = str(" ".join(re.split(r"\s+", text, flags=re.UNICODE)))
-        normalized = (
-            unicodedata.normalize("NFKD", text)
-            .encode("ASCII", "ignore")
-            .decode("ASCII")
-        )
+        normalized = _fold_text(str(text))
         normalized = settings.EXCEPTIONS_AND_TYPOS.get(normalized, normalized)
         return normalized.lower().strip()
 
+    def _normalize_series(self, series: pd.Series) -> pd.Series:
+        """
+        Applies `_normalize_text` once per distinct value and maps the results
+        back, since department/position names repeat across most rows.
+        """
+        uniques = series.dropna().unique()
+        lookup = {value: self._normalize_text(value) for value in uniques}
+        return series.map(lookup)
+
     async def _generate_tasks_dfs(
         self,
         fiorilli_employees: pd.DataFrame,
@@ -855,6 +1128,40 @@ class SyncService:
                 pd.DataFrame(),
             )
 
+        # Employee and leave comparisons run in parallel in the analysis pool
+        context = diff_context()
+        employees, new_leaves_df = await asyncio.gather(
+            analysis_pool.run(
+                diff_employees,
+                context,
+                fiorilli_employees,
+                ahgora_employees,
+                ahgora_csv_employees,
+            ),
+            analysis_pool.run(diff_leaves, context, last_leaves, all_leaves),
+        )
+        (
+            new_employees_df,
+            seed_employees_df,
+            dismissed_employees_df,
+            changed_employees_df,
+            self._diff_snapshot,
+        ) = employees
+
+        return (
+            new_employees_df,
+            seed_employees_df,
+            dismissed_employees_df,
+            changed_employees_df,
+            new_leaves_df,
+        )
+
+    def _diff_employees(
+        self,
+        fiorilli_employees: pd.DataFrame,
+        ahgora_employees: pd.DataFrame,
+        ahgora_csv_employees: pd.DataFrame,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         # Combine Ahgora state prioritizing CSV over DB
         ahgora_csv_ids = set()
         if not ahgora_csv_employees.empty:
@@ -934,25 +1241,22 @@ class SyncService:
 
         # Changed employees: compare Fiorilli vs combined Ahgora state (DB + CSV)
 
-        changed_employees_df = await self._get_changed_employees_df(
-            fiorilli_active_employees, combined_ahgora
+        changed_employees_df = self._get_changed_employees_df(
+            fiorilli_active_employees, combined_ahgora, incremental=True
         )
 
-        # New leaves
-        new_leaves_df = await self._get_new_leaves_df(last_leaves, all_leaves)
-
         return (
             new_employees_df,
             seed_employees_df,
             dismissed_employees_df,
             changed_employees_df,
-            new_leaves_df,
         )
 
-    async def _get_changed_employees_df(
+    def _get_changed_employees_df(
         self,
         fiorilli_active_employees: pd.DataFrame,
         ahgora_employees: pd.DataFrame,
+        incremental: bool = False,
     ) -> pd.DataFrame:
         merged = fiorilli_active_employees.merge(
             ahgora_employees,
@@ -960,7 +1264,72 @@ class SyncService:
             suffixes=("_expected", "_actual"),
             how="inner",
         )
+        if incremental and settings.DIFF_MODE != "full":
+            return self._get_changed_rows_incremental(merged)
+        return self._get_changed_rows(merged)
+
+    def _get_changed_rows_incremental(self, merged: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evaluates only the rows whose hash is not in the snapshot of rows the
+        last completed analysis found unchanged. Flagged rows never enter the
+        snapshot, so they keep being reported while Ahgora is not updated.
+        The new snapshot is saved by `_run_analysis_and_create_tasks`.
+        """
+        config = self._diff_config_version()
+        hashes = diff_snapshot_store.row_hashes(merged, self._diff_hash_columns(merged))
+        snapshot = diff_snapshot_store.load(config)
+        if snapshot is None:
+            candidates = np.ones(len(merged), dtype=bool)
+        else:
+            candidates = ~np.isin(hashes, snapshot.unchanged)
+
+        changed = self._get_changed_rows(merged[candidates].copy())
+        unchanged = ~merged.index.isin(changed.index)
+        self._diff_snapshot = DiffSnapshot(config, np.unique(hashes[unchanged]))
+        logger.info(
+            f"Incremental diff: compared {int(candidates.sum())} of {len(merged)} employees"
+        )
+
+        if settings.DIFF_MODE == "verify":
+            full = self._get_changed_rows(merged.copy())
+            if not full.index.equals(changed.index):
+                logger.warning(
+                    "Incremental diff mismatch: full path flagged "
+                    f"{sorted(full['id'])}, incremental flagged {sorted(changed['id'])}"
+                )
+            return full
+        return changed
 
+    @staticmethod
+    def _diff_hash_columns(merged: pd.DataFrame) -> list[str]:
+        """Columns a row's changed/unchanged verdict depends on."""
+        names = [
+            "id",
+            *COLUMNS_TO_VERIFY_CHANGE,
+            "binding",
+            "dismissal_date",
+            "department",
+            "location",
+        ]
+        columns = []
+        for name in names:
+            for col in (name, f"{name}_expected", f"{name}_actual"):
+                if col in merged and col not in columns:
+                    columns.append(col)
+        return columns
+
+    @staticmethod
+    def _diff_config_version() -> str:
+        return config_version(
+            DIFF_VERSION,
+            COLUMNS_TO_VERIFY_CHANGE,
+            settings.EXCEPTIONS_AND_TYPOS,
+            sorted(settings.IGNORE_LOCATION_CHANGE_IDS),
+            settings.UPDATE_LOCATIONS,
+            mapping_registry.get_department_locations(),
+        )
+
+    def _get_changed_rows(self, merged: pd.DataFrame) -> pd.DataFrame:
         # Normalize date columns to dd/mm/yyyy so DB format (yyyy-mm-dd HH:MM:SS)
         # and CSV format (dd/mm/yyyy) are comparable
         for col in COLUMNS_TO_VERIFY_CHANGE:
@@ -974,12 +1343,12 @@ class SyncService:
 
         for col in COLUMNS_TO_VERIFY_CHANGE:
             if f"{col}_expected" in merged:
-                merged[f"{col}_expected_norm"] = merged[f"{col}_expected"].apply(
-                    self._normalize_text
+                merged[f"{col}_expected_norm"] = self._normalize_series(
+                    merged[f"{col}_expected"]
                 )
             if f"{col}_actual" in merged:
-                merged[f"{col}_actual_norm"] = merged[f"{col}_actual"].apply(
-                    self._normalize_text
+                merged[f"{col}_actual_norm"] = self._normalize_series(
+                    merged[f"{col}_actual"]
                 )
 
         change_conditions = []
@@ -994,77 +1363,11 @@ class SyncService:
                 change_conditions.append(condition)
 
         # Check location
-        from app.core.settings import settings
-        import csv
-        import ast
-
-        csv_path = settings.DATA_DIR / "mappings" / "department_to_location.csv"
-        dept_to_loc = {}
-        if csv_path.exists():
-            try:
-                with open(csv_path, mode="r", encoding="latin1") as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if len(row) >= 2:
-                            dept = row[0].strip().upper()
-                            val = row[1].strip()
-                            if val.startswith("[") and val.endswith("]"):
-                                try:
-                                    target_locations = [
-                                        x.strip().upper() for x in ast.literal_eval(val)
-                                    ]
-                                except Exception:
-                                    target_locations = [val.upper()]
-                            elif val:
-                                target_locations = [
-                                    x.strip().upper() for x in val.split("|")
-                                ]
-                            else:
-                                target_locations = []
-
-                            target_locations = [x for x in target_locations if x]
-                            dept_to_loc[dept] = sorted(target_locations)
-            except Exception as e:
-                logger.warning(
-                    f"Could not read department_to_location.csv in sync_service: {e}"
-                )
-
-        def extract_ahgora_locations(val):
-            if not isinstance(val, str) or pd.isna(val):
-                return []
-            val = val.strip()
-            if val.startswith("[") and val.endswith("]"):
-                try:
-                    locs = [x.strip().upper() for x in ast.literal_eval(val)]
-                except Exception:
-                    locs = [val.upper()]
-            elif val:
-                locs = [x.strip().upper() for x in val.split(";")]
-            else:
-                locs = []
-
-            locs = [x for x in locs if x]
-            return sorted(locs)
-
+        dept_to_loc = mapping_registry.get_department_locations()
         if "location" in merged and dept_to_loc and settings.UPDATE_LOCATIONS:
-            merged["location_expected"] = merged["department_expected"].apply(
-                lambda x: dept_to_loc.get(
-                    str(x).strip().upper() if pd.notna(x) else "", []
-                )
+            change_conditions.append(
+                self._get_location_change_mask(merged, dept_to_loc)
             )
-            merged["location_actual"] = merged["location"].apply(
-                extract_ahgora_locations
-            )
-            location_condition = merged.apply(
-                lambda row: (
-                    len(row["location_expected"]) > 0
-                    and row["location_expected"] != row["location_actual"]
-                    and str(row["id"]).zfill(6)
-                    not in settings.IGNORE_LOCATION_CHANGE_IDS
-                ),
-                axis=1,
-            )
-            change_conditions.append(location_condition)
 
         if not change_conditions:
             return pd.DataFrame(columns=merged.columns)
@@ -1072,7 +1375,63 @@ class SyncService:
         combined_condition = pd.concat(change_conditions, axis=1).any(axis=1)
         return merged[combined_condition]
 
-    async def _get_new_leaves_df(
+    @staticmethod
+    def _parse_ahgora_locations(val) -> list[str]:
+        if not isinstance(val, str) or pd.isna(val):
+            return []
+        val = val.strip()
+        if val.startswith("[") and val.endswith("]"):
+            try:
+                locs = [x.strip().upper() for x in ast.literal_eval(val)]
+            except Exception:
+                locs = [val.upper()]
+        elif val:
+            locs = [x.strip().upper() for x in val.split(";")]
+        else:
+            locs = []
+
+        locs = [x for x in locs if x]
+        return sorted(locs)
+
+    @staticmethod
+    def _take_lists(values: list[list[str]], codes: np.ndarray) -> np.ndarray:
+        """Gathers per-code lists into an object array without list broadcasting."""
+        lookup = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            lookup[i] = value
+        return lookup[codes]
+
+    def _get_location_change_mask(
+        self, merged: pd.DataFrame, dept_to_loc: Dict[str, list[str]]
+    ) -> pd.Series:
+        """
+        Flags rows whose mapped Ahgora locations differ from the current ones.
+        Each distinct department/location value is parsed once into a sorted,
+        joined key so the comparison is a plain column equality.
+        """
+        dept_codes, departments = pd.factorize(merged["department_expected"])
+        expected = [dept_to_loc.get(str(d).strip().upper(), []) for d in departments]
+        expected.append(dept_to_loc.get("", []))  # code -1 (missing department)
+
+        loc_codes, locations = pd.factorize(merged["location"])
+        actual = [self._parse_ahgora_locations(loc) for loc in locations]
+        actual.append([])  # code -1 (missing location)
+
+        merged["location_expected"] = self._take_lists(expected, dept_codes)
+        merged["location_actual"] = self._take_lists(actual, loc_codes)
+
+        sep = "\x1f"
+        expected_key = np.array([sep.join(x) for x in expected], dtype=object)
+        actual_key = np.array([sep.join(x) for x in actual], dtype=object)
+        expected_key = pd.Series(expected_key[dept_codes], index=merged.index)
+        actual_key = pd.Series(actual_key[loc_codes], index=merged.index)
+
+        ignored_ids = set(settings.IGNORE_LOCATION_CHANGE_IDS)
+        is_ignored = merged["id"].astype(str).str.zfill(6).isin(ignored_ids)
+
+        return (expected_key != "") & (expected_key != actual_key) & ~is_ignored
+
+    def _get_new_leaves_df(
         self,
         last_leaves: pd.DataFrame,
         all_leaves: pd.DataFrame,
@@ -1152,7 +1511,7 @@ class SyncService:
 
         return new_leaves
 
-    async def _get_view_leaves(
+    def _get_view_leaves(
         self,
         leaves_df: pd.DataFrame,
         fiorilli_employees: pd.DataFrame,
@@ -1234,11 +1593,12 @@ class SyncService:
         if not seed_employees_df.empty:
             seed_payloads = df_to_payloads(seed_employees_df)
             async with self._db_lock:
-                await self.repo.save_ahgora_employees_batch(seed_payloads)
+                counts = await self.repo.save_ahgora_employees_batch(seed_payloads)
             await self._log(
                 job_id,
                 "INFO",
-                f"Seeded {len(seed_payloads)} employees directly to DB (already in Ahgora).",
+                f"Seeded {len(seed_payloads)} employees directly to DB (already in Ahgora): "
+                f"{counts['inserted']} inserted, {counts['updated']} updated.",
             )
 
         if not new_employees_df.empty:
@@ -1357,7 +1717,8 @@ class SyncService:
                 ]
 
                 # Check discrepancies using the _get_changed_employees_df logic
-                discrepancies_df = await self._get_changed_employees_df(
+                discrepancies_df = await asyncio.to_thread(
+                    self._get_changed_employees_df,
                     fiorilli_active_employees=csv_common,  # Treat CSV as source of truth for this comparison
                     ahgora_employees=db_common,
                 )
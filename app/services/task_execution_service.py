@@ -1,9 +1,13 @@
 import asyncio
 import logging
 import threading
-from typing import Optional
+import time
+from collections import deque
+from typing import Any, Dict, Optional
 from uuid import UUID
 
+from app.core.log_sink import log_sink
+from app.core.settings import settings
 from app.core.task_registry import task_registry
 from app.domain.enums import (
     AutomationTaskStatus as TaskStatus,
@@ -14,15 +18,18 @@ from app.domain.enums import (
 from app.domain.enums import (
     SyncStatus as JobStatus,
 )
-from app.infrastructure.automation.web.ahgora_browser import AhgoraBrowser
+from app.infrastructure.automation.web.browser_pool import ahgora_browser_pool
 from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+from app.services.dashboard_stats_service import DashboardStatsService
 
 logger = logging.getLogger(__name__)
 
 
 class TaskExecutionService:
-    def __init__(self, repo: SqlAlchemyRepo):
+    def __init__(self, repo: SqlAlchemyRepo, session_factory=None):
         self.repo = repo
+        # Batch workers need their own sessions: an AsyncSession is not concurrency-safe
+        self.session_factory = session_factory
 
     async def execute_task(
         self,
@@ -34,22 +41,23 @@ class TaskExecutionService:
         ahgora_user: Optional[str] = None,
         ahgora_company: Optional[str] = None,
         ahgora_password: Optional[str] = None,
-    ) -> bool:
+    ) -> Optional[bool]:
         """
         Executes a single automation task.
-        Returns True if successful, False otherwise.
+        Returns True if successful, False if it failed and None if the task was
+        not run (not found, already completed or running).
         """
         task = await self.repo.get_task(task_id)
         if not task:
             logger.error(f"Task {task_id} not found.")
-            return False
+            return None
 
         if task.status in [TaskStatus.SUCCESS, TaskStatus.RUNNING]:
             logger.warning(f"Task {task_id} is already completed or running.")
-            return False
+            return None
 
         await self.repo.update_task_status(task_id, TaskStatus.RUNNING)
-        await self.repo.add_log(
+        log_sink.emit(
             task.job_id,
             "INFO",
             f"Starting web automation (Selenium) for task {task.type}.",
@@ -66,14 +74,12 @@ class TaskExecutionService:
 
         try:
             # We run the browser automation in a separate thread so we don't block the async loop
-            loop = asyncio.get_running_loop()
             success = await asyncio.to_thread(
                 self._run_browser_automation,
                 task.type,
                 task.payload,
                 task.job_id,
                 task_id,
-                loop,
                 cancel_event,
                 ahgora_user=ahgora_user,
                 ahgora_password=ahgora_password,
@@ -83,7 +89,7 @@ class TaskExecutionService:
         except Exception as e:
             logger.exception(f"Error executing task {task_id}")
             error_msg = str(e)
-            await self.repo.add_log(
+            log_sink.emit(
                 task.job_id,
                 "ERROR",
                 f"Automation failure: {error_msg}.",
@@ -92,7 +98,7 @@ class TaskExecutionService:
 
         if success:
             await self.repo.update_task_status(task_id, TaskStatus.SUCCESS)
-            await self.repo.add_log(
+            log_sink.emit(
                 task.job_id,
                 "INFO",
                 "Automation completed successfully.",
@@ -103,7 +109,7 @@ class TaskExecutionService:
         else:
             if not error_msg:
                 # If error wasn't raised but automation returned False
-                await self.repo.add_log(
+                log_sink.emit(
                     task.job_id,
                     "WARNING",
                     "Automation finished unsuccessfully, but without raising an exception.",
@@ -114,7 +120,9 @@ class TaskExecutionService:
                 task_id, TaskStatus.FAILED, message=error_msg
             )
 
+        await log_sink.flush()
         await self.repo.evaluate_and_update_job_status(task.job_id)
+        DashboardStatsService.invalidate()
         return success
 
     async def execute_batch(
@@ -128,10 +136,14 @@ class TaskExecutionService:
         ahgora_user: Optional[str] = None,
         ahgora_company: Optional[str] = None,
         ahgora_password: Optional[str] = None,
-    ) -> None:
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
         Executes all pending, failed or cancelled tasks of a certain type for a given job.
-        Runs sequentially to respect browser limitations.
+        Up to `workers` (default TASK_BATCH_WORKERS) tasks run at the same time, each
+        worker with its own DB session and a pooled browser reused between its tasks.
+        `cancel_batch` stops the workers from picking up further tasks.
+        Returns the batch report (counts, elapsed seconds and tasks per minute).
         """
         from app.domain.enums import AutomationTaskStatus
 
@@ -152,18 +164,14 @@ class TaskExecutionService:
                 ahgora_url=ahgora_url,
             )
             await self.repo.evaluate_and_update_job_status(job_id)
-            return
+            return {}
 
         # We need a custom repo method or we fetch all and filter
         tasks = await self.repo.get_automation_tasks_by_job(job_id)
         batch = [
             t
             for t in tasks
-            if (
-                t.type.value == task_type
-                or t.type.name == task_type
-                or str(t.type) == task_type
-            )
+            if self._matches_type(t.type, task_type)
             and t.status
             in [
                 AutomationTaskStatus.PENDING,
@@ -172,19 +180,97 @@ class TaskExecutionService:
             ]
         ]
 
-        for t in batch:
-            await self.execute_task(
-                t.id,
-                fiorilli_url=fiorilli_url,
-                fiorilli_user=fiorilli_user,
-                fiorilli_password=fiorilli_password,
-                ahgora_url=ahgora_url,
-                ahgora_user=ahgora_user,
-                ahgora_company=ahgora_company,
-                ahgora_password=ahgora_password,
+        pending = deque(t.id for t in batch)
+        workers = max(1, min(workers or settings.TASK_BATCH_WORKERS, len(batch) or 1))
+        report = {
+            "success": 0,
+            "failed": 0,
+            "skipped": 0,
+            "not_run": 0,
+            "workers": workers,
+        }
+        credentials = {
+            "fiorilli_url": fiorilli_url,
+            "fiorilli_user": fiorilli_user,
+            "fiorilli_password": fiorilli_password,
+            "ahgora_url": ahgora_url,
+            "ahgora_user": ahgora_user,
+            "ahgora_company": ahgora_company,
+            "ahgora_password": ahgora_password,
+        }
+
+        batch_key = self._batch_cancel_key(job_id, task_type)
+        batch_cancel = threading.Event()
+        task_registry.register_cancel_event(batch_key, batch_cancel)
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    self._run_batch_worker(pending, batch_cancel, report, credentials)
+                    for _ in range(workers)
+                )
             )
+        finally:
+            task_registry.unregister_cancel_event(batch_key)
+
+        elapsed = time.perf_counter() - start
+        done = report["success"] + report["failed"]
+        report["not_run"] = len(pending)
+        report["elapsed_seconds"] = round(elapsed, 1)
+        report["tasks_per_minute"] = round(done / elapsed * 60, 1) if elapsed else 0.0
+
+        message = (
+            f"Batch {task_type} finished: {report['success']} succeeded, "
+            f"{report['failed']} failed, {report['skipped']} skipped, "
+            f"{report['not_run']} not run in "
+            f"{report['elapsed_seconds']}s with {workers} workers "
+            f"({report['tasks_per_minute']} tasks/min)."
+        )
+        logger.info(message)
+        log_sink.emit(job_id, "INFO", message)
 
         await self.repo.evaluate_and_update_job_status(job_id)
+        return report
+
+    async def _run_batch_worker(
+        self,
+        pending: deque,
+        batch_cancel: threading.Event,
+        report: Dict[str, Any],
+        credentials: Dict[str, Optional[str]],
+    ) -> None:
+        if self.session_factory is None:
+            from app.core.database import async_session_factory
+
+            self.session_factory = async_session_factory
+
+        async with self.session_factory() as session:
+            worker = TaskExecutionService(SqlAlchemyRepo(session))
+            while pending and not batch_cancel.is_set():
+                task_id = pending.popleft()
+                try:
+                    success = await worker.execute_task(task_id, **credentials)
+                except Exception as e:
+                    logger.error(f"Batch worker failed on task {task_id}: {e}")
+                    success = False
+                if success is None:
+                    # Completed or started elsewhere since the batch was listed
+                    report["skipped"] += 1
+                else:
+                    report["success" if success else "failed"] += 1
+
+    @staticmethod
+    def _matches_type(task_type: TaskType, requested: str) -> bool:
+        return (
+            task_type.value == requested
+            or task_type.name == requested
+            or str(task_type) == requested
+        )
+
+    @classmethod
+    def _batch_cancel_key(cls, job_id: UUID, task_type: str) -> str:
+        matched = next((t for t in TaskType if cls._matches_type(t, task_type)), None)
+        return f"{job_id}:{matched or task_type}"
 
     async def cancel_task(self, task_id: UUID) -> bool:
         """
@@ -231,15 +317,18 @@ class TaskExecutionService:
 
         logger.info(f"Cancelling batch execution for job {job_id}, type {task_type}")
 
+        # Stop running batch workers from picking up further tasks
+        batch_cancel = task_registry.get_cancel_event(
+            self._batch_cancel_key(job_id, task_type)
+        )
+        if batch_cancel:
+            batch_cancel.set()
+
         tasks = await self.repo.get_automation_tasks_by_job(job_id)
         batch = [
             t
             for t in tasks
-            if (
-                t.type.value == task_type
-                or t.type.name == task_type
-                or str(t.type) == task_type
-            )
+            if self._matches_type(t.type, task_type)
             and t.status
             in [
                 AutomationTaskStatus.PENDING,
@@ -261,6 +350,13 @@ class TaskExecutionService:
 
         logger.info(f"Cancelling all tasks for job {job_id}")
 
+        for task_type in TaskType:
+            batch_cancel = task_registry.get_cancel_event(
+                self._batch_cancel_key(job_id, task_type.value)
+            )
+            if batch_cancel:
+                batch_cancel.set()
+
         tasks = await self.repo.get_automation_tasks_by_job(job_id)
         batch = [
             t
@@ -284,7 +380,6 @@ class TaskExecutionService:
         payload: dict,
         job_id: UUID,
         task_id: UUID,
-        loop: asyncio.AbstractEventLoop,
         cancel_event: threading.Event = None,
         ahgora_user: Optional[str] = None,
         ahgora_password: Optional[str] = None,
@@ -297,31 +392,17 @@ class TaskExecutionService:
         """
 
         def log_cb(level: str, msg: str):
-            async def _do_log():
-                from app.core.database import async_session_factory
-
-                try:
-                    async with async_session_factory() as session:
-                        repo = SqlAlchemyRepo(session)
-                        await repo.add_log(job_id, level, msg, task_id=task_id)
-                except Exception as ex:
-                    logger.error(f"Background log failed for task {task_id}: {ex}.")
-
-            asyncio.run_coroutine_threadsafe(_do_log(), loop)
+            log_sink.emit(job_id, level, msg, task_id=task_id)
 
         from app.core.settings import settings
 
-        browser = None
-        try:
-            browser = AhgoraBrowser(
-                ahgora_user=ahgora_user,
-                ahgora_password=ahgora_password,
-                ahgora_company=ahgora_company,
-                ahgora_url=ahgora_url,
-                log_callback=log_cb,
-                headless=settings.HEADLESS_MODE_TASKS,
-                cancel_event=cancel_event,
+        if task_type == TaskType.ADD_LEAVE:
+            logger.error(
+                "ADD_LEAVE must be executed via batch (execute_batch). Individual execution not supported."
             )
+            return False
+
+        def automate(browser) -> bool:
             match task_type:
                 case TaskType.ADD_EMPLOYEE:
                     browser.add_employee(payload)
@@ -329,23 +410,27 @@ class TaskExecutionService:
                     browser.update_employee(payload)
                 case TaskType.REMOVE_EMPLOYEE:
                     browser.remove_employee(payload)
-                case TaskType.ADD_LEAVE:
-                    logger.error(
-                        "ADD_LEAVE must be executed via batch (execute_batch). Individual execution not supported."
-                    )
-                    return False
                 case _:
                     logger.error(f"Unsupported task type for automation: {task_type}")
                     return False
             return True
+
+        try:
+            # Reuses a logged-in browser from a previous task when one is available;
+            # a task returning False closes it instead of returning it to the pool
+            return ahgora_browser_pool.run(
+                automate,
+                ahgora_user=ahgora_user,
+                ahgora_password=ahgora_password,
+                ahgora_company=ahgora_company,
+                ahgora_url=ahgora_url,
+                log_callback=log_cb,
+                headless=settings.HEADLESS_MODE_TASKS,
+                cancel_event=cancel_event,
+            )
         except Exception as e:
             logger.error(f"Browser automation failed: {str(e)}")
             raise e
-        finally:
-            if browser:
-                browser.close_driver()
-
-        return True
 
     async def _update_ahgora_state(self, task_type: TaskType, payload: dict):
         """
@@ -0,0 +1,117 @@
+"""
+Benchmark: ORM-hydrated vs column-projected `get_ahgora_leaves_df`.
+
+Seeds N leave rows (default 100k) into a throwaway `ahgora_leaves` table and
+compares time and peak Python memory (tracemalloc) of the legacy loader
+(full entities -> list of dicts -> DataFrame) against the streamed Core select.
+
+The table is dropped and recreated, so the URL of a scratch database is
+required; the configured DATABASE_URL is refused.
+
+Usage:
+    uv run python -m benchmarks.bench_ahgora_loaders <scratch_database_url> [rows]
+"""
+
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.settings import settings
+from app.infrastructure.db.models import AhgoraLeaveModel
+from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+
+
+async def _legacy_leaves_df(session) -> pd.DataFrame:
+    result = await session.execute(select(AhgoraLeaveModel))
+    leaves = result.scalars().all()
+    data = [
+        {
+            "id": leave.employee_id,
+            "cod": leave.cod,
+            "cod_name": leave.cod_name,
+            "start_date": leave.start_date,
+            "end_date": leave.end_date,
+            "start_time": leave.start_time,
+            "end_time": leave.end_time,
+            "duration": leave.duration,
+        }
+        for leave in leaves
+    ]
+    return pd.DataFrame(data)
+
+
+def _make_rows(rows: int) -> list[dict]:
+    rng = random.Random(42)
+    base = datetime(2020, 1, 1)
+    data = []
+    for i in range(rows):
+        start = base + timedelta(days=rng.randint(0, 2000))
+        duration = rng.randint(1, 30)
+        data.append(
+            {
+                "employee_id": str(i % 5000).zfill(6),
+                "cod": str(rng.randint(1, 120)).zfill(3),
+                "cod_name": f"AFASTAMENTO {rng.randint(1, 120)}",
+                "start_date": start,
+                "end_date": start + timedelta(days=duration - 1),
+                "start_time": "00:00",
+                "end_time": "23:59",
+                "duration": duration,
+                "last_synced_at": base,
+            }
+        )
+    return data
+
+
+async def _measure(session_factory, loader) -> tuple[float, float, pd.DataFrame]:
+    async with session_factory() as session:
+        tracemalloc.start()
+        start = time.perf_counter()
+        df = await loader(session)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, df
+
+
+async def main(url: str, rows: int) -> None:
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    table = AhgoraLeaveModel.__table__
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop, checkfirst=True)
+        await conn.run_sync(table.create)
+        await conn.execute(insert(table), _make_rows(rows))
+
+    try:
+        old_time, old_mem, old_df = await _measure(session_factory, _legacy_leaves_df)
+        new_time, new_mem, new_df = await _measure(
+            session_factory, lambda s: SqlAlchemyRepo(s).get_ahgora_leaves_df()
+        )
+        pd.testing.assert_frame_equal(old_df, new_df, check_dtype=False)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(table.drop)
+        await engine.dispose()
+
+    print(f"rows={rows}")
+    print(f"ORM entities:      {old_time * 1000:9.1f} ms  peak {old_mem:7.1f} MiB")
+    print(f"Core projection:   {new_time * 1000:9.1f} ms  peak {new_mem:7.1f} MiB")
+    print(f"speedup:           {old_time / new_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    scratch_url = sys.argv[1]
+    if scratch_url == settings.DATABASE_URL:
+        sys.exit("Refusing to drop ahgora_leaves in the configured DATABASE_URL.")
+    asyncio.run(main(scratch_url, int(sys.argv[2]) if len(sys.argv) > 2 else 100_000))
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: per-cell `_convert_date` vs columnar `_convert_date_series`.
+
+Usage:
+    uv run python -m benchmarks.bench_convert_date [rows]
+"""
+
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from app.services.sync_service import PT_MONTHS, SyncService
+
+WEEKDAYS = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sab", "Dom"]
+MONTHS = list(PT_MONTHS)
+
+
+def _make_column(rows: int) -> pd.Series:
+    rng = random.Random(42)
+    values = []
+    for _ in range(rows):
+        day = rng.randint(1, 28)
+        month = rng.randint(1, 12)
+        year = rng.randint(1960, 2025)
+        kind = rng.random()
+        if kind < 0.45:
+            values.append(f"{day:02d}/{month:02d}/{year}")
+        elif kind < 0.9:
+            weekday = rng.choice(WEEKDAYS)
+            values.append(f"{weekday}, {day:02d}/{MONTHS[month - 1]}/{year}")
+        else:
+            values.append(None)
+    return pd.Series(values)
+
+
+def _timeit(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows: int = 50_000) -> None:
+    service = SyncService(repo=MagicMock())
+    column = _make_column(rows)
+
+    old = _timeit(lambda s: s.apply(service._convert_date), column)
+    new = _timeit(service._convert_date_series, column)
+
+    pd.testing.assert_series_equal(
+        service._convert_date_series(column),
+        column.apply(service._convert_date),
+        check_dtype=False,
+    )
+
+    print(f"rows={rows}")
+    print(f"apply(_convert_date):    {old * 1000:9.1f} ms")
+    print(f"_convert_date_series:    {new * 1000:9.1f} ms")
+    print(f"speedup:                 {old / new:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,91 @@
+"""
+Benchmark: row-wise location check vs `_get_location_change_mask`.
+
+Builds a synthetic merge of N employees (default 50k) and times the legacy
+`merged.apply(..., axis=1)` comparison against the vectorized key equality.
+
+Usage:
+    uv run python -m benchmarks.bench_location_change [rows]
+"""
+
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from app.core.settings import settings
+from app.services.sync_service import SyncService
+
+
+def _make_merged(rows: int) -> tuple[pd.DataFrame, dict[str, list[str]]]:
+    rng = random.Random(42)
+    departments = [f"DEPARTAMENTO {i}" for i in range(300)]
+    dept_to_loc = {
+        dept: sorted(f"PONTO {rng.randint(0, 150)}" for _ in range(rng.randint(1, 3)))
+        for dept in departments[:250]
+    }
+
+    data = []
+    for i in range(rows):
+        dept = rng.choice(departments)
+        current = list(dept_to_loc.get(dept, ["PONTO 999"]))
+        if rng.random() < 0.1:
+            current = [f"PONTO {rng.randint(0, 150)}"]
+        location = str(current) if rng.random() < 0.5 else ";".join(current)
+        data.append(
+            {
+                "id": str(i).zfill(6),
+                "department_expected": dept if rng.random() > 0.01 else None,
+                "location": location if rng.random() > 0.01 else None,
+            }
+        )
+    return pd.DataFrame(data), dept_to_loc
+
+
+def _legacy_mask(merged: pd.DataFrame, dept_to_loc: dict) -> pd.Series:
+    merged["location_expected"] = merged["department_expected"].apply(
+        lambda x: dept_to_loc.get(str(x).strip().upper() if pd.notna(x) else "", [])
+    )
+    merged["location_actual"] = merged["location"].apply(
+        SyncService._parse_ahgora_locations
+    )
+    return merged.apply(
+        lambda row: (
+            len(row["location_expected"]) > 0
+            and row["location_expected"] != row["location_actual"]
+            and str(row["id"]).zfill(6) not in settings.IGNORE_LOCATION_CHANGE_IDS
+        ),
+        axis=1,
+    )
+
+
+def _timeit(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows: int = 50_000) -> None:
+    service = SyncService(repo=MagicMock())
+    merged, dept_to_loc = _make_merged(rows)
+
+    legacy = _legacy_mask(merged.copy(), dept_to_loc)
+    vectorized = service._get_location_change_mask(merged.copy(), dept_to_loc)
+    assert legacy.astype(bool).equals(vectorized.astype(bool))
+
+    old = _timeit(lambda: _legacy_mask(merged.copy(), dept_to_loc))
+    new = _timeit(lambda: service._get_location_change_mask(merged.copy(), dept_to_loc))
+
+    print(f"rows={rows} changed={int(vectorized.sum())}")
+    print(f"apply(axis=1):               {old * 1000:9.1f} ms")
+    print(f"_get_location_change_mask:   {new * 1000:9.1f} ms")
+    print(f"speedup:                     {old / new:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,34 @@
+import queue
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.log_sink import log_sink
+
+
+@pytest.fixture(autouse=True)
+def log_writer(monkeypatch):
+    """Keeps the process-wide log sink away from the database during tests."""
+    writer = AsyncMock()
+    monkeypatch.setattr(log_sink, "writer", writer)
+    monkeypatch.setattr(log_sink, "_queue", queue.SimpleQueue())
+    monkeypatch.setattr(log_sink, "_retry", [])
+    return writer
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keeps the parsed-export cache and the diff snapshot out of DATA_DIR."""
+    from app.core.frame_cache import parsed_export_cache
+    from app.services.diff_snapshot import diff_snapshot_store
+
+    monkeypatch.setattr(parsed_export_cache, "_directory", tmp_path / ".cache")
+    monkeypatch.setattr(diff_snapshot_store, "_path", tmp_path / "diff.pkl")
+
+
+@pytest.fixture(autouse=True)
+def inline_analysis(monkeypatch):
+    """Runs the analysis jobs in a thread so tests can patch what they use."""
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "ANALYSIS_WORKERS", 0)
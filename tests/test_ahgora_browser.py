@@ -0,0 +1,61 @@
+import time
+
+from app.infrastructure.automation.web.ahgora_browser import AhgoraBrowser
+
+
+class FakeDriver:
+    def __init__(self):
+        self.current_url = "https://ahgora.test/funcionarios/edit/1"
+        self.redirect_on_save = True
+
+    def execute_script(self, script):
+        return "readyState" in script
+
+    def quit(self):
+        pass
+
+
+class FakeAhgoraBrowser(AhgoraBrowser):
+    DELAY = 0.05
+    POLL_INTERVAL = 0.01
+
+    def _get_web_driver(self):
+        return FakeDriver()
+
+    def _login(self):
+        pass
+
+    def click_element(self, selector, *args, **kwargs):
+        if "Salvar" in selector and self.driver.redirect_on_save:
+            self.driver.current_url = "https://ahgora.test/funcionarios"
+
+
+def _browser():
+    logs = []
+    browser = FakeAhgoraBrowser(
+        ahgora_url="", log_callback=lambda level, msg: logs.append((level, msg))
+    )
+    browser.logs = logs
+    return browser
+
+
+def test_save_sees_a_redirect_that_happens_on_click():
+    browser = _browser()
+
+    start = time.perf_counter()
+    browser._save_form(timeout=5)
+
+    assert time.perf_counter() - start < 1
+    assert not [msg for level, msg in browser.logs if level == "WARNING"]
+
+
+def test_unconfirmed_save_is_reported():
+    browser = _browser()
+    browser.driver.redirect_on_save = False
+
+    browser._save_form(timeout=0.05)
+
+    assert any(
+        level == "WARNING" and "No save confirmation" in msg
+        for level, msg in browser.logs
+    )
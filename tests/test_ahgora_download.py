@@ -36,9 +36,9 @@ def test_ahgora_download():
     )
 
     try:
-        browser.download_employees()
-        print("Scraping finished. Moving file...")
-        FileManager.move_downloads_to_data_dir()
+        downloaded = browser.download_employees()
+        print(f"Scraping finished. Moving {downloaded.name}...")
+        FileManager.store_download(downloaded)
 
         csv_file = Path("data/ahgora_employees.csv")
         if csv_file.exists():
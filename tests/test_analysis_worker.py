@@ -0,0 +1,143 @@
+import asyncio
+import functools
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import pytest
+
+import app.services.sync_service as sync_module
+from app.core.settings import settings
+from app.services.analysis_worker import AnalysisPool
+from app.services.sync_service import SyncService
+
+
+def _inputs():
+    fiorilli = pd.DataFrame(
+        [
+            {
+                "id": "000001",
+                "name": "NEW USER",
+                "dismissal_date": None,
+                "binding": "CLT",
+            },
+            {
+                "id": "000002",
+                "name": "GONE",
+                "dismissal_date": "01/01/2024",
+                "binding": "CLT",
+            },
+        ]
+    )
+    ahgora = pd.DataFrame([{"id": "000002", "name": "GONE", "dismissal_date": None}])
+    last_leaves = pd.DataFrame(
+        [
+            {
+                "id": "000002",
+                "cod": "10",
+                "start_date": "01/02/2024",
+                "end_date": "05/02/2024",
+            }
+        ]
+    )
+    all_leaves = pd.concat(
+        [
+            last_leaves,
+            pd.DataFrame(
+                [
+                    {
+                        "id": "000002",
+                        "cod": "10",
+                        "start_date": "01/03/2024",
+                        "end_date": "02/03/2024",
+                    }
+                ]
+            ),
+        ],
+        ignore_index=True,
+    )
+    return fiorilli, ahgora, pd.DataFrame(), last_leaves, all_leaves
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    pool = AnalysisPool(max_workers=2)
+    monkeypatch.setattr(sync_module, "analysis_pool", pool)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_match_inline_analysis(process_pool, monkeypatch):
+    service = SyncService(repo=None)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    heartbeat = asyncio.create_task(ticker())
+    try:
+        in_workers = await service._generate_tasks_dfs(*_inputs())
+    finally:
+        heartbeat.cancel()
+    assert ticks > 0  # the event loop kept running while the workers compared
+
+    monkeypatch.setattr(sync_module, "analysis_pool", AnalysisPool(max_workers=0))
+    inline = await service._generate_tasks_dfs(*_inputs())
+
+    for got, expected in zip(in_workers, inline):
+        pd.testing.assert_frame_equal(got, expected)
+    new_emp, _, dismissed, _, new_leaves = in_workers
+    assert new_emp["id"].tolist() == ["000001"]
+    assert dismissed["id"].tolist() == ["000002"]
+    assert new_leaves["start_date"].tolist() == ["01/03/2024"]
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_recreates_the_pool(process_pool):
+    with pytest.raises(BrokenProcessPool):
+        await process_pool.run(functools.partial(os._exit, 1))
+
+    assert await process_pool.run(sum, [1, 2, 3]) == 6
+
+
+@pytest.mark.asyncio
+async def test_workers_follow_runtime_setting_changes(process_pool, monkeypatch):
+    # A department mapped in data/mappings/department_to_location.csv
+    fiorilli = pd.DataFrame(
+        [
+            {
+                "id": "000001",
+                "name": "ANA",
+                "department": "ABRIGO MUNICIPAL",
+                "binding": "CLT",
+                "dismissal_date": None,
+            }
+        ]
+    )
+    ahgora = pd.DataFrame(
+        [
+            {
+                "id": "000001",
+                "name": "ANA",
+                "department": "ABRIGO MUNICIPAL",
+                "dismissal_date": None,
+                "location": "PONTO ERRADO",
+            }
+        ]
+    )
+    service = SyncService(repo=None)
+
+    async def changed_ids():
+        result = await service._generate_tasks_dfs(
+            fiorilli, ahgora, pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        )
+        return result[3]["id"].tolist()
+
+    # Toggled as POST /api/settings/toggle-locations does, after workers started
+    for update_locations in (False, True, False):
+        monkeypatch.setattr(settings, "UPDATE_LOCATIONS", update_locations)
+        assert await changed_ids() == (["000001"] if update_locations else [])
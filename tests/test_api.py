@@ -338,3 +338,182 @@ def test_get_task_log_partial(mock_service_class, client):
     assert "Executed step 1" in response.text
 
     app.dependency_overrides.pop(api_get_service, None)
+
+
+@pytest.mark.asyncio
+async def test_log_event_stream_pushes_only_new_rows(monkeypatch):
+    from app.domain.enums import SyncStatus
+    from app.infrastructure.web import routes
+
+    job_id = uuid4()
+    task_id = uuid4()
+
+    def log(id, message, task=None):
+        return SyncLog(
+            id=id, job_id=job_id, task_id=task, level="INFO", message=message
+        )
+
+    repo = MagicMock()
+    repo.get_job_status = AsyncMock(
+        side_effect=[SyncStatus.RUNNING, SyncStatus.SUCCESS, SyncStatus.SUCCESS]
+    )
+    repo.get_job_logs = AsyncMock(
+        side_effect=[
+            [log(5, "first"), log(6, "step", task_id)],
+            [],
+            [log(7, "finished")],
+        ]
+    )
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock()
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr(routes, "async_session_factory", lambda: session_cm)
+    monkeypatch.setattr(routes, "SqlAlchemyRepo", lambda session: repo)
+    monkeypatch.setattr(routes.log_sink, "wait_for_write", AsyncMock())
+    monkeypatch.setattr(routes.settings, "LOG_FLUSH_INTERVAL_MS", 0)
+
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+
+    events = [
+        event
+        async for event in routes._log_event_stream(request, job_id, None, None, 4)
+    ]
+
+    assert [c.kwargs["since_id"] for c in repo.get_job_logs.await_args_list] == [
+        4,
+        6,
+        6,
+    ]
+    assert events[0].startswith("id: 6\nevent: logs\n")
+    assert "first" in events[0] and f'data-log-group="{task_id}"' in events[0]
+    assert events[1].startswith("id: 7\nevent: logs\n") and "finished" in events[1]
+    assert events[2] == "event: done\ndata: \n\n"
+
+
+@pytest.mark.asyncio
+async def test_log_event_stream_stays_open_while_pending_or_retrying(monkeypatch):
+    from app.domain.enums import SyncStatus
+    from app.infrastructure.web import routes
+
+    job_id = uuid4()
+    repo = MagicMock()
+    repo.get_job_status = AsyncMock(
+        side_effect=[
+            SyncStatus.PENDING,
+            SyncStatus.RETRYING,
+            SyncStatus.RUNNING,
+            SyncStatus.FAILED,
+            SyncStatus.FAILED,
+        ]
+    )
+    repo.get_job_logs = AsyncMock(return_value=[])
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock()
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr(routes, "async_session_factory", lambda: session_cm)
+    monkeypatch.setattr(routes, "SqlAlchemyRepo", lambda session: repo)
+    monkeypatch.setattr(routes.log_sink, "wait_for_write", AsyncMock())
+    monkeypatch.setattr(routes.settings, "LOG_FLUSH_INTERVAL_MS", 0)
+
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+
+    events = [
+        event
+        async for event in routes._log_event_stream(request, job_id, None, None, 0)
+    ]
+
+    assert events == ["event: done\ndata: \n\n"]
+    assert repo.get_job_status.await_count == 5
+    assert routes.log_sink.wait_for_write.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_log_delta_reports_the_status_for_the_polling_fallback():
+    from app.domain.enums import SyncStatus
+    from app.infrastructure.web import routes
+
+    job_id = uuid4()
+    service = MagicMock()
+    service.get_job_logs = AsyncMock(
+        return_value=[
+            SyncLog(id=9, job_id=job_id, level="INFO", message="last line"),
+        ]
+    )
+    service.get_job_status = AsyncMock(return_value=SyncStatus.SUCCESS)
+
+    response = await routes.get_log_entries_partial(
+        MagicMock(), job_id=job_id, task_id=None, since_id=8, service=service
+    )
+
+    assert response.headers["X-Last-Log-Id"] == "9"
+    assert response.headers["X-Log-Status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_jobs_poll_keeps_loaded_older_pages(monkeypatch):
+    from datetime import datetime, timedelta
+
+    from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+    from app.infrastructure.web import routes
+
+    monkeypatch.setattr(routes, "JOBS_PAGE_SIZE", 2)
+    start = datetime(2026, 1, 1)
+    jobs = [
+        SyncJob(id=uuid4(), triggered_by="api", created_at=start - timedelta(hours=i))
+        for i in range(5)
+    ]
+    service = MagicMock()
+    service.list_jobs = AsyncMock(return_value=jobs[:2])
+
+    first = await routes.get_jobs_partial(MagicMock(), service=service)
+    boundary = SqlAlchemyRepo.job_cursor(jobs[1])
+    # "Load more" appends to the tbody the poll does not replace
+    assert 'hx-target="#jobs-older"' in first.body.decode()
+    assert 'hx-swap="beforeend"' in first.body.decode()
+    assert f"older.dataset.until || '{boundary}'" in first.body.decode()
+
+    service.list_jobs = AsyncMock(return_value=jobs[2:4])
+    older = await routes.get_jobs_partial(MagicMock(), cursor=boundary, service=service)
+    service.list_jobs.assert_awaited_once_with(limit=2, cursor=boundary, summary=True)
+    assert "jobs-load-more" in older.body.decode()
+
+    # After a new job arrives, the poll covers everything down to the boundary
+    service.list_jobs = AsyncMock(return_value=[jobs[0], jobs[1]])
+    poll = await routes.get_jobs_partial(MagicMock(), until=boundary, service=service)
+    service.list_jobs.assert_awaited_once_with(until=boundary, summary=True)
+    assert "jobs-load-more" not in poll.body.decode()
+    assert "Nenhuma execução" not in poll.body.decode()
+
+
+@pytest.mark.asyncio
+async def test_task_groups_summary_returns_304_for_unchanged_counters():
+    from app.infrastructure.web import routes
+
+    service = MagicMock()
+    service.get_task_group_counts = AsyncMock(
+        return_value=[
+            {
+                "type": AutomationTaskType.ADD_EMPLOYEE,
+                "total": 2,
+                "pending": 1,
+                "running": 0,
+                "success": 1,
+                "failed": 0,
+                "cancelled": 0,
+            }
+        ]
+    )
+    request = MagicMock()
+    request.headers = {}
+
+    response = await routes.get_task_groups_summary(request, uuid4(), service)
+    assert response.status_code == 200
+    assert b'"type":"ADD_EMPLOYEE"' in response.body
+    etag = response.headers["etag"]
+
+    request.headers = {"if-none-match": etag}
+    response = await routes.get_task_groups_summary(request, uuid4(), service)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
@@ -0,0 +1,201 @@
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.core.settings import settings
+from app.infrastructure.automation.web.base_browser import (
+    BaseBrowser,
+    BrowserCancelledException,
+    RetryPolicy,
+)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.calls = 0
+
+    def quit(self):
+        pass
+
+
+class FakeBrowser(BaseBrowser):
+    def _get_web_driver(self):
+        return FakeDriver()
+
+
+@pytest.fixture
+def browser():
+    logs = []
+    browser = FakeBrowser(url="", log_callback=lambda level, msg: logs.append(msg))
+    browser.POLL_INTERVAL = 0.01
+    browser.logs = logs
+    return browser
+
+
+def test_failed_driver_start_leaves_no_session_directory(tmp_path, monkeypatch):
+    from app.infrastructure.automation.web import base_browser
+
+    def broken_firefox(options):
+        raise RuntimeError("geckodriver not found")
+
+    monkeypatch.setattr(settings, "DOWNLOADS_DIR", tmp_path)
+    monkeypatch.setattr(base_browser.webdriver, "Firefox", broken_firefox)
+
+    class RealDriverBrowser(BaseBrowser):
+        pass
+
+    with pytest.raises(RuntimeError):
+        RealDriverBrowser(url="")
+    assert not list(tmp_path.glob("session-*"))
+
+
+def test_wait_until_returns_as_soon_as_condition_holds(browser):
+    def ready(driver):
+        driver.calls += 1
+        return driver.calls >= 3
+
+    start = time.perf_counter()
+    assert browser.wait_until(ready, timeout=5) is True
+    assert time.perf_counter() - start < 1
+    assert browser.driver.calls == 3
+
+    assert browser.wait_until(lambda d: False, timeout=0.05) is False
+
+
+def test_wait_until_stops_on_cancel(browser):
+    browser.cancel_event = threading.Event()
+    browser.cancel_event.set()
+    with pytest.raises(BrowserCancelledException):
+        browser.wait_until(lambda d: False, timeout=5)
+
+
+def test_step_timings_are_logged_and_reset(browser):
+    with browser.step("open page"):
+        time.sleep(0.01)
+    with pytest.raises(ValueError), browser.step("save"):
+        raise ValueError
+
+    assert [name for name, _ in browser.step_timings] == ["open page", "save"]
+    browser.log_step_timings("Add employee")
+    assert browser.logs[-1].startswith("Add employee step timings: open page 0.0s")
+    assert browser.step_timings == []
+
+
+def test_browser_downloads_to_private_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DOWNLOADS_DIR", tmp_path)
+    first, second = FakeBrowser(url=""), FakeBrowser(url="")
+    assert first.download_dir.parent == tmp_path
+    assert first.download_dir != second.download_dir
+
+    first.download_dir.mkdir()
+    (first.download_dir / "funcionarios.csv").write_text("id")
+    first.close_driver()
+    assert first.download_dir.exists()
+
+    (first.download_dir / "funcionarios.csv").unlink()
+    first.close_driver()
+    assert not first.download_dir.exists()
+
+
+class FakeElement:
+    def __init__(self):
+        self.clicks = 0
+
+    def click(self):
+        self.clicks += 1
+
+
+class ElementDriver(FakeDriver):
+    """Returns the element once `missing` lookups have failed."""
+
+    def __init__(self, missing=0):
+        super().__init__()
+        self.missing = missing
+        self.element = FakeElement()
+
+    def find_element(self, by, value):
+        from selenium.common.exceptions import NoSuchElementException
+
+        if self.missing:
+            self.missing -= 1
+            raise NoSuchElementException(value)
+        return self.element
+
+
+def test_retry_func_runs_first_attempt_without_delay(browser):
+    browser.driver = ElementDriver()
+
+    start = time.perf_counter()
+    for _ in range(10):
+        browser.click_element("ready", selector_type="id")
+    elapsed = time.perf_counter() - start
+
+    assert browser.driver.element.clicks == 10
+    # The old retry_func slept DELAY before every attempt: >= 10s here
+    assert elapsed < 10 * BaseBrowser.DELAY / 20
+
+
+def test_retry_func_backs_off_only_after_failures(browser, monkeypatch):
+    browser.RETRY_POLICY = RetryPolicy(
+        first_delay=0.1, multiplier=2, max_delay=0.3, jitter=0
+    )
+    pauses = []
+    monkeypatch.setattr(browser, "wait", pauses.append)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 4:
+            raise RuntimeError("element click intercepted")
+        return "ok"
+
+    assert browser.retry_func(flaky) == "ok"
+    assert pauses == [0.1, 0.2, 0.3]
+
+    pauses.clear()
+    with pytest.raises(ZeroDivisionError):
+        browser.retry_func(lambda: 1 / 0, max_tries=2)
+    assert pauses == [0.1]
+
+
+def test_retry_policy_jitter_is_bounded():
+    policy = RetryPolicy(first_delay=1, multiplier=3, max_delay=5, jitter=0.5)
+    assert 1 <= policy.delay(1) <= 1.5
+    assert 3 <= policy.delay(2) <= 4.5
+    assert 5 <= policy.delay(5) <= 7.5
+
+
+FIXTURE_PAGE = Path(__file__).parent / "fixtures" / "retry_page.html"
+
+
+@pytest.mark.skipif(shutil.which("firefox") is None, reason="Firefox is not installed")
+def test_fast_path_latency_on_local_fixture_page():
+    from selenium.webdriver.common.by import By
+
+    class FixtureBrowser(BaseBrowser):
+        pass
+
+    browser = FixtureBrowser(url=FIXTURE_PAGE.as_uri(), headless=True)
+    try:
+        start = time.perf_counter()
+        for _ in range(5):
+            browser.click_element("ready", By.ID)
+        browser.send_keys("name", "Fulano", By.ID)
+        present = time.perf_counter() - start
+
+        start = time.perf_counter()
+        browser.click_element("late", By.ID)
+        late = time.perf_counter() - start
+
+        # Six calls used to cost at least 6 * DELAY before doing anything
+        assert present < 6 * BaseBrowser.DELAY / 2
+        assert late < 0.3 + BaseBrowser.DELAY
+        assert (
+            browser.driver.find_element(By.ID, "ready").get_attribute("data-clicks")
+            == "5"
+        )
+    finally:
+        browser.close_driver()
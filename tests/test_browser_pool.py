@@ -0,0 +1,131 @@
+import threading
+from typing import ClassVar
+
+import pytest
+
+from app.infrastructure.automation.web.base_browser import BrowserCancelledException
+from app.infrastructure.automation.web.browser_pool import AhgoraBrowserPool
+
+
+class FakeBrowser:
+    instances: ClassVar[list] = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.log_callback = kwargs.get("log_callback")
+        self.cancel_event = kwargs.get("cancel_event")
+        self.closed = False
+        self.session_checks = 0
+        self.healthy = True
+        FakeBrowser.instances.append(self)
+
+    def ensure_session(self):
+        self.session_checks += 1
+        if not self.healthy:
+            raise RuntimeError("driver is gone")
+
+    def close_driver(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    FakeBrowser.instances = []
+    return AhgoraBrowserPool(
+        max_idle_per_key=2,
+        max_age_seconds=3600,
+        idle_timeout_seconds=3600,
+        factory=FakeBrowser,
+    )
+
+
+CREDS = {
+    "ahgora_url": "https://ahgora/home",
+    "ahgora_user": "user",
+    "ahgora_company": "ACME",
+    "ahgora_password": "secret",
+}
+
+
+def test_browser_is_reused_for_the_same_key(pool):
+    with pool.session(**CREDS) as first:
+        pass
+    with pool.session(**CREDS, log_callback=print) as second:
+        assert second.log_callback is print
+
+    assert first is second
+    assert second.session_checks == 1
+    assert second.log_callback is None
+    assert pool.idle_count() == 1
+
+    with pool.session(**(CREDS | {"ahgora_company": "OTHER"})) as other:
+        assert other is not first
+    assert pool.idle_count() == 2
+
+
+def test_failed_or_cancelled_tasks_discard_the_browser(pool):
+    with pytest.raises(ValueError), pool.session(**CREDS) as browser:
+        raise ValueError("element not found")
+    assert browser.closed and pool.idle_count() == 0
+
+    cancel_event = threading.Event()
+    with pool.session(**CREDS, cancel_event=cancel_event) as browser:
+        cancel_event.set()
+    assert browser.closed and pool.idle_count() == 0
+
+
+def test_unhealthy_or_changed_credentials_get_a_new_browser(pool):
+    with pool.session(**CREDS) as first:
+        pass
+    first.healthy = False
+
+    with pool.session(**CREDS) as second:
+        assert second is not first
+    assert first.closed
+
+    with pool.session(**(CREDS | {"ahgora_password": "new"})) as third:
+        assert third is not second
+    assert second.closed
+
+
+def test_cancel_during_checkout_closes_the_browser(pool):
+    with pool.session(**CREDS) as first:
+        pass
+
+    def cancelled():
+        raise BrowserCancelledException("Task cancelled by user.")
+
+    first.ensure_session = cancelled
+    with pytest.raises(BrowserCancelledException), pool.session(**CREDS):
+        pass
+    assert first.closed and pool.idle_count() == 0
+
+
+def test_idle_browsers_are_evicted(pool):
+    with pool.session(**CREDS) as browser:
+        pass
+
+    pool.idle_timeout_seconds = 0
+    assert pool.evict_expired() == 1
+    assert browser.closed and pool.idle_count() == 0
+
+    pool.max_idle_per_key = 0
+    with pool.session(**CREDS) as browser:
+        pass
+    assert browser.closed
+
+
+def test_task_returning_false_discards_the_browser(pool):
+    assert pool.run(lambda browser: None, **CREDS) is None
+    assert pool.idle_count() == 1
+
+    assert pool.run(lambda browser: False, **CREDS) is False
+    assert FakeBrowser.instances[0].closed and pool.idle_count() == 0
+
+
+def test_headless_mode_is_part_of_the_key(pool):
+    with pool.session(**CREDS, headless=True) as headless:
+        pass
+    with pool.session(**CREDS, headless=False) as visible:
+        assert visible is not headless
+    assert pool.idle_count() == 2
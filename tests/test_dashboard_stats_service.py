@@ -0,0 +1,58 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.domain.entities import SyncJob
+from app.domain.enums import SyncStatus
+from app.services.dashboard_stats_service import DashboardStatsService
+
+
+@pytest.fixture
+def repo():
+    DashboardStatsService.invalidate()
+    repo = MagicMock()
+    repo.count_active_ahgora_employees = AsyncMock(return_value=120)
+    repo.count_ahgora_leaves = AsyncMock(return_value=45)
+    repo.list_jobs = AsyncMock(
+        return_value=[
+            SyncJob(status=SyncStatus.SUCCESS, finished_at=datetime(2026, 3, 4, 5, 6))
+        ]
+    )
+    yield repo
+    DashboardStatsService.invalidate()
+
+
+@pytest.mark.asyncio
+async def test_stats_are_counted_in_sql_and_cached(repo):
+    stats = await DashboardStatsService(repo).get_stats()
+
+    assert stats == {
+        "active_employees": 120,
+        "total_leaves": 45,
+        "last_sync_date": "04/03/2026 05:06",
+    }
+    repo.list_jobs.assert_awaited_once_with(
+        limit=1, statuses=[SyncStatus.SUCCESS], summary=True
+    )
+
+    repo.count_ahgora_leaves.return_value = 46
+    assert (await DashboardStatsService(repo).get_stats())["total_leaves"] == 45
+    assert repo.count_ahgora_leaves.await_count == 1
+
+    DashboardStatsService.invalidate()
+    assert (await DashboardStatsService(repo).get_stats())["total_leaves"] == 46
+
+
+@pytest.mark.asyncio
+async def test_stats_expire_after_ttl(repo, monkeypatch):
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "DASHBOARD_STATS_TTL_SECONDS", 0)
+    repo.list_jobs.return_value = []
+
+    assert (await DashboardStatsService(repo).get_stats())[
+        "last_sync_date"
+    ] == "Nenhuma"
+    await DashboardStatsService(repo).get_stats()
+    assert repo.count_active_ahgora_employees.await_count == 2
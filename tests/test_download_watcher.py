@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.download_watcher import DownloadWatcher
+from app.core.file_manager import FileManager
+from app.core.settings import settings
+
+
+def _watcher(directory, pattern="funcionarios"):
+    return DownloadWatcher(directory, pattern, stable_seconds=0.05, poll_interval=0.01)
+
+
+def _later(delay, action):
+    timer = threading.Timer(delay, action)
+    timer.start()
+    return timer
+
+
+def test_waits_for_part_file_to_be_finalized(tmp_path):
+    watcher = _watcher(tmp_path)
+    final = tmp_path / "funcionarios.csv"
+    partial = tmp_path / "funcionarios.csv.part"
+    # Firefox creates an empty placeholder next to the .part while downloading
+    final.write_text("")
+    partial.write_text("id;nome\n")
+
+    def finish():
+        final.unlink()
+        partial.rename(final)
+
+    _later(0.1, finish)
+    start = time.monotonic()
+    assert watcher.wait(timeout=5) == final.resolve()
+    assert time.monotonic() - start >= 0.1
+    assert final.read_text() == "id;nome\n"
+
+
+def test_waits_for_size_to_settle(tmp_path):
+    watcher = DownloadWatcher(tmp_path, "funcionarios", stable_seconds=0.3)
+    target = tmp_path / "funcionarios.csv"
+    target.write_text("a")
+    _later(0.02, lambda: target.write_text("a" * 10))
+
+    assert watcher.wait(timeout=5) == target.resolve()
+    assert target.stat().st_size == 10
+
+
+def test_ignores_existing_and_unrelated_files(tmp_path):
+    old = tmp_path / "funcionarios (old).csv"
+    old.write_text("old")
+    watcher = _watcher(tmp_path)
+    (tmp_path / "trabalhador.txt").write_text("other export")
+
+    with pytest.raises(TimeoutError):
+        watcher.wait(timeout=0.1)
+
+    os.utime(old, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert watcher.wait(timeout=5) == old.resolve()
+
+
+def test_inotify_wakes_the_watcher_between_polls(tmp_path):
+    pytest.importorskip("inotify_simple")
+    watcher = DownloadWatcher(
+        tmp_path, "funcionarios", stable_seconds=0.05, poll_interval=5
+    )
+    notifier = watcher._open_notifier()
+    assert notifier is not None
+    notifier.close()
+
+    target = tmp_path / "funcionarios.csv"
+    _later(0.1, lambda: target.write_text("id;nome\n"))
+    start = time.monotonic()
+
+    assert watcher.wait(timeout=10) == target.resolve()
+    # Polling alone would not look again before poll_interval (5 s)
+    assert time.monotonic() - start < 2
+
+
+def test_wait_checks_for_cancellation(tmp_path):
+    class Cancelled(Exception):
+        pass
+
+    def cancel():
+        raise Cancelled
+
+    with pytest.raises(Cancelled):
+        _watcher(tmp_path).wait(timeout=5, check_cancel=cancel)
+
+
+def test_store_download_moves_export_to_data_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATA_DIR", tmp_path / "data")
+    download = tmp_path / "session-1" / "PontoAfastamentos2.txt"
+    download.parent.mkdir()
+    download.write_text("leave")
+
+    stored = FileManager.store_download(download)
+
+    assert stored == tmp_path / "data" / "raw_leaves.txt"
+    assert stored.read_text() == "leave"
+    assert not download.exists()
+    assert FileManager.store_download(tmp_path / "unknown.txt") is None
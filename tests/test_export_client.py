@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.core.settings import settings
+from app.infrastructure.automation.http.export_client import (
+    BrowserSession,
+    ExportClient,
+    ExportSignatureChanged,
+    HttpExporter,
+    load_recipes,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "exports"
+RECIPES = load_recipes(FIXTURES / "recipes.json")
+CONTEXT = {"start_date": "01/01/2026", "end_date": "31/12/2026"}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the recorded exports to clients holding the session cookie."""
+
+    routes: ClassVar[dict] = {
+        ("POST", "/sip/processar"): None,
+        ("GET", "/sip/exportar"): "trabalhador.txt",
+        ("GET", "/funcionarios/exportar"): "funcionarios.csv",
+    }
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        self.server.seen.append((self.command, url.path, parse_qs(url.query), form))
+        self.server.user_agents.add(self.headers.get("User-Agent"))
+
+        if "JSESSIONID=valid" not in (self.headers.get("Cookie") or ""):
+            self.send_response(302)
+            self.send_header("Location", "/login")
+            self.end_headers()
+            return
+
+        key = (self.command, url.path)
+        if key not in self.routes or url.path in self.server.changed_paths:
+            body, content_type = b"<html>Sistema atualizado</html>", "text/html"
+        elif self.routes[key] is None:
+            body, content_type = b"ok", "text/plain"
+        else:
+            body = (FIXTURES / self.routes[key]).read_bytes()
+            content_type = "text/plain; charset=iso-8859-1"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.seen = []
+    server.user_agents = set()
+    server.changed_paths = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _session(server, cookie="valid"):
+    host, port = server.server_address
+    return BrowserSession(
+        base_url=f"http://{host}:{port}",
+        cookies={"JSESSIONID": cookie},
+        user_agent="Mozilla/5.0 Firefox",
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_replays_recorded_requests(server, tmp_path):
+    async with ExportClient(_session(server)) as client:
+        path = await client.export(RECIPES["fiorilli_employees"], tmp_path, CONTEXT)
+
+    assert path == tmp_path / "trabalhador.txt"
+    assert path.read_bytes() == (FIXTURES / "trabalhador.txt").read_bytes()
+    process, export = server.seen
+    assert process[:2] == ("POST", "/sip/processar")
+    assert process[3] == {"inicio": ["01/01/2026"], "fim": ["31/12/2026"]}
+    assert export[:3] == ("GET", "/sip/exportar", {"formato": ["txt"]})
+    assert server.user_agents == {"Mozilla/5.0 Firefox"}
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_a_signature_change(server, tmp_path):
+    async with ExportClient(_session(server, cookie="expired")) as client:
+        with pytest.raises(ExportSignatureChanged, match="answered 302"):
+            await client.export(RECIPES["ahgora_employees"], tmp_path)
+    assert not (tmp_path / "funcionarios.csv").exists()
+
+
+@pytest.mark.asyncio
+async def test_unexpected_content_is_a_signature_change(server, tmp_path):
+    server.changed_paths.add("/funcionarios/exportar")
+    async with ExportClient(_session(server)) as client:
+        with pytest.raises(ExportSignatureChanged, match="does not look like"):
+            await client.export(RECIPES["ahgora_employees"], tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_http_exporter_logs_in_once_per_system(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DOWNLOADS_DIR", tmp_path)
+    logins = []
+
+    def login():
+        logins.append("fiorilli")
+        return _session(server)
+
+    def broken_login():
+        raise RuntimeError("Firefox crashed")
+
+    exporter = HttpExporter(
+        logins={"fiorilli": login, "ahgora": broken_login}, recipes=RECIPES
+    )
+    assert exporter.covers(["fiorilli_employees", "ahgora_employees"])
+    assert not exporter.covers(["fiorilli_leaves"])
+
+    first, second = await asyncio.gather(
+        exporter.fetch(["fiorilli_employees"]),
+        exporter.fetch(["fiorilli_employees"]),
+    )
+    assert first == second == [exporter.directory / "trabalhador.txt"]
+    assert logins == ["fiorilli"]
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Firefox crashed"):
+            await exporter.fetch(["ahgora_employees"])
+
+    first[0].unlink()
+    await exporter.aclose()
+    assert not exporter.directory.exists()
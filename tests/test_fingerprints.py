@@ -0,0 +1,17 @@
+from app.core.fingerprints import file_fingerprint, files_fingerprints
+
+
+def test_file_fingerprint_streams_contents(tmp_path):
+    path = tmp_path / "raw_leaves.txt"
+    path.write_bytes(b"x" * 10_000)
+
+    digest = file_fingerprint(path, chunk_size=1024)
+    assert digest == file_fingerprint(path)
+    assert len(digest) == 32
+
+    path.write_bytes(b"x" * 9_999 + b"y")
+    assert file_fingerprint(path) != digest
+
+
+def test_missing_files_have_no_fingerprint(tmp_path):
+    assert files_fingerprints({"leaves": tmp_path / "missing.txt"}) == {"leaves": None}
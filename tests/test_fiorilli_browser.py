@@ -0,0 +1,43 @@
+from app.infrastructure.automation.web.fiorilli_browser import FiorilliBrowser
+
+
+class FakeElement:
+    def __init__(self, displayed):
+        self.displayed = displayed
+
+    def is_displayed(self):
+        return self.displayed
+
+
+class FakeDriver:
+    """The child node only becomes visible on the third lookup."""
+
+    def __init__(self):
+        self.events = []
+
+    def find_elements(self, by, xpath):
+        lookups = sum(1 for kind, _ in self.events if kind == "lookup")
+        self.events.append(("lookup", xpath))
+        return [FakeElement(displayed=lookups >= 2)]
+
+    def quit(self):
+        pass
+
+
+class FakeFiorilliBrowser(FiorilliBrowser):
+    POLL_INTERVAL = 0.01
+
+    def _get_web_driver(self):
+        return FakeDriver()
+
+    def click_element(self, selector, *args, **kwargs):
+        self.driver.events.append(("click", selector))
+
+
+def test_tree_node_expands_before_the_second_click():
+    browser = FakeFiorilliBrowser(fiorilli_url="")
+    browser._navigate_to_import_export_section()
+
+    kinds = [kind for kind, _ in browser.driver.events]
+    assert kinds == ["click", "lookup", "lookup", "lookup", "click"]
+    assert "'7.14.2 - Exportar'" in browser.driver.events[1][1]
@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.frame_cache import FrameCache, config_version
+from app.services.sync_service import SyncService
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return pd.read_csv(path, header=None, dtype=str)
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / "raw_leaves.txt"
+    path.write_text("000001,001,01/02/2026\n000002,002,\n")
+    return path
+
+
+def test_hit_skips_parsing(tmp_path, export):
+    cache = FrameCache(tmp_path / ".cache", max_bytes=2**20)
+    loader = CountingLoader()
+
+    first = cache.get_or_load(export, loader, "v1")
+    second = cache.get_or_load(export, loader, "v1")
+
+    assert loader.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert pd.isna(second.iloc[1, 2])
+
+
+def test_content_or_config_change_is_a_miss(tmp_path, export):
+    cache = FrameCache(tmp_path / ".cache", max_bytes=2**20)
+    loader = CountingLoader()
+
+    cache.get_or_load(export, loader, "v1")
+    cache.get_or_load(export, loader, "v2")
+    export.write_text("000003,003,01/03/2026\n")
+    df = cache.get_or_load(export, loader, "v2")
+
+    assert loader.calls == 3
+    assert df.iloc[0, 0] == "000003"
+    assert config_version(["id"], 1) != config_version(["id", "cod"], 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = FrameCache(tmp_path / ".cache", max_bytes=2**20)
+    loader = CountingLoader()
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"export{i}.txt"
+        path.write_text(f"{i}," + "x" * 2000 + "\n")
+        paths.append(path)
+
+    for age, path in enumerate(paths[:2]):
+        cache.get_or_load(path, loader, "v1")
+        (entry,) = cache.directory.glob(f"{path.stem}-*")
+        os.utime(entry, (1000 + age, 1000 + age))
+    cache.get_or_load(paths[0], loader, "v1")  # hit: export0 is now the newest
+
+    cache._max_bytes = 2 * max(e.stat().st_size for e in cache.directory.iterdir())
+    cache.get_or_load(paths[2], loader, "v1")
+
+    remaining = {e.name.split("-")[0] for e in cache.directory.iterdir()}
+    assert remaining == {"export0", "export2"}
+
+
+def test_disabled_cache_always_parses(tmp_path, export):
+    cache = FrameCache(tmp_path / ".cache", max_bytes=0)
+    loader = CountingLoader()
+    cache.get_or_load(export, loader, "v1")
+    cache.get_or_load(export, loader, "v1")
+    assert loader.calls == 2
+    assert not cache.directory.exists()
+
+
+def test_read_csv_caches_prepared_exports(export, monkeypatch):
+    service = SyncService(repo=None)
+    parse = service._parse_csv
+    calls = []
+    monkeypatch.setattr(
+        service, "_parse_csv", lambda path: calls.append(path) or parse(path)
+    )
+
+    first = service._read_csv(export)
+    second = service._read_csv(export)
+
+    assert calls == [export]
+    pd.testing.assert_frame_equal(first, second)
+    assert second["id"].tolist() == ["000001", "000002"]
+
+
+def test_entries_are_arrow_files_that_round_trip(tmp_path, export):
+    cache = FrameCache(tmp_path / ".cache", max_bytes=2**20)
+    parsed = pd.DataFrame(
+        {
+            "id": ["000001", "000002"],
+            "cod": ["001", np.nan],
+            "start_date": pd.to_datetime(["01/02/2026", None], format="%d/%m/%Y"),
+            "duration": [3, 4],
+        }
+    )
+
+    cache.get_or_load(export, lambda path: parsed, "v1")
+    cached = cache.get_or_load(export, lambda path: pytest.fail("parsed"), "v1")
+
+    (entry,) = cache.directory.iterdir()
+    assert entry.suffix == ".arrow"
+    pd.testing.assert_frame_equal(cached, parsed)
+    # Arrow nulls come back as NaN, like the parser yields, not as None
+    assert cached["cod"].iloc[1] is not None and pd.isna(cached["cod"].iloc[1])
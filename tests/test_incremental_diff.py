@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.mappings import mapping_registry
+from app.core.settings import settings
+from app.services.diff_snapshot import diff_snapshot_store
+from app.services.sync_service import SyncService
+
+
+def _fiorilli():
+    return pd.DataFrame(
+        {
+            "id": ["000001", "000002", "000003", "000004"],
+            "name": ["ANA", "BRUNO", "CARLA", "DIEGO"],
+            "admission_date": ["01/02/2020", "03/04/2021", "05/06/2022", np.nan],
+            "position": ["AGENTE", "MEDICO", "AUXILIAR", "VIGIA"],
+            "department": ["SAUDE", "SAUDE", "EDUCACAO", "OBRAS"],
+            "binding": ["CLT"] * 4,
+            "dismissal_date": [np.nan] * 4,
+        }
+    )
+
+
+def _ahgora():
+    return pd.DataFrame(
+        {
+            "id": ["000001", "000002", "000003", "000004"],
+            "name": ["ANA", "BRUNO SILVA", "CARLA", "DIEGO"],
+            "admission_date": ["01/02/2020", "03/04/2021", "05/06/2022", np.nan],
+            "position": ["AGENTE", "MEDICO", "AUXILIAR", "VIGIA"],
+            "department": ["SAUDE", "SAUDE", "EDUCACAO", "OBRAS"],
+            "dismissal_date": [np.nan] * 4,
+            "location": ["UBS", "UBS", "ESCOLA", "PATIO"],
+        }
+    )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(
+        mapping_registry,
+        "get_department_locations",
+        lambda: {"SAUDE": ["UBS"], "EDUCACAO": ["ESCOLA"], "OBRAS": ["PATIO"]},
+    )
+    service = SyncService(repo=None)
+    evaluated = []
+    full = service._get_changed_rows
+    service._get_changed_rows = lambda merged: (
+        evaluated.append(len(merged)) or full(merged)
+    )
+    service.evaluated = evaluated
+    return service
+
+
+def _changed(service, fiorilli, ahgora, mode, monkeypatch):
+    monkeypatch.setattr(settings, "DIFF_MODE", mode)
+    return service._get_changed_employees_df(fiorilli, ahgora, incremental=True)
+
+
+def _run(service, fiorilli, ahgora, monkeypatch):
+    """Incremental result, checked against the full path, then snapshotted."""
+    full = _changed(service, fiorilli, ahgora, "full", monkeypatch)
+    service.evaluated.clear()
+    incremental = _changed(service, fiorilli, ahgora, "incremental", monkeypatch)
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False)
+    diff_snapshot_store.save(service._diff_snapshot)
+    return incremental
+
+
+def test_incremental_diff_matches_full_path(service, monkeypatch):
+    fiorilli, ahgora = _fiorilli(), _ahgora()
+
+    first = _run(service, fiorilli, ahgora, monkeypatch)
+    assert first["id"].tolist() == ["000002"]
+    assert service.evaluated == [4]
+
+    # Unchanged inputs: only the still pending employee is compared again
+    assert _run(service, fiorilli, ahgora, monkeypatch)["id"].tolist() == ["000002"]
+    assert service.evaluated == [1]
+
+    # A department move only re-evaluates that employee
+    fiorilli.loc[fiorilli["id"] == "000003", "department"] = "OBRAS"
+    changed = _run(service, fiorilli, ahgora, monkeypatch)
+    assert changed["id"].tolist() == ["000002", "000003"]
+    assert changed.loc[changed["id"] == "000003", "location_expected"].item() == [
+        "PATIO"
+    ]
+    assert service.evaluated == [2]
+
+    # Ahgora caught up: nothing is reported any more
+    ahgora.loc[ahgora["id"] == "000002", "name"] = "BRUNO"
+    ahgora.loc[ahgora["id"] == "000003", ["department", "location"]] = [
+        "OBRAS",
+        "PATIO",
+    ]
+    assert _run(service, fiorilli, ahgora, monkeypatch).empty
+
+
+def test_config_change_discards_snapshot(service, monkeypatch):
+    fiorilli, ahgora = _fiorilli(), _ahgora()
+    _run(service, fiorilli, ahgora, monkeypatch)
+
+    monkeypatch.setattr(settings, "EXCEPTIONS_AND_TYPOS", {"BRUNO SILVA": "BRUNO"})
+    service.evaluated.clear()
+    changed = _changed(service, fiorilli, ahgora, "incremental", monkeypatch)
+
+    assert service.evaluated == [4]
+    assert changed.empty
+
+
+def test_verify_mode_returns_full_result(service, monkeypatch):
+    fiorilli, ahgora = _fiorilli(), _ahgora()
+    changed = _changed(service, fiorilli, ahgora, "verify", monkeypatch)
+
+    assert changed["id"].tolist() == ["000002"]
+    assert service.evaluated == [4, 4]
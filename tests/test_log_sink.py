@@ -0,0 +1,73 @@
+import asyncio
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.log_sink import LogSink
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_entries_in_one_batch():
+    writer = AsyncMock()
+    sink = LogSink(batch_size=100, flush_interval_ms=1000, writer=writer)
+    job_id = uuid4()
+
+    sink.emit(job_id, "INFO", "first")
+    sink.emit(job_id, "ERROR", "second", task_id=job_id)
+    await sink.flush()
+    await sink.flush()
+
+    writer.assert_awaited_once()
+    entries = writer.await_args.args[0]
+    assert [e.message for e in entries] == ["first", "second"]
+    assert entries[1].task_id == job_id
+
+
+@pytest.mark.asyncio
+async def test_background_flush_by_size_and_on_stop():
+    writer = AsyncMock()
+    sink = LogSink(batch_size=2, flush_interval_ms=60_000, writer=writer)
+    job_id = uuid4()
+    await sink.start()
+
+    sink.emit(job_id, "INFO", "a")
+    sink.emit(job_id, "INFO", "b")
+    await asyncio.sleep(0.05)
+    assert writer.await_count == 1
+
+    sink.emit(job_id, "INFO", "c")
+    await sink.stop()
+    assert [e.message for e in writer.await_args.args[0]] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_entries_for_next_flush():
+    writer = AsyncMock(side_effect=[Exception("db down"), None])
+    sink = LogSink(batch_size=10, flush_interval_ms=1000, writer=writer)
+
+    sink.emit(uuid4(), "INFO", "kept")
+    await sink.flush()
+    await sink.flush()
+
+    assert writer.await_count == 2
+    assert [e.message for e in writer.await_args.args[0]] == ["kept"]
+
+
+@pytest.mark.asyncio
+async def test_emit_from_threads_is_drained_by_the_loop():
+    writer = AsyncMock()
+    sink = LogSink(batch_size=50, flush_interval_ms=20, writer=writer)
+    job_id = uuid4()
+    await sink.start()
+
+    def browser_thread(n):
+        for i in range(100):
+            sink.emit(job_id, "INFO", f"{n}-{i}")
+
+    await asyncio.gather(*(asyncio.to_thread(browser_thread, n) for n in range(4)))
+    await sink.stop()
+
+    written = [e for call in writer.await_args_list for e in call.args[0]]
+    assert len(written) == 400
+    assert writer.await_count < 400
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from app.core.mappings import MappingRegistry
+from app.core.settings import settings
+
+
+@pytest.fixture
+def mapping_csv(tmp_path, monkeypatch):
+    path = tmp_path / "department_to_location.csv"
+    path.write_text(
+        "department_fiorilli,location_ahgora\n"
+        "Saude,\"['Ponto B', 'Ponto A']\"\n"
+        "Educacao,Ponto C|Ponto D\n"
+        "Obras,Ponto E;Ponto F\n"
+        "Vazio,\n",
+        encoding="latin1",
+    )
+    monkeypatch.setattr(settings, "DEPARTMENT_TO_LOCATION_CSV_PATH", path)
+    return path
+
+
+def test_department_locations_parsing(mapping_csv):
+    registry = MappingRegistry()
+
+    assert registry.get_locations_for_department(" saude ") == ["PONTO A", "PONTO B"]
+    assert registry.get_locations_for_department("EDUCACAO") == ["PONTO C", "PONTO D"]
+    assert registry.get_locations_for_department("Obras") == ["PONTO E", "PONTO F"]
+    assert registry.get_locations_for_department("Vazio") == []
+    assert registry.get_locations_for_department("Unknown") == []
+
+
+def test_mapping_reloads_only_when_file_changes(mapping_csv):
+    registry = MappingRegistry()
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return path.read_text(encoding="latin1")
+
+    first = registry.get(mapping_csv, loader)
+    assert registry.get(mapping_csv, loader) is first
+    assert len(calls) == 1
+
+    mapping_csv.write_text("Saude,Ponto Z\n", encoding="latin1")
+    stat = mapping_csv.stat()
+    os.utime(mapping_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert registry.get(mapping_csv, loader) == "Saude,Ponto Z\n"
+    assert len(calls) == 2
+
+
+def test_missing_mapping_file_returns_default(tmp_path):
+    registry = MappingRegistry()
+    assert registry.get(tmp_path / "missing.csv", lambda p: 1, default={}) == {}
@@ -0,0 +1,338 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.db.sqlalchemy_repo import SqlAlchemyRepo
+
+
+def _result(inserted_flags):
+    result = MagicMock()
+    result.scalars.return_value = iter(inserted_flags)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_save_ahgora_employees_batch_upserts_in_chunks():
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[_result([True, False]), _result([True])])
+    session.commit = AsyncMock()
+    repo = SqlAlchemyRepo(session)
+
+    employees = [
+        {"id": "000001", "name": "A", "admission_date": "01/02/2020"},
+        {"id": "000002", "name": "B", "dismissal_date": ""},
+        {"id": "000003", "name": "C"},
+        {"id": "000001", "name": "A2", "admission_date": "2020-02-01"},
+    ]
+    counts = await repo.save_ahgora_employees_batch(employees, chunk_size=2)
+
+    assert counts == {"inserted": 2, "updated": 1}
+    assert session.execute.await_count == 2
+    session.commit.assert_awaited_once()
+
+    stmt = session.execute.await_args_list[0].args[0]
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ON CONFLICT (id) DO UPDATE" in sql
+    assert "RETURNING xmax = 0" in sql
+
+    params = compiled.params
+    assert params["name_m0"] == "A2"
+    assert params["admission_date_m0"] == datetime(2020, 2, 1)
+    assert params["dismissal_date_m1"] is None
+
+
+@pytest.mark.asyncio
+async def test_save_ahgora_employees_batch_stays_under_the_bind_limit(monkeypatch):
+    from app.infrastructure.db import sqlalchemy_repo
+
+    monkeypatch.setattr(sqlalchemy_repo, "MAX_BIND_PARAMS", 20)
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=lambda stmt: _result([True, True]))
+    session.commit = AsyncMock()
+    repo = SqlAlchemyRepo(session)
+
+    employees = [{"id": f"{i:06d}", "name": str(i)} for i in range(5)]
+    await repo.save_ahgora_employees_batch(employees, chunk_size=1000)
+
+    # 9 columns per row: at most 2 rows fit in 20 parameters
+    assert session.execute.await_count == 3
+    for call in session.execute.await_args_list:
+        params = call.args[0].compile(dialect=postgresql.dialect()).params
+        assert len(params) <= 20
+
+
+@pytest.mark.asyncio
+async def test_add_logs_batch_stays_under_the_bind_limit(monkeypatch):
+    from uuid import uuid4
+
+    from app.domain.entities import SyncLog
+    from app.infrastructure.db import sqlalchemy_repo
+
+    monkeypatch.setattr(sqlalchemy_repo, "MAX_BIND_PARAMS", 10)
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    repo = SqlAlchemyRepo(session)
+
+    job_id = uuid4()
+    logs = [
+        SyncLog(id=None, job_id=job_id, level="INFO", message=str(i)) for i in range(5)
+    ]
+    await repo.add_logs_batch(logs)
+
+    # 5 columns per row: at most 2 rows fit in 10 parameters
+    assert session.execute.await_count == 3
+    session.commit.assert_awaited_once()
+
+
+def _session_with_dialect(name, driver):
+    conn = MagicMock()
+    conn.dialect.name = name
+    conn.dialect.driver = driver
+    session = MagicMock()
+    session.connection = AsyncMock(return_value=conn)
+    session.commit = AsyncMock()
+    return session, conn
+
+
+LEAVES = [
+    {"id": "000001", "cod": "001", "start_date": "01/02/2024", "end_date": ""},
+    {"id": "000002", "cod": "002", "start_date": "2024-03-01", "duration": 3},
+]
+
+
+@pytest.mark.asyncio
+async def test_save_ahgora_leaves_batch_uses_copy_on_asyncpg():
+    session, conn = _session_with_dialect("postgresql", "asyncpg")
+    raw_conn = MagicMock()
+    raw_conn.execute = AsyncMock(side_effect=["SELECT 0", "INSERT 0 1"])
+    raw_conn.copy_records_to_table = AsyncMock()
+    conn.get_raw_connection = AsyncMock(
+        return_value=MagicMock(driver_connection=raw_conn)
+    )
+    repo = SqlAlchemyRepo(session)
+
+    assert await repo.save_ahgora_leaves_batch(LEAVES) == 1
+
+    copy_call = raw_conn.copy_records_to_table.await_args
+    assert copy_call.args[0] == "ahgora_leaves_stage"
+    records = copy_call.kwargs["records"]
+    assert records[0][:5] == ("000001", "001", None, datetime(2024, 2, 1), None)
+    assert records[1][7] == 3
+    assert "DO NOTHING" in raw_conn.execute.await_args_list[1].args[0]
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_save_ahgora_leaves_batch_falls_back_to_executemany():
+    session, _ = _session_with_dialect("postgresql", "psycopg")
+    session.execute = AsyncMock(return_value=MagicMock(rowcount=2))
+    repo = SqlAlchemyRepo(session)
+
+    assert await repo.save_ahgora_leaves_batch(LEAVES) == 2
+
+    stmt, params = session.execute.await_args.args
+    assert "ON CONFLICT ON CONSTRAINT" in str(
+        stmt.compile(dialect=postgresql.dialect())
+    )
+    assert [p["employee_id"] for p in params] == ["000001", "000002"]
+
+
+@pytest.mark.asyncio
+async def test_get_ahgora_leaves_df_builds_columns_from_stream():
+    class FakeStream:
+        def keys(self):
+            return ["id", "cod", "duration"]
+
+        async def partitions(self, size):
+            yield [("000001", "001", 3), ("000002", "002", None)]
+            yield [("000003", "003", 1)]
+
+    session = MagicMock()
+    session.stream = AsyncMock(return_value=FakeStream())
+    repo = SqlAlchemyRepo(session)
+
+    df = await repo.get_ahgora_leaves_df()
+
+    assert list(df.columns) == ["id", "cod", "duration"]
+    assert df["id"].tolist() == ["000001", "000002", "000003"]
+    stmt = session.stream.await_args.args[0]
+    assert stmt.get_execution_options()["stream_results"] is True
+    assert "ahgora_leaves.employee_id AS id" in str(stmt)
+
+
+def test_log_query_uses_id_cursor_for_incremental_reads():
+    from sqlalchemy import select
+
+    from app.infrastructure.db.models import SyncLogModel
+
+    full = str(SqlAlchemyRepo._log_query(select(SyncLogModel)))
+    assert "ORDER BY sync_logs.timestamp ASC, sync_logs.id ASC" in full
+
+    query = SqlAlchemyRepo._log_query(
+        select(SyncLogModel), since_id=10, limit=50, levels=["error", "warning"]
+    )
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "sync_logs.id > %(id_1)s" in sql
+    assert "ORDER BY sync_logs.id ASC" in sql
+    assert compiled.params["id_1"] == 10
+    assert compiled.params["param_1"] == 50
+    assert compiled.params["level_1"] == ["ERROR", "WARNING"]
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_summary_uses_keyset_and_skips_metadata():
+    from app.domain.entities import SyncJob
+    from app.domain.enums import SyncStatus
+
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=[])
+    repo = SqlAlchemyRepo(session)
+
+    job = SyncJob(created_at=datetime(2026, 1, 2, 3, 4, 5))
+    cursor = SqlAlchemyRepo.job_cursor(job)
+    assert SqlAlchemyRepo.parse_job_cursor(cursor) == (job.created_at, job.id)
+
+    await repo.list_jobs(
+        limit=20, cursor=cursor, statuses=[SyncStatus.RUNNING], summary=True
+    )
+
+    stmt = session.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "(sync_jobs.created_at, sync_jobs.id) < (" in sql
+    assert "ORDER BY sync_jobs.created_at DESC, sync_jobs.id DESC" in sql
+    assert "sync_jobs.status IN" in sql
+    assert "sync_jobs.metadata ->>" in sql
+    assert "sync_jobs.metadata," not in sql
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_until_keeps_jobs_down_to_the_cursor():
+    from app.domain.entities import SyncJob
+
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=[])
+    repo = SqlAlchemyRepo(session)
+    until = SqlAlchemyRepo.job_cursor(SyncJob(created_at=datetime(2026, 1, 2)))
+
+    await repo.list_jobs(until=until, summary=True)
+
+    stmt = session.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "(sync_jobs.created_at, sync_jobs.id) >= (" in sql
+    assert "LIMIT" not in sql
+
+
+@pytest.mark.parametrize(
+    "counts, expected",
+    [
+        ({}, "success"),
+        ({"success": 3, "running": 1, "failed": 1}, "running"),
+        ({"success": 3, "pending": 2}, "pending"),
+        ({"success": 3, "failed": 1, "cancelled": 5}, "failed"),
+        ({"success": 1, "cancelled": 2}, "cancelled"),
+        ({"success": 2, "cancelled": 2}, "success"),
+    ],
+)
+def test_job_status_from_task_counts(counts, expected):
+    assert SqlAlchemyRepo._job_status_from_task_counts(counts) == expected
+
+
+@pytest.mark.asyncio
+async def test_evaluate_and_update_job_status_groups_in_sql():
+    from uuid import uuid4
+
+    session = MagicMock()
+    counts = MagicMock()
+    counts.all.return_value = [("success", 2), ("failed", 1)]
+    session.execute = AsyncMock(side_effect=[counts, MagicMock()])
+    session.commit = AsyncMock()
+    repo = SqlAlchemyRepo(session)
+
+    await repo.evaluate_and_update_job_status(uuid4())
+
+    count_sql = str(session.execute.await_args_list[0].args[0])
+    assert "count(*)" in count_sql and "GROUP BY automation_tasks.status" in count_sql
+    assert "automation_tasks.payload" not in count_sql
+
+    update_stmt = session.execute.await_args_list[1].args[0]
+    compiled = update_stmt.compile(dialect=postgresql.dialect())
+    assert str(compiled).startswith("UPDATE sync_jobs SET")
+    assert "sync_jobs.status != " in str(compiled)
+    assert compiled.params["status"] == "failed"
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_task_group_counts_aggregates_by_type_and_status():
+    from uuid import uuid4
+
+    from app.domain.enums import AutomationTaskType
+
+    session = MagicMock()
+    rows = MagicMock()
+    rows.all.return_value = [
+        ("add_leave", "pending", 4),
+        ("add_employee", "success", 2),
+        ("add_employee", "failed", 1),
+    ]
+    session.execute = AsyncMock(return_value=rows)
+    repo = SqlAlchemyRepo(session)
+
+    groups = await repo.get_task_group_counts(uuid4())
+
+    sql = str(session.execute.await_args.args[0])
+    assert "GROUP BY automation_tasks.type, automation_tasks.status" in sql
+    assert "automation_tasks.payload" not in sql
+    assert [g["type"] for g in groups] == [
+        AutomationTaskType.ADD_EMPLOYEE,
+        AutomationTaskType.ADD_LEAVE,
+    ]
+    assert groups[0] == {
+        "type": AutomationTaskType.ADD_EMPLOYEE,
+        "total": 3,
+        "pending": 0,
+        "running": 0,
+        "success": 2,
+        "failed": 1,
+        "cancelled": 0,
+    }
+    assert groups[1]["pending"] == 4
+
+
+@pytest.mark.asyncio
+async def test_dashboard_counts_do_not_load_rows():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(scalar_one=lambda: 7))
+    repo = SqlAlchemyRepo(session)
+
+    assert await repo.count_active_ahgora_employees() == 7
+    sql = str(session.execute.await_args.args[0])
+    assert "count(*)" in sql and "ahgora_employees.dismissal_date IS NULL" in sql
+
+    assert await repo.count_ahgora_leaves() == 7
+    assert "SELECT count(*) AS count_1 \nFROM ahgora_leaves" in str(
+        session.execute.await_args.args[0]
+    )
+
+
+@pytest.mark.asyncio
+async def test_count_unfinished_tasks_excludes_successful_ones():
+    from uuid import uuid4
+
+    session = MagicMock()
+    result = MagicMock()
+    result.scalar_one.return_value = 3
+    session.execute = AsyncMock(return_value=result)
+    repo = SqlAlchemyRepo(session)
+
+    assert await repo.count_unfinished_tasks(uuid4()) == 3
+
+    stmt = session.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "count(*)" in sql
+    assert "automation_tasks.status !=" in sql
@@ -12,7 +12,9 @@ from app.domain.entities import AutomationTask, AutomationTaskType
 def mock_repo():
     repo = MagicMock()
     repo.save_automation_tasks_batch = AsyncMock()
-    repo.save_ahgora_employees_batch = AsyncMock()
+    repo.save_ahgora_employees_batch = AsyncMock(
+        return_value={"inserted": 0, "updated": 0}
+    )
     repo.add_log = AsyncMock()
     repo.update_job_status = AsyncMock()
     repo.get_job = AsyncMock(return_value=None)
@@ -31,6 +33,17 @@ def test_normalize_text(sync_service):
     assert pd.isna(sync_service._normalize_text(np.nan))
 
 
+def test_normalize_series_matches_scalar(sync_service):
+    values = pd.Series(
+        ["  Teste  Acentuação ", "SAÚDE", None, np.nan, "saude", 3, "A\tB"] * 3
+    )
+
+    expected = values.apply(sync_service._normalize_text)
+    result = sync_service._normalize_series(values)
+
+    pd.testing.assert_series_equal(result, expected)
+
+
 def test_convert_date(sync_service):
     # Test valid dates
     dt = sync_service._convert_date("19/02/2024")
@@ -44,6 +57,33 @@ def test_convert_date(sync_service):
     assert pd.isna(sync_service._convert_date(None))
 
 
+def test_convert_date_series_matches_scalar(sync_service):
+    values = pd.Series(
+        [
+            "19/02/2024",
+            "Seg, 19/Fev/2024",
+            "Ter, 01/Set/2023",
+            "Qua, 05/Dez/1999, extra",
+            "2024-03-01",
+            "31/02/2024",
+            "garbage",
+            "",
+            "   ",
+            None,
+            np.nan,
+            5,
+        ]
+        * 2,
+        index=range(10, 34),
+    )
+
+    expected = values.apply(sync_service._convert_date)
+    result = sync_service._convert_date_series(values)
+
+    assert result.index.equals(values.index)
+    pd.testing.assert_series_equal(result, expected, check_dtype=False)
+
+
 @pytest.mark.asyncio
 @pytest.mark.asyncio
 async def test_create_automation_tasks(sync_service, mock_repo):
@@ -130,3 +170,31 @@ async def test_generate_tasks_dfs_dismissed(sync_service):
     assert seed_emp.empty
     assert len(dismissed) == 1
     assert dismissed.iloc[0]["id"] == "000001"
+
+
+def test_location_change_mask(sync_service, monkeypatch):
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "IGNORE_LOCATION_CHANGE_IDS", ["000004"])
+    dept_to_loc = {"SAUDE": ["PONTO A", "PONTO B"], "OBRAS": ["PONTO C"]}
+    merged = pd.DataFrame(
+        [
+            {
+                "id": "000001",
+                "department_expected": "saude ",
+                "location": "['Ponto B', 'Ponto A']",
+            },
+            {"id": "000002", "department_expected": "SAUDE", "location": "PONTO A"},
+            {"id": "000003", "department_expected": "EDUCACAO", "location": "X"},
+            {"id": "000004", "department_expected": "OBRAS", "location": None},
+            {"id": "000005", "department_expected": None, "location": "PONTO C"},
+            {"id": "000006", "department_expected": "OBRAS", "location": np.nan},
+        ]
+    )
+
+    mask = sync_service._get_location_change_mask(merged, dept_to_loc)
+
+    assert mask.tolist() == [False, True, False, False, False, True]
+    assert merged.loc[1, "location_expected"] == ["PONTO A", "PONTO B"]
+    assert merged.loc[1, "location_actual"] == ["PONTO A"]
+    assert merged.loc[3, "location_actual"] == []
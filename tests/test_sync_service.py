@@ -20,7 +20,7 @@ async def test_create_job():
 
 
 @pytest.mark.asyncio
-async def test_run_sync_background_success():
+async def test_run_sync_background_success(log_writer):
     repo = MagicMock()
     job_id = uuid4()
     job = SyncJob(id=job_id)
@@ -51,7 +51,9 @@ async def test_run_sync_background_success():
 
     repo.update_job_status.assert_any_call(job_id, SyncStatus.RUNNING)
     repo.evaluate_and_update_job_status.assert_called_once_with(job_id, "OK")
-    assert repo.add_log.call_count >= 2
+    written = [log for call in log_writer.await_args_list for log in call.args[0]]
+    assert len(written) >= 2
+    assert all(log.job_id == job_id for log in written)
 
 
 @pytest.mark.asyncio
@@ -149,7 +151,7 @@ async def test_validate_ahgora_state(mock_exists):
     service._log = AsyncMock()
 
     # Mock _get_changed_employees_df to simulate "Changed Name DB" != "Changed Name CSV"
-    service._get_changed_employees_df = AsyncMock(
+    service._get_changed_employees_df = MagicMock(
         return_value=pd.DataFrame([{"id": "3"}])
     )
 
@@ -175,3 +177,84 @@ async def test_validate_ahgora_state(mock_exists):
 
     # Check that it finds discrepancies for common
     assert "Found 1 employees with data discrepancies" in log_text
+
+
+@pytest.fixture
+def analysis_inputs(tmp_path, monkeypatch):
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(settings, "DOWNLOADS_DIR", tmp_path / "downloads")
+    for name in ("fiorilli_employees.txt", "ahgora_employees.csv"):
+        (tmp_path / name).write_text(f"{name} contents")
+    return tmp_path
+
+
+def _service_with_previous_job(inputs, db_state="employees:2|leaves:5"):
+    repo = MagicMock()
+    previous = SyncJob(
+        status=SyncStatus.SUCCESS,
+        metadata_info={"fingerprint": {"inputs": inputs, "db_state": db_state}},
+    )
+    current = SyncJob()
+    repo.list_jobs = AsyncMock(return_value=[previous])
+    repo.get_ahgora_state_version = AsyncMock(return_value="employees:2|leaves:5")
+    repo.count_unfinished_tasks = AsyncMock(return_value=0)
+    repo.get_job = AsyncMock(return_value=current)
+    repo.save_job = AsyncMock()
+    service = SyncService(repo=repo)
+    service._get_employees_data = AsyncMock(side_effect=RuntimeError("analysed"))
+    return service, current
+
+
+@pytest.mark.asyncio
+async def test_analysis_is_skipped_when_inputs_are_unchanged(analysis_inputs):
+    inputs = SyncService._analysis_fingerprint()
+    service, current = _service_with_previous_job(inputs)
+
+    assert await service._run_analysis_and_create_tasks(current.id) is None
+
+    service._get_employees_data.assert_not_awaited()
+    assert current.metadata_info["fingerprint"]["inputs"] == inputs
+    assert current.metadata_info["tasks_generated"] == 0
+    service.repo.list_jobs.assert_awaited_once_with(
+        limit=1, statuses=[SyncStatus.SUCCESS]
+    )
+    service.repo.count_unfinished_tasks.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", ["file", "db_state"])
+async def test_analysis_runs_when_inputs_or_db_state_change(analysis_inputs, change):
+    inputs = SyncService._analysis_fingerprint()
+    db_state = "employees:2|leaves:5"
+    if change == "file":
+        (analysis_inputs / "fiorilli_employees.txt").write_text("new roster")
+    else:
+        db_state = "employees:3|leaves:5"
+    service, current = _service_with_previous_job(inputs, db_state)
+
+    with pytest.raises(RuntimeError, match="analysed"):
+        await service._run_analysis_and_create_tasks(current.id)
+
+
+@pytest.mark.asyncio
+async def test_analysis_runs_after_the_location_toggle(analysis_inputs, monkeypatch):
+    from app.core.settings import settings
+
+    inputs = SyncService._analysis_fingerprint()
+    service, current = _service_with_previous_job(inputs)
+    monkeypatch.setattr(settings, "UPDATE_LOCATIONS", not settings.UPDATE_LOCATIONS)
+
+    with pytest.raises(RuntimeError, match="analysed"):
+        await service._run_analysis_and_create_tasks(current.id)
+
+
+@pytest.mark.asyncio
+async def test_analysis_runs_while_previous_tasks_are_unfinished(analysis_inputs):
+    inputs = SyncService._analysis_fingerprint()
+    service, current = _service_with_previous_job(inputs)
+    service.repo.count_unfinished_tasks.return_value = 2
+
+    with pytest.raises(RuntimeError, match="analysed"):
+        await service._run_analysis_and_create_tasks(current.id)
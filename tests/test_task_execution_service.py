@@ -0,0 +1,116 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.task_registry import task_registry
+from app.domain.entities import AutomationTask
+from app.domain.enums import AutomationTaskStatus, AutomationTaskType
+from app.services.task_execution_service import TaskExecutionService
+
+
+@asynccontextmanager
+async def fake_session_factory():
+    yield MagicMock()
+
+
+def _make_service(job_id, count, task_type=AutomationTaskType.UPDATE_EMPLOYEE):
+    tasks = [
+        AutomationTask(
+            job_id=job_id, type=task_type, status=AutomationTaskStatus.PENDING
+        )
+        for _ in range(count)
+    ]
+    repo = MagicMock()
+    repo.update_job_status = AsyncMock()
+    repo.evaluate_and_update_job_status = AsyncMock()
+    repo.get_automation_tasks_by_job = AsyncMock(return_value=tasks)
+    return TaskExecutionService(repo, session_factory=fake_session_factory), tasks
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_runs_tasks_on_bounded_workers(monkeypatch):
+    job_id = uuid4()
+    service, tasks = _make_service(job_id, 7)
+    running = 0
+    peak = 0
+    executed = []
+
+    async def fake_execute_task(self, task_id, **credentials):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        executed.append(task_id)
+        assert credentials["ahgora_user"] == "user"
+        return task_id != tasks[0].id
+
+    monkeypatch.setattr(TaskExecutionService, "execute_task", fake_execute_task)
+
+    report = await service.execute_batch(
+        job_id, "UPDATE_EMPLOYEE", ahgora_user="user", workers=3
+    )
+
+    assert sorted(executed) == sorted(t.id for t in tasks)
+    assert peak == 3
+    assert report["success"] == 6 and report["failed"] == 1
+    assert report["not_run"] == 0 and report["workers"] == 3
+    assert report["tasks_per_minute"] > 0
+    service.repo.evaluate_and_update_job_status.assert_awaited_with(job_id)
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_counts_tasks_completed_elsewhere_as_skipped(monkeypatch):
+    import dataclasses
+
+    import app.services.task_execution_service as module
+
+    job_id = uuid4()
+    service, tasks = _make_service(job_id, 3)
+    # Another batch finished the first task after this one listed it
+    done = dataclasses.replace(tasks[0], status=AutomationTaskStatus.SUCCESS)
+    worker_repo = MagicMock()
+    worker_repo.get_task = AsyncMock(return_value=done)
+    monkeypatch.setattr(module, "SqlAlchemyRepo", lambda session: worker_repo)
+
+    def run_task(self, *args, **kwargs):
+        raise AssertionError("a completed task must not run again")
+
+    monkeypatch.setattr(TaskExecutionService, "_run_browser_automation", run_task)
+
+    service.repo.get_automation_tasks_by_job.return_value = tasks[:1]
+    report = await service.execute_batch(job_id, "UPDATE_EMPLOYEE", workers=1)
+
+    assert report["skipped"] == 1
+    assert report["success"] == 0 and report["failed"] == 0
+    assert report["not_run"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_batch_stops_workers_from_picking_new_tasks(monkeypatch):
+    job_id = uuid4()
+    service, _ = _make_service(job_id, 6)
+    executed = []
+
+    async def fake_execute_task(self, task_id, **credentials):
+        executed.append(task_id)
+        if len(executed) == 2:
+            task_registry.get_cancel_event(
+                f"{job_id}:{AutomationTaskType.UPDATE_EMPLOYEE}"
+            ).set()
+        await asyncio.sleep(0)
+        return True
+
+    monkeypatch.setattr(TaskExecutionService, "execute_task", fake_execute_task)
+
+    report = await service.execute_batch(job_id, "update_employee", workers=2)
+
+    assert len(executed) == 2
+    assert report["not_run"] == 4
+    assert (
+        task_registry.get_cancel_event(f"{job_id}:{AutomationTaskType.UPDATE_EMPLOYEE}")
+        is None
+    )